@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the response post-processing pipeline in utils.formatters.
+
+Times each stage (tokenising, rendering, the full format_persona_response
+call with and without quote splitting, and _split_long_message) over a
+corpus of long persona responses and prints per-response costs.
+
+Usage:
+    python benchmarks/bench_formatters.py [corpus.json] [--iterations 500]
+
+The corpus is a JSON list of raw Gemini responses.
+"""
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.formatters import (
+    _split_long_message,
+    format_persona_response,
+    render_segment,
+    tokenize_response,
+)
+
+DEFAULT_CORPUS = project_root / "benchmarks" / "data" / "persona_responses.json"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark response formatting")
+    parser.add_argument("corpus", nargs="?", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    responses = json.loads(args.corpus.read_text(encoding="utf-8"))
+    if not responses:
+        print(f"❌ Empty corpus: {args.corpus}")
+        return 1
+    # Long enough to be split into several Telegram messages
+    long_html = "\n\n".join(format_persona_response(r, max_paragraphs=None) for r in responses * 6)
+    segments = [tokenize_response(r, None, split_quotes=True) for r in responses]
+
+    stages = {
+        "tokenize_response": lambda: [tokenize_response(r, None, split_quotes=True) for r in responses],
+        "render_segment": lambda: [[render_segment(s) for s in segs] for segs in segments],
+        "format_persona_response": lambda: [format_persona_response(r) for r in responses],
+        "format (split_quotes)": lambda: [format_persona_response(r, split_quotes=True) for r in responses],
+        "_split_long_message": lambda: [_split_long_message(long_html, True) for _ in responses],
+    }
+
+    total_chars = sum(len(r) for r in responses)
+    print(f"Corpus: {args.corpus} ({len(responses)} responses, {total_chars} chars)")
+    print(f"{'stage':<26} {'ms/response':>12}")
+    for name, func in stages.items():
+        seconds = timeit.timeit(func, number=args.iterations)
+        print(f"{name:<26} {seconds * 1000 / (args.iterations * len(responses)):>12.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for Russian expression detection.
+
+Compares the precompiled single-pass detector in utils.russian_translator
+with the previous implementation, which compiled a fresh regex per Latin
+variant on every response. Both are run over the same sample responses and
+their outputs are checked for equality before timings are reported.
+
+Usage:
+    python benchmarks/bench_russian_detector.py [--iterations 2000]
+"""
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+from typing import List
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.russian_translator import (
+    EMOTION_PRIORITY_EXPRESSIONS,
+    RUSSIAN_LATIN_VARIANTS,
+    RUSSIAN_STOPWORDS,
+    RUSSIAN_TRANSLATIONS,
+    detect_russian_expressions,
+    has_russian_expressions,
+    normalize_russian_variant,
+)
+
+SAMPLE_RESPONSES = [
+    "Hmph! Aku nggak peduli kok... *memalingkan wajah*",
+    "Дурак! Kamu ini benar-benar baka ya... *pipi memerah*",
+    "Боже мой... kenapa kamu selalu bikin aku khawatir? Ладно, aku bantu.",
+    "*tersenyum kecil* Спасибо... itu manis sekali dari kamu, bozhe.",
+    "Well, I suppose that's fine. Don't get the wrong idea though!",
+    "Ну... хорошо, хорошо. Aku akan menemanimu malam ini, durak.",
+    "Bože, kamu ini... *menghela napas* baiklah, ayo kita mulai.",
+    "Aku suka café di dekat sekolah, suasananya tenang sekali.",
+    "\"Привет!\" *melambaikan tangan* Kamu datang lebih awal hari ini ya.",
+    "Baka baka baka! Jangan bicara seperti itu di depan orang lain!",
+] * 3
+
+
+def legacy_detect_russian_expressions(text: str) -> List[str]:
+    """Detector as it was before precompilation, kept for comparison."""
+    if not text:
+        return []
+    has_cyrillic = bool(re.search(r'[а-яёА-ЯЁ]', text))
+    detected_set = set()
+    for match in re.findall(r'[а-яёА-ЯЁ]+', text, re.UNICODE):
+        detected_set.add(match.lower())
+    if has_cyrillic:
+        diacritic_pattern = r'\b[a-zA-Z]*[àáâãäåèéêëìíîïòóôõöùúûüýÿžžčščđ][a-zA-Z]*\b'
+        for match in re.findall(diacritic_pattern, text, re.UNICODE):
+            match_lower = match.lower()
+            normalized = normalize_russian_variant(match_lower)
+            if normalized in RUSSIAN_LATIN_VARIANTS:
+                detected_set.add(RUSSIAN_LATIN_VARIANTS[normalized].lower())
+            elif match_lower in RUSSIAN_LATIN_VARIANTS:
+                detected_set.add(RUSSIAN_LATIN_VARIANTS[match_lower].lower())
+        text_lower = text.lower()
+        for variant, canonical in RUSSIAN_LATIN_VARIANTS.items():
+            if re.search(rf'\b{re.escape(variant)}\b', text_lower):
+                detected_set.add(canonical.lower())
+    return sorted(
+        w for w in detected_set
+        if w in EMOTION_PRIORITY_EXPRESSIONS or (w in RUSSIAN_TRANSLATIONS and w not in RUSSIAN_STOPWORDS)
+    )
+
+
+def legacy_has_russian_expressions(text: str) -> bool:
+    """Quick check as it was before precompilation, kept for comparison."""
+    if not text:
+        return False
+    if re.search(r'[а-яёА-ЯЁ]', text):
+        return True
+    if re.search(r'[àáâãäåèéêëìíîïòóôõöùúûüýÿžčščđ]', text, re.UNICODE):
+        return True
+    text_lower = text.lower()
+    for variant in RUSSIAN_LATIN_VARIANTS:
+        if re.search(rf'\b{re.escape(variant)}\b', text_lower):
+            return True
+    return False
+
+
+def per_response_us(func, iterations: int) -> float:
+    """Return the mean cost of ``func`` over SAMPLE_RESPONSES in microseconds."""
+    total = timeit.timeit(lambda: [func(text) for text in SAMPLE_RESPONSES], number=iterations)
+    return total / (iterations * len(SAMPLE_RESPONSES)) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Russian expression detection")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    mismatches = 0
+    for text in SAMPLE_RESPONSES:
+        if detect_russian_expressions(text) != legacy_detect_russian_expressions(text):
+            mismatches += 1
+            print(f"❌ detect mismatch: {text!r}")
+        if has_russian_expressions(text) != legacy_has_russian_expressions(text):
+            mismatches += 1
+            print(f"❌ has mismatch: {text!r}")
+
+    print(f"{'function':<30} {'before (us)':>12} {'after (us)':>12} {'speedup':>8}")
+    for name, before, after in (
+        ("detect_russian_expressions", legacy_detect_russian_expressions, detect_russian_expressions),
+        ("has_russian_expressions", legacy_has_russian_expressions, has_russian_expressions),
+    ):
+        before_us = per_response_us(before, args.iterations)
+        after_us = per_response_us(after, args.iterations)
+        print(f"{name:<30} {before_us:>12.2f} {after_us:>12.2f} {before_us / after_us:>7.1f}x")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Real-time factor benchmark for the speech-to-text backends.
+
+Decodes each audio file to 16 kHz mono PCM once through the ffmpeg pipe,
+then transcribes it with every requested backend and reports decode time,
+transcription time and the real-time factor (RTF = processing time / audio duration; below 1.0 is
+faster than real time). The first local run includes model loading, so it
+is reported separately as a warm-up.
+
+Usage:
+    python benchmarks/bench_stt.py voice1.ogg voice2.ogg [--lang id]
+        [--backends local,google] [--repeat 3]
+
+Needs ffmpeg for decoding, faster-whisper for the local backend and network
+access for the Google backend.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.audio_stream import collect_pcm, iter_file
+from utils.stt import SAMPLE_RATE, SAMPLE_WIDTH, create_backends
+
+
+async def run(args: argparse.Namespace) -> int:
+    backends = create_backends()
+    wanted = [name.strip() for name in args.backends.split(",") if name.strip()]
+    missing = [name for name in wanted if name not in backends]
+    if missing:
+        print(f"Unavailable backends: {', '.join(missing)}")
+    wanted = [name for name in wanted if name in backends]
+    if not wanted:
+        return 1
+
+    clips = []
+    for path in args.files:
+        start = time.perf_counter()
+        pcm = await collect_pcm(iter_file(str(path)))
+        decode_time = time.perf_counter() - start
+        duration = len(pcm) / (SAMPLE_RATE * SAMPLE_WIDTH)
+        clips.append((path, pcm, duration))
+        print(f"{path.name}: {duration:.1f}s audio, decoded in {decode_time * 1000:.0f} ms "
+              f"(RTF {decode_time / duration:.4f})")
+
+    for name in wanted:
+        backend = backends[name]
+        print(f"\n== {name} ==")
+        warm_start = time.perf_counter()
+        await backend.transcribe(clips[0][1], args.lang)
+        print(f"warm-up: {time.perf_counter() - warm_start:.2f}s")
+
+        for path, pcm, duration in clips:
+            timings = []
+            text = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                text = await backend.transcribe(pcm, args.lang)
+                timings.append(time.perf_counter() - start)
+            median = statistics.median(timings)
+            print(f"{path.name}: median {median:.2f}s, RTF {median / duration:.3f}")
+            print(f"  -> {text!r}")
+
+        if hasattr(backend, "shutdown"):
+            backend.shutdown()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark STT backends (real-time factor)")
+    parser.add_argument("files", nargs="+", type=Path, help="Audio files (OGG voice notes, WAV, ...)")
+    parser.add_argument("--lang", default="id", help="Bot language code (id, en, ru, jp)")
+    parser.add_argument("--backends", default="local,google", help="Comma-separated backend names")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per file per backend")
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
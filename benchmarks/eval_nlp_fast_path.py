@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Offline evaluation of the NLP short-message fast path.
+
+Runs every message of a corpus through both the cheap prefilter
+(core.prefilter) and the transformer emotion models, then reports how many
+messages the fast path would take, how often it agrees with the models and
+which messages disagree. Use it before changing NLP_FAST_PATH_CONFIDENCE or
+the emoji/laughter tables.
+
+Usage:
+    python benchmarks/eval_nlp_fast_path.py [corpus.txt] [--threshold 0.8]
+
+The corpus has one message per line, optionally prefixed with "<lang>\\t".
+Lines starting with "#" are ignored. The models are built directly from the
+IDs in config.settings so no database connection is needed.
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.settings import EMOTION_MODEL_ID, EMOTION_MODEL_EN, NLP_FAST_PATH_CONFIDENCE
+from core.prefilter import classify_short_message
+
+DEFAULT_CORPUS = project_root / "benchmarks" / "data" / "short_messages.txt"
+
+# Fine-grained model labels folded into the prefilter's coarse emotions
+COARSE_EMOTIONS: Dict[str, str] = {
+    # go_emotions
+    "admiration": "joy", "amusement": "joy", "approval": "joy", "caring": "joy",
+    "excitement": "joy", "gratitude": "joy", "joy": "joy", "love": "joy",
+    "optimism": "joy", "pride": "joy", "relief": "joy", "desire": "joy",
+    "sadness": "sadness", "grief": "sadness", "disappointment": "sadness",
+    "remorse": "sadness", "embarrassment": "sadness",
+    "anger": "anger", "annoyance": "anger", "disapproval": "anger", "disgust": "anger",
+    "fear": "fear", "nervousness": "fear",
+    "surprise": "surprise", "realization": "surprise", "confusion": "surprise",
+    "curiosity": "neutral", "neutral": "neutral",
+    # Indonesian classifier
+    "senang": "joy", "bahagia": "joy", "cinta": "joy", "sedih": "sadness",
+    "marah": "anger", "takut": "fear", "terkejut": "surprise", "netral": "neutral",
+}
+
+
+def load_corpus(path: Path) -> List[Tuple[str, str]]:
+    """Read (lang, message) pairs from a corpus file."""
+    samples = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        if "\t" in line:
+            lang, message = line.split("\t", 1)
+        else:
+            lang, message = "en", line
+        samples.append((lang.strip() or "en", message))
+    return samples
+
+
+def load_models():
+    """Build the emotion pipelines used by NLPEngine."""
+    from transformers import pipeline
+    return {
+        "id": pipeline(task="text-classification", model=EMOTION_MODEL_ID, top_k=1),
+        "en": pipeline(task="text-classification", model=EMOTION_MODEL_EN, top_k=1),
+    }
+
+
+def model_emotion(models, lang: str, text: str) -> Optional[str]:
+    """Return the coarse emotion predicted by the language's model."""
+    classifier = models["id"] if lang == "id" else models["en"]
+    result = classifier(text)
+    if not result:
+        return None
+    top = result[0][0] if isinstance(result[0], list) else result[0]
+    label = top["label"].lower()
+    return COARSE_EMOTIONS.get(label, label)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Evaluate the NLP short-message fast path")
+    parser.add_argument("corpus", nargs="?", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--threshold", type=float, default=NLP_FAST_PATH_CONFIDENCE)
+    parser.add_argument("--no-models", action="store_true", help="Only report prefilter coverage")
+    args = parser.parse_args()
+
+    samples = load_corpus(args.corpus)
+    if not samples:
+        print(f"❌ Empty corpus: {args.corpus}")
+        return 1
+
+    models = None
+    if not args.no_models:
+        try:
+            models = load_models()
+        except Exception as e:
+            print(f"⚠️ Could not load models ({e}); reporting coverage only")
+
+    taken = 0
+    agree = 0
+    reasons: Counter = Counter()
+    disagreements = []
+    prefilter_time = 0.0
+    model_time = 0.0
+
+    for lang, text in samples:
+        start = time.perf_counter()
+        result = classify_short_message(text)
+        prefilter_time += time.perf_counter() - start
+
+        if result is None or result.confidence < args.threshold:
+            continue
+        taken += 1
+        reasons[result.reason] += 1
+
+        if models is None:
+            continue
+        start = time.perf_counter()
+        expected = model_emotion(models, lang, text)
+        model_time += time.perf_counter() - start
+        if expected == result.emotion:
+            agree += 1
+        else:
+            disagreements.append((lang, text, result.emotion, expected, result.confidence))
+
+    total = len(samples)
+    print(f"Corpus: {args.corpus} ({total} messages), threshold={args.threshold}")
+    print(f"Fast path coverage: {taken}/{total} ({taken / total:.1%})")
+    for reason, count in reasons.most_common():
+        print(f"  {reason:<18} {count}")
+    print(f"Prefilter time: {prefilter_time * 1000 / total:.3f} ms/message")
+
+    if models is not None and taken:
+        print(f"Agreement with models: {agree}/{taken} ({agree / taken:.1%})")
+        print(f"Model time on fast-path messages: {model_time * 1000 / taken:.1f} ms/message")
+        if disagreements:
+            print("\nDisagreements (lang, message, prefilter, model, confidence):")
+            for lang, text, got, expected, confidence in disagreements:
+                print(f"  [{lang}] {text!r}: {got} vs {expected} ({confidence})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
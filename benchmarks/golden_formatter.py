@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Golden-corpus regression check and benchmark for response formatting.
+
+Runs format_persona_response, _split_mixed_quote_paragraphs,
+detect_russian_expressions and _split_long_message over a checked-in corpus
+of anonymised Gemini outputs (short, long, 4096+ chars, emoji-heavy, code
+blocks, edge cases) and
+
+* compares every output with the golden file, so an optimisation cannot
+  silently change rendering (exit code 1 on any difference), and
+* reports µs/response and allocation figures per function.
+
+Usage:
+    python benchmarks/golden_formatter.py                # check + benchmark
+    python benchmarks/golden_formatter.py --check-only   # no timings
+    python benchmarks/golden_formatter.py --update       # rewrite goldens
+
+Only run --update after reviewing the diff printed by a failing check.
+"""
+import argparse
+import difflib
+import json
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from utils.formatters import (
+    _split_long_message,
+    _split_mixed_quote_paragraphs,
+    format_persona_response,
+)
+from utils.russian_translator import detect_russian_expressions
+
+DATA_DIR = project_root / "benchmarks" / "data"
+CORPUS_PATH = DATA_DIR / "formatter_corpus.json"
+GOLDEN_PATH = DATA_DIR / "formatter_golden.json"
+
+CASES: Dict[str, Callable[[str], Any]] = {
+    "format_persona_response": lambda text: format_persona_response(text, use_html=True),
+    "format_persona_response[split_quotes]": lambda text: format_persona_response(
+        text, use_html=True, split_quotes=True
+    ),
+    "_split_mixed_quote_paragraphs": _split_mixed_quote_paragraphs,
+    "detect_russian_expressions": detect_russian_expressions,
+    "_split_long_message": lambda text: _split_long_message(
+        format_persona_response(text, max_paragraphs=None, use_html=True), True
+    ),
+}
+
+
+def run_cases(corpus: List[Dict[str, str]]) -> Dict[str, Dict[str, Any]]:
+    """Return {sample id: {case name: output}} for the whole corpus."""
+    return {
+        sample["id"]: {name: func(sample["text"]) for name, func in CASES.items()}
+        for sample in corpus
+    }
+
+
+def check(results: Dict[str, Dict[str, Any]], golden: Dict[str, Dict[str, Any]]) -> int:
+    """Print a diff for every output that differs from the golden file."""
+    failures = 0
+    for sample_id, outputs in results.items():
+        expected_outputs = golden.get(sample_id)
+        if expected_outputs is None:
+            print(f"❌ {sample_id}: no golden output (run with --update)")
+            failures += 1
+            continue
+        for name, actual in outputs.items():
+            expected = expected_outputs.get(name)
+            if actual == expected:
+                continue
+            failures += 1
+            print(f"❌ {sample_id} / {name}")
+            diff = difflib.unified_diff(
+                json.dumps(expected, ensure_ascii=False, indent=1).splitlines(),
+                json.dumps(actual, ensure_ascii=False, indent=1).splitlines(),
+                "golden", "actual", lineterm="",
+            )
+            for line in diff:
+                print(f"    {line}")
+    return failures
+
+
+def benchmark(corpus: List[Dict[str, str]], iterations: int) -> None:
+    """Print µs/response and allocations per response for every case."""
+    texts = [sample["text"] for sample in corpus]
+    print(f"\n{'function':<40} {'µs/response':>12} {'KiB alloc':>10} {'KiB peak':>9}")
+    for name, func in CASES.items():
+        seconds = timeit.timeit(lambda: [func(text) for text in texts], number=iterations)
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        for text in texts:
+            func(text)
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        allocated = sum(stat.size_diff for stat in after.compare_to(before, "lineno") if stat.size_diff > 0)
+
+        per_response_us = seconds * 1e6 / (iterations * len(texts))
+        print(
+            f"{name:<40} {per_response_us:>12.1f} "
+            f"{allocated / 1024 / len(texts):>10.2f} {peak / 1024 / len(texts):>9.2f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Formatter golden-corpus check and benchmark")
+    parser.add_argument("--update", action="store_true", help="Rewrite the golden outputs")
+    parser.add_argument("--check-only", action="store_true", help="Skip the benchmark")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = json.loads(CORPUS_PATH.read_text(encoding="utf-8"))
+    results = run_cases(corpus)
+
+    if args.update:
+        GOLDEN_PATH.write_text(
+            json.dumps(results, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"✅ Wrote golden outputs for {len(results)} samples to {GOLDEN_PATH}")
+        return 0
+
+    golden = json.loads(GOLDEN_PATH.read_text(encoding="utf-8"))
+    failures = check(results, golden)
+    total = len(results) * len(CASES)
+    if failures:
+        print(f"\n❌ {failures}/{total} outputs differ from {GOLDEN_PATH.name}")
+    else:
+        print(f"✅ {total} outputs match {GOLDEN_PATH.name} ({len(results)} samples)")
+
+    if not args.check_only:
+        benchmark(corpus, args.iterations)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
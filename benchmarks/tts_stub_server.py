@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Stub Alya-TTS service for exercising the TTS dispatcher without a GPU.
+
+Accepts ``POST /tts`` like the real service and answers ``GET /tts/<job_id>``
+with the job's delivery status. Failures and saturation can be injected to
+check retries and backpressure:
+
+    python benchmarks/tts_stub_server.py --port 5001 --fail-rate 0.3 --saturate-every 5
+
+Delivered jobs report a fake Telegram ``file_id`` so the TTS audio cache can
+be exercised. Point the bot at it with TTS_SERVICE_URL=http://localhost:5001.
+With ``--drive N`` the script instead starts the stub, sends N replies
+(cycling through ``--distinct`` texts) through dispatch_tts for ``--rounds``
+rounds against throwaway queue/cache files and prints the dispatcher stats
+once every job has settled (no Telegram calls are made).
+"""
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from aiohttp import ClientSession, web
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def build_app(args: argparse.Namespace) -> web.Application:
+    jobs: Dict[str, Dict[str, Any]] = {}
+    counters = {"requests": 0, "accepted": 0, "failed": 0, "saturated": 0, "duplicates": 0}
+
+    async def deliver(job_id: str, callback_url: str) -> None:
+        await asyncio.sleep(args.delay)
+        jobs[job_id]["status"] = "delivered"
+        jobs[job_id]["file_id"] = f"stub-voice-{job_id}"
+        if callback_url:
+            try:
+                async with ClientSession() as session:
+                    await session.post(callback_url, json={
+                        "job_id": job_id, "status": "delivered", "file_id": jobs[job_id]["file_id"]
+                    })
+            except Exception as e:
+                print(f"callback for {job_id} failed: {e}")
+
+    async def submit(request: web.Request) -> web.Response:
+        counters["requests"] += 1
+        if args.saturate_every and counters["requests"] % args.saturate_every == 0:
+            counters["saturated"] += 1
+            return web.json_response({"error": "busy"}, status=429, headers={"Retry-After": str(args.retry_after)})
+        if random.random() < args.fail_rate:
+            counters["failed"] += 1
+            return web.json_response({"error": "injected failure"}, status=500)
+        body = await request.json()
+        job_id = body.get("job_id") or str(counters["requests"])
+        if job_id in jobs:
+            counters["duplicates"] += 1
+            return web.json_response({"job_id": job_id, "status": jobs[job_id]["status"]}, status=202)
+        jobs[job_id] = {"status": "processing", "chat_id": body.get("chat_id")}
+        counters["accepted"] += 1
+        asyncio.create_task(deliver(job_id, body.get("callback_url", "")))
+        return web.json_response({"job_id": job_id, "status": "queued"}, status=202)
+
+    async def status(request: web.Request) -> web.Response:
+        job = jobs.get(request.match_info["job_id"])
+        if job is None:
+            return web.json_response({"error": "unknown job"}, status=404)
+        return web.json_response({"job_id": request.match_info["job_id"], **job})
+
+    async def stats(request: web.Request) -> web.Response:
+        return web.json_response(counters)
+
+    app = web.Application()
+    app.router.add_post("/tts", submit)
+    app.router.add_get("/tts/{job_id}", status)
+    app.router.add_get("/stats", stats)
+    app["counters"] = counters
+    return app
+
+
+async def drive(args: argparse.Namespace, app: web.Application) -> int:
+    from utils.http_client import http_clients
+    from utils.tts_queue import FINAL_STATES, TTSQueueWorker, dispatch_tts
+
+    class _PrintBot:
+        async def send_message(self, chat_id: int, text: str, **kwargs: Any) -> None:
+            print(f"notify chat {chat_id}: {text}")
+
+        async def send_voice(self, chat_id: int, voice: str, **kwargs: Any) -> None:
+            pass
+
+        async def delete_message(self, chat_id: int, message_id: int) -> None:
+            pass
+
+    bot = _PrintBot()
+    with tempfile.TemporaryDirectory() as tmp:
+        worker = TTSQueueWorker(
+            store_path=f"{tmp}/tts_queue.sqlite3",
+            service_url=f"http://127.0.0.1:{args.port}",
+            audio_cache_path=f"{tmp}/tts_audio_cache.sqlite3",
+        )
+        TTSQueueWorker._instance = worker
+        await http_clients.start()
+        await worker.start(bot)
+        for round_no in range(1, args.rounds + 1):
+            start = time.perf_counter()
+            job_ids = await asyncio.gather(*(
+                dispatch_tts(bot, i, i, None, f"reply {i % args.distinct}", "en", "en")
+                for i in range(args.drive)
+            ))
+            accept_time = time.perf_counter() - start
+            queued = sum(1 for job_id in job_ids if job_id)
+            while True:
+                counts = worker.store.counts()
+                if sum(counts.get(state, 0) for state in FINAL_STATES) >= sum(counts.values()):
+                    break
+                await asyncio.sleep(0.2)
+            print(f"round {round_no}: {queued}/{args.drive} sent to the service, "
+                  f"{args.drive - queued} from cache, accepted in {accept_time:.2f}s, "
+                  f"settled in {time.perf_counter() - start:.2f}s")
+        print(f"dispatcher: {worker.stats()}")
+        print(f"service:    {app['counters']}")
+        await worker.stop()
+        worker.store.close()
+        await http_clients.close()
+    return 0
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    app = build_app(args)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    print(f"Stub Alya-TTS listening on {args.host}:{args.port}")
+    try:
+        if args.drive:
+            return await drive(args, app)
+        await asyncio.Event().wait()
+        return 0
+    finally:
+        await runner.cleanup()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stub Alya-TTS service for dispatcher testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of submissions answered with 500")
+    parser.add_argument("--saturate-every", type=int, default=0, help="Answer every Nth submission with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429")
+    parser.add_argument("--delay", type=float, default=0.5, help="Seconds until a job counts as delivered")
+    parser.add_argument("--drive", type=int, default=0, help="Queue N jobs through the dispatcher and report")
+    parser.add_argument("--distinct", type=int, default=1000000, help="Distinct reply texts used by --drive")
+    parser.add_argument("--rounds", type=int, default=1, help="Rounds of --drive replies")
+    try:
+        return asyncio.run(main_async(parser.parse_args()))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -45,9 +45,79 @@ MAX_OUTPUT_TOKENS: int = 8192
 TEMPERATURE: float = 0.7
 TOP_K: int = 40
 TOP_P: float = 0.95
+# Answer image questions in one multimodal request (image + query); the
+# describe-then-answer path is only used when that request fails
+ANALYZE_SINGLE_CALL: bool = os.getenv("ANALYZE_SINGLE_CALL", "true").lower() == "true"
+# !ask result cache (utils/analyze.py): extracted context per Telegram file and
+# final answers per (file, normalised query, language), LRU + TTL in seconds
+ANALYZE_CONTEXT_CACHE_SIZE: int = int(os.getenv("ANALYZE_CONTEXT_CACHE_SIZE", "100"))
+ANALYZE_CONTEXT_CACHE_TTL: int = int(os.getenv("ANALYZE_CONTEXT_CACHE_TTL", str(6 * 3600)))
+ANALYZE_ANSWER_CACHE_SIZE: int = int(os.getenv("ANALYZE_ANSWER_CACHE_SIZE", "1000"))
+ANALYZE_ANSWER_CACHE_TTL: int = int(os.getenv("ANALYZE_ANSWER_CACHE_TTL", "3600"))
 
 # SauceNAO
 SAUCENAO_API_KEY: Optional[str] = os.getenv("SAUCENAO_API_KEY", None)
+SAUCENAO_CACHE_SIZE: int = int(os.getenv("SAUCENAO_CACHE_SIZE", "1000"))
+SAUCENAO_CACHE_TTL: int = int(os.getenv("SAUCENAO_CACHE_TTL", str(7 * 24 * 3600)))
+SAUCENAO_HASH_MAX_DISTANCE: int = int(os.getenv("SAUCENAO_HASH_MAX_DISTANCE", "4"))
+
+# Media downloads are kept in memory; larger files spill to a temp file (0 = never)
+MEDIA_SPILL_TO_DISK_BYTES: int = int(os.getenv("MEDIA_SPILL_TO_DISK_BYTES", "0"))
+
+# Image preprocessing before upload (utils/image_prep.py): max edge per target,
+# output format (JPEG or WEBP) and quality
+ANALYZE_IMAGE_MAX_EDGE: int = int(os.getenv("ANALYZE_IMAGE_MAX_EDGE", "1536"))
+SAUCENAO_IMAGE_MAX_EDGE: int = int(os.getenv("SAUCENAO_IMAGE_MAX_EDGE", "800"))
+IMAGE_PREP_FORMAT: str = os.getenv("IMAGE_PREP_FORMAT", "JPEG").upper()
+IMAGE_PREP_QUALITY: int = int(os.getenv("IMAGE_PREP_QUALITY", "85"))
+IMAGE_PREP_WORKERS: int = int(os.getenv("IMAGE_PREP_WORKERS", "2"))
+
+# Document text extraction for !ask (utils/doc_extract.py): read limits,
+# map-reduce summarisation above DOC_DIRECT_CHARS, cache by file_unique_id
+DOC_EXTRACT_WORKERS: int = int(os.getenv("DOC_EXTRACT_WORKERS", "1"))
+DOC_MAX_PAGES: int = int(os.getenv("DOC_MAX_PAGES", "100"))
+DOC_MAX_CHARS: int = int(os.getenv("DOC_MAX_CHARS", "300000"))
+DOC_DIRECT_CHARS: int = int(os.getenv("DOC_DIRECT_CHARS", "30000"))
+DOC_CHUNK_CHARS: int = int(os.getenv("DOC_CHUNK_CHARS", "15000"))
+DOC_MAP_CONCURRENCY: int = int(os.getenv("DOC_MAP_CONCURRENCY", "4"))
+DOC_CACHE_PATH: str = os.getenv("DOC_CACHE_PATH", "data/doc_cache.sqlite3")
+DOC_CACHE_SIZE: int = int(os.getenv("DOC_CACHE_SIZE", "500"))
+
+# Outbound HTTP (shared pooled sessions, see utils/http_client.py)
+HTTP_POOL_LIMIT: int = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_LIMIT_PER_HOST: int = int(os.getenv("HTTP_LIMIT_PER_HOST", "10"))
+HTTP_DNS_CACHE_TTL: int = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_TIMEOUTS: Dict[str, float] = {
+    "default": 15.0,
+    "search": 15.0,
+    "saucenao": 30.0,
+    "github": 10.0,
+    "tts": 5.0,
+    "translate": 10.0,
+    "telegram": 60.0,
+}
+
+# Web search result cache (utils/search_engine.py), TTLs in seconds per search type
+SEARCH_CACHE_SIZE: int = int(os.getenv("SEARCH_CACHE_SIZE", "500"))
+SEARCH_CACHE_TTLS: Dict[str, float] = {
+    "news": float(os.getenv("SEARCH_CACHE_TTL_NEWS", "600")),
+    "general": float(os.getenv("SEARCH_CACHE_TTL_GENERAL", "3600")),
+    "image": float(os.getenv("SEARCH_CACHE_TTL_IMAGE", "21600")),
+    "profile": float(os.getenv("SEARCH_CACHE_TTL_PROFILE", "86400")),
+}
+SEARCH_STALE_TTL: float = float(os.getenv("SEARCH_STALE_TTL", "3600"))
+SEARCH_PROFILE_PARALLELISM: int = int(os.getenv("SEARCH_PROFILE_PARALLELISM", "3"))
+
+# Google CSE key scheduling (utils/api_key_scheduler.py)
+GOOGLE_CSE_DAILY_LIMIT: int = int(os.getenv("GOOGLE_CSE_DAILY_LIMIT", "100"))
+GOOGLE_CSE_KEY_COOLDOWN: float = float(os.getenv("GOOGLE_CSE_KEY_COOLDOWN", "3600"))
+GOOGLE_CSE_KEY_STATE_PATH: str = os.getenv("GOOGLE_CSE_KEY_STATE_PATH", "data/cse_key_state.json")
+
+# Voice reply translation (utils/language_translator.py)
+TRANSLATE_CACHE_SIZE: int = int(os.getenv("TRANSLATE_CACHE_SIZE", "1000"))
+TRANSLATE_CACHE_TTL: int = int(os.getenv("TRANSLATE_CACHE_TTL", "86400"))
+TRANSLATE_MAX_QUERY_CHARS: int = int(os.getenv("TRANSLATE_MAX_QUERY_CHARS", "1800"))
 
 # Memory
 MAX_MEMORY_ITEMS: int = 80
@@ -90,6 +160,12 @@ EMOTION_MODEL_EN: str = os.getenv("EMOTION_MODEL_EN", "AnasAlokla/multilingual_g
 INTENT_SENTIMENT_MODEL: str = os.getenv("INTENT_SENTIMENT_MODEL", "cardiffnlp/twitter-roberta-base-sentiment-latest")
 INTENT_CONFIDENCE_THRESHOLD: float = 0.30
 USE_HYBRID_INTENT: bool = os.getenv("USE_HYBRID_INTENT", "true").lower() == "true"
+NLP_FAST_PATH_ENABLED: bool = os.getenv("NLP_FAST_PATH_ENABLED", "true").lower() == "true"
+NLP_FAST_PATH_CONFIDENCE: float = float(os.getenv("NLP_FAST_PATH_CONFIDENCE", "0.8"))
+NLP_PERSISTENT_CACHE_ENABLED: bool = os.getenv("NLP_PERSISTENT_CACHE_ENABLED", "true").lower() == "true"
+NLP_PERSISTENT_CACHE_PATH: str = os.getenv("NLP_PERSISTENT_CACHE_PATH", "data/nlp_cache.sqlite3")
+NLP_PERSISTENT_CACHE_SIZE: int = int(os.getenv("NLP_PERSISTENT_CACHE_SIZE", "50000"))
+RUSSIAN_LEARNED_TRANSLATIONS_PATH: str = os.getenv("RUSSIAN_LEARNED_TRANSLATIONS_PATH", "data/russian_translations.json")
 
 # Feature Flags
 FEATURES: Dict[str, bool] = {
@@ -102,6 +178,51 @@ FEATURES: Dict[str, bool] = {
 # Voice (STT handled locally, TTS handled by Alya-TTS microservice)
 VOICE_ENABLED: bool = os.getenv("VOICE_ENABLED", "true").lower() == "true"
 
+# Speech-to-text backend ("google" or "local" faster-whisper), optionally per language
+STT_BACKEND: str = os.getenv("STT_BACKEND", "google").lower()
+STT_BACKEND_BY_LANG: Dict[str, str] = {
+    lang.strip(): backend.strip().lower()
+    for lang, _, backend in (
+        item.partition(":") for item in os.getenv("STT_BACKEND_BY_LANG", "").split(",") if ":" in item
+    )
+}
+STT_LOCAL_MODEL: str = os.getenv("STT_LOCAL_MODEL", "small")
+STT_LOCAL_COMPUTE_TYPE: str = os.getenv("STT_LOCAL_COMPUTE_TYPE", "int8")
+STT_LOCAL_WORKERS: int = int(os.getenv("STT_LOCAL_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+STT_LOCAL_CPU_THREADS: int = int(os.getenv("STT_LOCAL_CPU_THREADS", "2"))
+STT_LOCAL_BEAM_SIZE: int = int(os.getenv("STT_LOCAL_BEAM_SIZE", "1"))
+STT_STREAM_WINDOW_SECONDS: float = float(os.getenv("STT_STREAM_WINDOW_SECONDS", "30"))
+# Audio repeated at the start of each window so words on a boundary are heard whole
+STT_STREAM_OVERLAP_SECONDS: float = float(os.getenv("STT_STREAM_OVERLAP_SECONDS", "1.0"))
+STT_MAX_AUDIO_SECONDS: float = float(os.getenv("STT_MAX_AUDIO_SECONDS", "600"))
+
+# Alya-TTS microservice client (utils/tts_queue.py): durable local queue,
+# retries with exponential backoff, delivery confirmation by callback or polling
+TTS_SERVICE_URL: str = os.getenv("TTS_SERVICE_URL", "http://localhost:5001").rstrip("/")
+TTS_QUEUE_PATH: str = os.getenv("TTS_QUEUE_PATH", "data/tts_queue.sqlite3")
+TTS_DISPATCH_CONCURRENCY: int = int(os.getenv("TTS_DISPATCH_CONCURRENCY", "4"))
+TTS_MAX_ATTEMPTS: int = int(os.getenv("TTS_MAX_ATTEMPTS", "5"))
+TTS_RETRY_BASE_DELAY: float = float(os.getenv("TTS_RETRY_BASE_DELAY", "1"))
+TTS_RETRY_MAX_DELAY: float = float(os.getenv("TTS_RETRY_MAX_DELAY", "60"))
+TTS_JOB_MAX_AGE: int = int(os.getenv("TTS_JOB_MAX_AGE", "300"))
+TTS_ACCEPT_WAIT: float = float(os.getenv("TTS_ACCEPT_WAIT", "30"))
+TTS_STATUS_POLL_INTERVAL: float = float(os.getenv("TTS_STATUS_POLL_INTERVAL", "10"))
+TTS_DELIVERY_TIMEOUT: int = int(os.getenv("TTS_DELIVERY_TIMEOUT", "600"))
+TTS_CALLBACK_URL: str = os.getenv("TTS_CALLBACK_URL", "")
+TTS_CALLBACK_HOST: str = os.getenv("TTS_CALLBACK_HOST", "0.0.0.0")
+TTS_CALLBACK_PORT: int = int(os.getenv("TTS_CALLBACK_PORT", "0"))
+TTS_CALLBACK_SECRET: str = os.getenv("TTS_CALLBACK_SECRET", "")
+TTS_QUEUE_RETENTION: int = int(os.getenv("TTS_QUEUE_RETENTION", "86400"))
+# (voice_lang, text hash) -> Telegram file_id of delivered voice notes; 0 disables
+TTS_AUDIO_CACHE_PATH: str = os.getenv("TTS_AUDIO_CACHE_PATH", "data/tts_audio_cache.sqlite3")
+TTS_AUDIO_CACHE_SIZE: int = int(os.getenv("TTS_AUDIO_CACHE_SIZE", "5000"))
+
+# Voice job queues (utils/voice_queue.py): global and per-user concurrency
+VOICE_STT_CONCURRENCY: int = int(os.getenv("VOICE_STT_CONCURRENCY", str(os.cpu_count() or 2)))
+VOICE_TTS_CONCURRENCY: int = int(os.getenv("VOICE_TTS_CONCURRENCY", "4"))
+VOICE_QUEUE_PER_USER: int = int(os.getenv("VOICE_QUEUE_PER_USER", "1"))
+VOICE_QUEUE_MAX_WAITING: int = int(os.getenv("VOICE_QUEUE_MAX_WAITING", "50"))
+
 # Response Formatting
 FORMAT_ROLEPLAY: bool = True
 FORMAT_EMOTION: bool = True
@@ -27,6 +27,10 @@ from handlers.voice import VoiceHandler
 from utils.roast import RoastHandler
 from utils.voice_processor import VoiceProcessor
 from utils.tts_queue import TTSQueueWorker
+from utils.doc_extract import shutdown_document_reader
+from utils.api_key_scheduler import cse_key_scheduler
+from utils.http_client import http_clients
+from utils.language_translator import get_translator
 
 logger = logging.getLogger(__name__)
 
@@ -54,12 +58,28 @@ def configure_logging() -> None:
     telegram_logger.addHandler(handler)
 
 async def post_init(application: Application) -> None:
+    await http_clients.start()
+    if VOICE_ENABLED:
+        await TTSQueueWorker.get_instance().start(application.bot)
     try:
         await set_bot_commands(application)
         logger.info("Registered commands to Telegram menu")
     except Exception as e:
         logger.error(f"Failed to register bot commands: {e}")
 
+async def post_shutdown(application: Application) -> None:
+    if VOICE_ENABLED:
+        await TTSQueueWorker.get_instance().stop()
+    shutdown_document_reader()
+    cse_key_scheduler.flush()
+    nlp_engine = application.bot_data.get("nlp_engine")
+    if nlp_engine is not None:
+        nlp_engine.close()
+    voice_processor = application.bot_data.get("voice_processor")
+    if voice_processor is not None:
+        voice_processor.shutdown()
+    await http_clients.close()
+
 def initialize_application() -> Optional[Application]:
     try:
         if not BOT_TOKEN:
@@ -73,7 +93,7 @@ def initialize_application() -> Optional[Application]:
         persona_manager = PersonaManager()
         nlp_engine = NLPEngine() if FEATURES.get("emotion_detection", False) else None
         
-        application = ApplicationBuilder().token(BOT_TOKEN).post_init(post_init).build()
+        application = ApplicationBuilder().token(BOT_TOKEN).post_init(post_init).post_shutdown(post_shutdown).build()
         application.bot_data.update({
             "db_manager": db_manager,
             "memory_manager": memory_manager,
@@ -93,6 +113,7 @@ def initialize_application() -> Optional[Application]:
         application.gemini_client = gemini_client
         application.persona_manager = persona_manager
         gemini_client.set_persona_manager(persona_manager)
+        get_translator().set_fallback_client(gemini_client)
 
         register_handlers(application, gemini_client, persona_manager, memory_manager, db_manager, nlp_engine, voice_processor)
         setup_scheduled_tasks(application)
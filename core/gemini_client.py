@@ -20,6 +20,36 @@ from config.settings import (
 
 logger = logging.getLogger(__name__)
 
+# Canned replies generate_response returns instead of a model answer
+FALLBACK_RESPONSES: Dict[str, Dict[str, str]] = {
+    "blocked": {
+        "en": "I can't talk about that topic. Let's talk about something else! \U0001F605",
+        "id": "Alya gak bisa bahas topik itu nih. Bahas yang lain aja yuk! \U0001F605",
+    },
+    "keys_exhausted": {
+        "en": "Sorry, I'm having some internal issues right now. Please try again later. \U0001F613",
+        "id": "Maaf, sepertinya Alya lagi ada masalah internal. Coba lagi nanti ya. \U0001F613",
+    },
+    "api_failed": {
+        "en": "I'm so sorry, all my connections to the data center are failing. Maybe try again in a few moments? \U0001F625",
+        "id": "Aduh, maaf banget, semua koneksi Alya ke pusat data lagi gagal. Mungkin bisa coba beberapa saat lagi? \U0001F625",
+    },
+    "retries_failed": {
+        "en": "I tried multiple times but it still failed. Something's not right. Please try again later. \U0001F614",
+        "id": "Duh, Alya coba berkali-kali tapi tetep gagal. Kayaknya ada yang gak beres. Coba lagi nanti ya. \U0001F614",
+    },
+}
+
+
+def _fallback_response(kind: str, lang: str) -> str:
+    return FALLBACK_RESPONSES[kind]["en" if lang == "en" else "id"]
+
+
+def is_fallback_response(text: Optional[str]) -> bool:
+    """Whether ``text`` is one of the canned replies rather than a model answer."""
+    return any(text in replies.values() for replies in FALLBACK_RESPONSES.values())
+
+
 class GeminiClient:
     """A client for interacting with Google's Gemini API with key rotation."""
 
@@ -126,6 +156,160 @@ class GeminiClient:
             
         return False
         
+    async def translate_text(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        """Translate plain text with Gemini, without persona or chat context.
+
+        Used as a fallback when the Google Translate endpoint fails.
+
+        Args:
+            text: Text to translate
+            source_lang: Source language code
+            target_lang: Target language code
+
+        Returns:
+            Translated text, or None if Gemini could not translate it
+        """
+        if not self.api_keys or not text:
+            return None
+
+        prompt = (
+            f"Translate the following text from '{source_lang}' to '{target_lang}'. "
+            f"Reply with the translation only, keeping the tone and punctuation.\n\n{text}"
+        )
+        return await self._generate_plain(
+            prompt,
+            GenerationConfig(temperature=0.2, max_output_tokens=MAX_OUTPUT_TOKENS),
+            purpose="translation",
+        )
+
+    async def summarize_text(self, text: str, lang: str = DEFAULT_LANGUAGE, part: Optional[str] = None) -> Optional[str]:
+        """Summarise one chunk of a long document, without persona or chat context.
+
+        Used for the map step of document analysis.
+
+        Args:
+            text: Document chunk
+            lang: Language code the summary is written in
+            part: Position of the chunk, e.g. "3/12", for the prompt
+
+        Returns:
+            The summary, or None if Gemini could not produce one
+        """
+        if not self.api_keys or not text:
+            return None
+
+        language = "English" if lang == "en" else "Bahasa Indonesia"
+        prompt = (
+            f"Summarise this {'part ' + part + ' of a' if part else ''} document in {language}. "
+            "Keep every fact, number, name, date, definition and conclusion that someone might ask about; "
+            "drop repetition and boilerplate. Reply with the summary only.\n\n"
+            f"{text}"
+        )
+        return await self._generate_plain(
+            prompt,
+            GenerationConfig(temperature=0.2, max_output_tokens=MAX_OUTPUT_TOKENS),
+            purpose="summarisation",
+        )
+
+    async def generate_media_response(
+        self,
+        user_id: int,
+        username: str,
+        query: str,
+        media: List[Any],
+        lang: str = DEFAULT_LANGUAGE,
+        retry_count: int = 2
+    ) -> Optional[str]:
+        """Answer a question about attached media in a single multimodal request.
+
+        The analyze persona prompt and the media (PIL images or
+        ``{"mime_type", "data"}`` parts) are sent together, so the model sees
+        the media itself instead of a text description of it.
+
+        Args:
+            user_id: User ID (for logging)
+            username: User's name
+            query: The user's question about the media
+            media: Media parts to send alongside the prompt
+            lang: The user's preferred language
+            retry_count: Attempts, rotating the API key after each failure
+
+        Returns:
+            Generated analysis, or None if the request failed or was blocked
+        """
+        if not self.persona_manager:
+            raise ValueError("Persona manager not set for GeminiClient")
+        if not self.api_keys:
+            return None
+
+        prompt = self.persona_manager.get_media_analysis_prompt(
+            username=username,
+            query=query,
+            media_context=None,
+            lang=lang
+        )
+        generation_config = GenerationConfig(
+            max_output_tokens=MAX_OUTPUT_TOKENS,
+            temperature=TEMPERATURE,
+            top_p=TOP_P,
+            top_k=TOP_K,
+        )
+        safety_settings = {
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+        }
+        return await self._generate_plain(
+            [prompt, *media],
+            generation_config,
+            safety_settings=safety_settings,
+            retry_count=retry_count,
+            purpose=f"media request for user {user_id}",
+        )
+
+    async def _generate_plain(
+        self,
+        contents: Any,
+        generation_config: GenerationConfig,
+        safety_settings: Optional[Dict[Any, Any]] = None,
+        retry_count: int = 2,
+        purpose: str = "request",
+    ) -> Optional[str]:
+        """Send one stateless request (no chat history or duplicate checks).
+
+        The blocking SDK call runs in a worker thread; after a failed attempt
+        the API key is rotated and the request retried.
+
+        Args:
+            contents: Prompt string, or a list of prompt and media parts
+            generation_config: Generation settings for the model
+            safety_settings: Optional safety thresholds
+            retry_count: Attempts, rotating the API key after each failure
+            purpose: What the request is for, used in log messages
+
+        Returns:
+            The stripped response text, or None if the request failed or was blocked
+        """
+        for attempt in range(retry_count):
+            try:
+                model = genai.GenerativeModel(
+                    model_name=self.model,
+                    generation_config=generation_config,
+                    safety_settings=safety_settings,
+                )
+                response_obj = await asyncio.to_thread(model.generate_content, contents)
+                if not response_obj.candidates:
+                    feedback = getattr(response_obj, 'prompt_feedback', 'No feedback provided')
+                    logger.warning(f"Blocked Gemini {purpose}. Feedback: {feedback}")
+                    return None
+                return response_obj.text.strip() or None
+            except Exception as e:
+                logger.error(f"Gemini {purpose} failed on attempt {attempt+1}: {e}")
+                if attempt < retry_count - 1 and not self._rotate_key():
+                    break
+        return None
+
     async def generate_response(
         self,
         user_id: int,
@@ -197,9 +381,7 @@ class GeminiClient:
                 if not response_obj.candidates:
                     feedback = getattr(response_obj, 'prompt_feedback', 'No feedback provided')
                     logger.warning(f"Blocked prompt. Feedback: {feedback}")
-                    if lang == "en":
-                        return "I can't talk about that topic. Let's talk about something else! \U0001F605"
-                    return "Alya gak bisa bahas topik itu nih. Bahas yang lain aja yuk! \U0001F605"
+                    return _fallback_response("blocked", lang)
                     
                 response = response_obj.text
                 
@@ -257,15 +439,9 @@ class GeminiClient:
                     success = self._rotate_key()
                     if not success:
                         logger.critical("All API keys exhausted. Unable to generate content.")
-                        if lang == "en":
-                            return "Sorry, I'm having some internal issues right now. Please try again later. \U0001F613"
-                        return "Maaf, sepertinya Alya lagi ada masalah internal. Coba lagi nanti ya. \U0001F613"
+                        return _fallback_response("keys_exhausted", lang)
                 else:
                     logger.critical(f"Failed to generate content after trying all API keys: {e}")
-                    if lang == "en":
-                        return "I'm so sorry, all my connections to the data center are failing. Maybe try again in a few moments? \U0001F625"
-                    return "Aduh, maaf banget, semua koneksi Alya ke pusat data lagi gagal. Mungkin bisa coba beberapa saat lagi? \U0001F625"
+                    return _fallback_response("api_failed", lang)
         
-        if lang == "en":
-            return "I tried multiple times but it still failed. Something's not right. Please try again later. \U0001F614"
-        return "Duh, Alya coba berkali-kali tapi tetep gagal. Kayaknya ada yang gak beres. Coba lagi nanti ya. \U0001F614"
+        return _fallback_response("retries_failed", lang)
@@ -2,6 +2,7 @@
 NLP utilities for Alya Bot, including emotion detection and personality modeling.
 """
 import os
+import re
 import time
 import hashlib
 import logging
@@ -28,9 +29,173 @@ from config.settings import (
     INTENT_SENTIMENT_MODEL,
     INTENT_CONFIDENCE_THRESHOLD,
     USE_HYBRID_INTENT,
+    NLP_FAST_PATH_ENABLED,
+    NLP_FAST_PATH_CONFIDENCE,
+    NLP_PERSISTENT_CACHE_ENABLED,
+    NLP_PERSISTENT_CACHE_PATH,
+    NLP_PERSISTENT_CACHE_SIZE,
     DEFAULT_LANGUAGE
 )
 from database.database_manager import db_manager, DatabaseManager
+from utils.cache import TTLCache, PersistentLRUCache
+from core.prefilter import classify_short_message
+from utils.emoji import find_emoji
+
+# Bilingual keyword patterns for each intent, in priority order (first match wins).
+# Format: {intent: ([id_keywords], [en_keywords])}
+INTENT_KEYWORDS: Dict[str, Tuple[List[str], List[str]]] = {
+    "gratitude": (
+        # Indonesian
+        ["terima kasih", "makasih", "thanks", "thx", "tengkyu", "matursuwun"],
+        # English
+        ["thank you", "thanks", "thx", "appreciate", "grateful"]
+    ),
+    "apology": (
+        # Indonesian
+        ["maaf", "mohon maaf", "sorry", "sori", "minta maaf", "nyesel"],
+        # English
+        ["sorry", "apologize", "apologies", "my bad", "forgive me"]
+    ),
+    "greeting": (
+        # Indonesian
+        ["hai", "halo", "hi", "hey", "selamat pagi", "selamat siang",
+         "selamat sore", "selamat malam", "assalamualaikum", "salam"],
+        # English
+        ["hi", "hello", "hey", "good morning", "good afternoon",
+         "good evening", "good night", "greetings", "yo", "sup"]
+    ),
+    "compliment": (
+        # Indonesian
+        ["cantik", "ganteng", "keren", "hebat", "pintar", "bagus",
+         "luar biasa", "amazing", "perfect", "terbaik"],
+        # English
+        ["beautiful", "pretty", "handsome", "awesome", "amazing", "great",
+         "wonderful", "perfect", "best", "brilliant", "smart"]
+    ),
+    "insult": (
+        # Indonesian
+        ["bodoh", "tolol", "goblok", "idiot", "bego", "dungu", "anjing",
+         "monyet", "kampret", "jelek", "buruk"],
+        # English
+        ["stupid", "idiot", "dumb", "moron", "fool", "ugly"]
+    ),
+    "affection": (
+        # Indonesian
+        ["sayang", "cinta", "suka", "rindu", "kangen", "peluk", "cium",
+         "love you", "i love", "aku sayang"],
+        # English
+        ["love you", "i love", "miss you", "hug", "kiss", "darling",
+         "sweetheart", "dear", "honey"]
+    ),
+    "romantic_interest": (
+        # Indonesian
+        ["pacar", "pacaran", "jadian", "menikah", "nikah", "istri", "suami",
+         "marry me", "be my", "jadi pacarku"],
+        # English
+        ["marry me", "be my girlfriend", "be my boyfriend", "date me",
+         "go out with me", "relationship", "couple"]
+    ),
+    "question": (
+        # Indonesian (question markers)
+        ["apa", "siapa", "kenapa", "bagaimana", "dimana", "kapan", "berapa",
+         "apakah", "mengapa", "gimana", "gmn"],
+        # English
+        ["what", "who", "why", "how", "where", "when", "which", "whose"]
+    ),
+    "toxic_behavior": (
+        # Indonesian
+        ["mati", "bunuh", "ancam", "hancurkan", "hajar", "babat",
+         "gebuk", "pukul", "tendang"],
+        # English
+        ["kill", "die", "threat", "destroy", "hurt", "harm", "attack"]
+    ),
+    "rudeness": (
+        # Indonesian
+        ["babi", "tai", "shit", "fuck", "bangsat", "kontol", "memek",
+         "jancok", "cok", "asu"],
+        # English
+        ["fuck", "shit", "damn", "hell", "ass", "bitch", "bastard"]
+    )
+}
+
+# Indonesian enclitics ("sayangku", "cantiknya") still count as the base keyword
+_ID_KEYWORD_SUFFIX = r"(?:ku|mu|nya|lah|kah)?"
+
+
+class KeywordMatcher:
+    """Word-boundary multi-keyword matcher compiled once into a single regex.
+
+    Keywords are grouped by label; labels earlier in the mapping have higher
+    priority. One ``finditer`` pass over the text reports every label hit
+    (including overlapping keywords) so callers can resolve priority without
+    rescanning the text per keyword.
+    """
+
+    def __init__(self, keywords_by_label: Dict[str, List[str]], suffix: str = "") -> None:
+        self.priority: Dict[str, int] = {}
+        self._label_by_keyword: Dict[str, str] = {}
+        for rank, (label, keywords) in enumerate(keywords_by_label.items()):
+            self.priority[label] = rank
+            for keyword in keywords:
+                self._label_by_keyword.setdefault(keyword.lower(), label)
+
+        # Longest alternatives first so multi-word phrases beat their prefixes
+        alternation = "|".join(
+            re.escape(k) for k in sorted(self._label_by_keyword, key=len, reverse=True)
+        )
+        # Zero-width lookahead lets overlapping keywords all be reported
+        self._pattern = re.compile(rf"(?<!\w)(?=({alternation}){suffix}(?!\w))")
+
+    def scan(self, text_lower: str) -> List[Tuple[str, int]]:
+        """Return ``(label, position)`` for every keyword occurrence in the text."""
+        return [
+            (self._label_by_keyword[m.group(1)], m.start())
+            for m in self._pattern.finditer(text_lower)
+        ]
+
+    def first_label(self, text_lower: str) -> Optional[str]:
+        """Return the highest-priority label present in the text, if any."""
+        best: Optional[str] = None
+        for label, _ in self.scan(text_lower):
+            if best is None or self.priority[label] < self.priority[best]:
+                best = label
+        return best
+
+    def contains(self, text_lower: str) -> bool:
+        """Return True if any keyword occurs in the text."""
+        return self._pattern.search(text_lower) is not None
+
+
+_INTENT_MATCHERS: Dict[str, KeywordMatcher] = {
+    "id": KeywordMatcher(
+        {intent: id_kw for intent, (id_kw, _) in INTENT_KEYWORDS.items()},
+        suffix=_ID_KEYWORD_SUFFIX
+    ),
+    "en": KeywordMatcher({intent: en_kw for intent, (_, en_kw) in INTENT_KEYWORDS.items()}),
+}
+
+# Contextual cues used to refine a sentiment label into an intent
+_POSITIVE_SENTIMENT_CUES = KeywordMatcher({
+    "gratitude": ["terima", "thanks", "thank"],
+    "compliment": ["bagus", "hebat", "keren", "great", "awesome"],
+}, suffix=_ID_KEYWORD_SUFFIX)
+_NEGATIVE_SENTIMENT_CUES = KeywordMatcher({
+    "apology": ["maaf", "sorry", "apologize"],
+    "insult": ["bodoh", "tolol", "stupid", "idiot"],
+}, suffix=_ID_KEYWORD_SUFFIX)
+
+_ROMANTIC_CUES = KeywordMatcher(
+    {"romantic": ["jadi pacarnya", "pacaran", "istri", "suami", "marry"]},
+    suffix=_ID_KEYWORD_SUFFIX
+)
+
+# Direct address only counts at the start of a message or as a standalone word
+_ALYA_ADDRESS_RE = re.compile(
+    r"^(?:alya|kamu|lu|elu|lo|mu|kau|you|ur|yourself)(?!\w)"
+    r"|(?<= )(?:alya|kamu|lu|elu|lo|mu|kau|you|ur|yourself)(?= )"
+)
+_ALYA_QUESTION_CUES = KeywordMatcher({"question": ["apa", "siapa", "bagaimana"]})
+
 
 class NLPEngine:
     """NLP engine for emotion detection and context-aware features."""
@@ -38,27 +203,119 @@ class NLPEngine:
         self.emotion_classifier_id: Optional[Pipeline] = None
         self.emotion_classifier_en: Optional[Pipeline] = None
         self.sentiment_classifier: Optional[Pipeline] = None  # For hybrid intent detection
-        self._emotion_cache: Dict[str, Tuple[str, float]] = {}
-        self._intent_cache: Dict[str, Tuple[str, float]] = {}
         self._cache_ttl = 300
         self._max_cache_size = 1000
+        # Keyed by (model, lang, normalised text hash)
+        self._emotion_cache = TTLCache(maxsize=self._max_cache_size, ttl=self._cache_ttl)
+        self._intent_cache = TTLCache(maxsize=self._max_cache_size, ttl=self._cache_ttl)
+        self._sentiment_cache = TTLCache(maxsize=self._max_cache_size, ttl=self._cache_ttl)
+        # Model outputs (emotion, sentiment) also survive restarts on disk
+        self._persistent_cache: Optional[PersistentLRUCache] = None
+        if NLP_PERSISTENT_CACHE_ENABLED:
+            try:
+                self._persistent_cache = PersistentLRUCache(
+                    NLP_PERSISTENT_CACHE_PATH, maxsize=NLP_PERSISTENT_CACHE_SIZE
+                )
+            except Exception as e:
+                logger.warning(f"Persistent NLP cache disabled: {e}")
+        # Short-message fast path counters
+        self._fast_path_hits = 0
+        self._model_calls_avoided = 0
         self._initialize_models()
 
     def _get_text_hash(self, text: str) -> str:
         return hashlib.md5(text.encode('utf-8')).hexdigest()
 
-    def _is_cache_valid(self, timestamp: float) -> bool:
-        return time.time() - timestamp < self._cache_ttl
+    def _cache_key(self, model: str, lang: str, text: str) -> Tuple[str, str, str]:
+        """Build a cache key from model, language and whitespace/case-normalised text."""
+        normalised = " ".join(text.lower().split())
+        return (model, lang, self._get_text_hash(normalised))
+
+    def _cache_lookup(self, cache: TTLCache, cache_key: Tuple[str, str, str]) -> Any:
+        """Read a model result from memory, falling back to the persistent cache."""
+        cached = cache.get(cache_key)
+        if cached is not None or self._persistent_cache is None:
+            return cached
+        try:
+            cached = self._persistent_cache.get("|".join(cache_key))
+        except Exception as e:
+            logger.debug(f"Persistent NLP cache read failed: {e}")
+            return None
+        if isinstance(cached, list):
+            cached = tuple(cached)
+        if cached is not None:
+            cache.set(cache_key, cached)
+        return cached
+
+    def _cache_store(self, cache: TTLCache, cache_key: Tuple[str, str, str], value: Any) -> None:
+        """Store a model result in memory and in the persistent cache."""
+        cache.set(cache_key, value)
+        if self._persistent_cache is None:
+            return
+        try:
+            self._persistent_cache.set("|".join(cache_key), value)
+        except Exception as e:
+            logger.debug(f"Persistent NLP cache write failed: {e}")
+
+    def _get_user_language(self, user_id: Optional[int]) -> str:
+        """Look up the user's language, falling back to DEFAULT_LANGUAGE."""
+        if not user_id:
+            return DEFAULT_LANGUAGE
+        try:
+            user_settings = db_manager.get_user_settings(user_id)
+            return user_settings.get("language", DEFAULT_LANGUAGE)
+        except Exception as e:
+            logger.debug(f"Could not get user language for {user_id}: {e}")
+            return DEFAULT_LANGUAGE
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return size and hit/miss metrics for each NLP result cache."""
+        stats = {
+            "emotion": self._emotion_cache.stats(),
+            "intent": self._intent_cache.stats(),
+            "sentiment": self._sentiment_cache.stats(),
+        }
+        if self._persistent_cache is not None:
+            stats["persistent"] = self._persistent_cache.stats()
+        return stats
+
+    def close(self) -> None:
+        """Flush and close the persistent result cache."""
+        if self._persistent_cache is not None:
+            self._persistent_cache.close()
+            self._persistent_cache = None
 
-    def _cleanup_cache(self, cache_dict: Dict[str, Tuple]) -> None:
-        current_time = time.time()
-        expired_keys = [key for key, value in cache_dict.items() if current_time - value[-1] > self._cache_ttl]
-        for key in expired_keys:
-            cache_dict.pop(key, None)
-        if len(cache_dict) > self._max_cache_size:
-            sorted_items = sorted(cache_dict.items(), key=lambda x: x[1][-1])
-            for key, _ in sorted_items[:len(cache_dict) - self._max_cache_size]:
-                cache_dict.pop(key, None)
+    def get_fast_path_stats(self) -> Dict[str, int]:
+        """Return how often the short-message fast path skipped model inference."""
+        return {
+            "fast_path_hits": self._fast_path_hits,
+            "model_calls_avoided": self._model_calls_avoided,
+        }
+
+    def _fast_path_context(self, text: str, lang: str) -> Optional[Tuple[str, str]]:
+        """Resolve emotion/intent for trivially short messages without the models.
+
+        Returns:
+            (emotion, intent) when the prefilter is confident enough, else None
+        """
+        if not NLP_FAST_PATH_ENABLED:
+            return None
+        result = classify_short_message(text)
+        if result is None or result.confidence < NLP_FAST_PATH_CONFIDENCE:
+            return None
+
+        # Keyword intents still apply ("makasih", "hai"), they are cheap
+        intent = self._detect_intent_keywords(text.lower().strip(), lang)
+        self._fast_path_hits += 1
+        if self.emotion_classifier_id or self.emotion_classifier_en:
+            self._model_calls_avoided += 1
+        if intent == "normal":
+            intent = result.intent
+            # The slow path would have fallen through to the sentiment model
+            if self.sentiment_classifier:
+                self._model_calls_avoided += 1
+        logger.debug(f"[NLP] Fast path ({result.reason}, conf={result.confidence}) for {text!r}")
+        return result.emotion, intent
 
     def _initialize_models(self) -> None:
         """Initialize NLP models with error handling and compatibility checks."""
@@ -89,34 +346,31 @@ class NLPEngine:
         except Exception as e:
             logger.error(f"❌ NLP initialization failed: {e}")
 
-    def detect_emotion(self, text: str, user_id: int = None) -> Optional[str]:
+    def detect_emotion(self, text: str, user_id: int = None, lang: Optional[str] = None) -> Optional[str]:
         """
         Detect emotion using the appropriate model based on user language.
         
         Args:
             text: Input text to analyze
             user_id: User ID for language detection
+            lang: Already-resolved user language (skips the DB lookup)
             
         Returns:
             Detected emotion label or None if detection fails, defaults to DEFAULT_LANGUAGE
         """
-        # Determine user language from database
-        lang = DEFAULT_LANGUAGE
-        if user_id:
-            user_settings = db_manager.get_user_settings(user_id)
-            lang = user_settings.get("language", DEFAULT_LANGUAGE)
-        self._cleanup_cache(self._emotion_cache)
-        text_hash = self._get_text_hash(f"{lang}:{text}")
-        if text_hash in self._emotion_cache:
-            emotion, timestamp = self._emotion_cache[text_hash]
-            if self._is_cache_valid(timestamp):
-                return emotion
+        if lang is None:
+            lang = self._get_user_language(user_id)
+        model_id = EMOTION_MODEL_ID if lang == "id" else EMOTION_MODEL_EN
+        cache_key = self._cache_key(model_id, lang, text)
+        cached = self._cache_lookup(self._emotion_cache, cache_key)
+        if cached is not None:
+            return cached
         try:
             if lang == "id" and self.emotion_classifier_id:
                 result = self.emotion_classifier_id(text)
                 if result and len(result) > 0:
                     emotion = result[0]["label"] if isinstance(result[0], dict) else result[0][0]["label"]
-                    self._emotion_cache[text_hash] = (emotion, time.time())
+                    self._cache_store(self._emotion_cache, cache_key, emotion)
                     return emotion
             elif lang == "en" and self.emotion_classifier_en:
                 result = self.emotion_classifier_en(text)
@@ -125,11 +379,11 @@ class NLPEngine:
                     for candidate in result[0]:
                         if candidate["score"] >= EMOTION_CONFIDENCE_THRESHOLD:
                             emotion = candidate["label"]
-                            self._emotion_cache[text_hash] = (emotion, time.time())
+                            self._cache_store(self._emotion_cache, cache_key, emotion)
                             return emotion
                     # Fallback: pick top-1
                     emotion = result[0][0]["label"]
-                    self._emotion_cache[text_hash] = (emotion, time.time())
+                    self._cache_store(self._emotion_cache, cache_key, emotion)
                     return emotion
         except Exception as e:
             logger.error(f"Emotion detection failed: {e}")
@@ -150,12 +404,13 @@ class NLPEngine:
         Returns:
             Dict with emotion, intent, relationship_signals, and directed_at_alya flag
         """
-        # Periodic cache cleanup
-        self._cleanup_cache(self._emotion_cache)
-        self._cleanup_cache(self._intent_cache)
-        
-        emotion = self.detect_emotion(text, user_id)
-        intent = self._detect_intent(text, user_id)
+        lang = self._get_user_language(user_id)
+        fast_path = self._fast_path_context(text, lang)
+        if fast_path:
+            emotion, intent = fast_path
+        else:
+            emotion = self.detect_emotion(text, user_id, lang=lang)
+            intent = self._detect_intent(text, user_id, lang=lang)
         relationship_signals = self._detect_relationship_signals(text, emotion, intent)
         directed_at_alya = self._is_directed_at_alya(text)
         
@@ -173,7 +428,7 @@ class NLPEngine:
             "directed_at_alya": directed_at_alya
         }
     
-    def _detect_intent(self, text: str, user_id: int = None) -> str:
+    def _detect_intent(self, text: str, user_id: int = None, lang: Optional[str] = None) -> str:
         """Detect user's intent using hybrid approach (rule-based + ML fallback).
         
         Hybrid Strategy:
@@ -198,26 +453,21 @@ class NLPEngine:
         
         Args:
             text: User's message text
-            user_id: User ID for caching (optional)
+            user_id: User ID for language lookup (optional)
+            lang: Already-resolved user language (skips the DB lookup)
             
         Returns:
             str: Detected intent category
         """
-        # Check cache first
-        text_hash = self._get_text_hash(f"intent:{text}")
-        if text_hash in self._intent_cache:
-            intent, timestamp = self._intent_cache[text_hash]
-            if self._is_cache_valid(timestamp):
-                return intent
-        
         # Get user language for bilingual keyword selection
-        lang = DEFAULT_LANGUAGE
-        if user_id:
-            try:
-                user_settings = db_manager.get_user_settings(user_id)
-                lang = user_settings.get("language", DEFAULT_LANGUAGE)
-            except Exception as e:
-                logger.debug(f"Could not get user language for {user_id}: {e}")
+        if lang is None:
+            lang = self._get_user_language(user_id)
+        
+        # Check cache first (keywords differ per language, so lang is part of the key)
+        cache_key = self._cache_key("intent", lang, text)
+        cached = self._intent_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         text_lower = text.lower().strip()
         
@@ -226,21 +476,16 @@ class NLPEngine:
         
         if intent != "normal":
             # Cache and return
-            self._intent_cache[text_hash] = (intent, time.time())
+            self._intent_cache.set(cache_key, intent)
             logger.debug(f"Intent detected (rule-based): '{text[:50]}...' → {intent}")
             return intent
         
         # ===== PHASE 2: Sentiment-based fallback for ambiguous cases =====
         if USE_HYBRID_INTENT and self.sentiment_classifier:
             try:
-                result = self.sentiment_classifier(text)
-                if result and len(result) > 0:
-                    first_result = result[0]
-                    if isinstance(first_result, list):
-                        first_result = first_result[0]
-                    
-                    sentiment_label = first_result["label"].lower()
-                    confidence = first_result["score"]
+                sentiment = self._classify_sentiment(text, lang)
+                if sentiment:
+                    sentiment_label, confidence = sentiment
                     
                     if confidence >= INTENT_CONFIDENCE_THRESHOLD:
                         intent = self._map_sentiment_to_intent(sentiment_label, text_lower, lang)
@@ -257,13 +502,41 @@ class NLPEngine:
                 intent = "normal"
         
         # Cache result
-        self._intent_cache[text_hash] = (intent, time.time())
+        self._intent_cache.set(cache_key, intent)
         return intent
     
+    def _classify_sentiment(self, text: str, lang: str) -> Optional[Tuple[str, float]]:
+        """Run the sentiment classifier with caching.
+        
+        Args:
+            text: User's message text
+            lang: User language (part of the cache key)
+            
+        Returns:
+            Tuple of (lowercase sentiment label, confidence) or None if no result
+        """
+        cache_key = self._cache_key(INTENT_SENTIMENT_MODEL, lang, text)
+        cached = self._cache_lookup(self._sentiment_cache, cache_key)
+        if cached is not None:
+            return cached
+        
+        result = self.sentiment_classifier(text)
+        if not result or len(result) == 0:
+            return None
+        first_result = result[0]
+        if isinstance(first_result, list):
+            first_result = first_result[0]
+        
+        sentiment = (first_result["label"].lower(), first_result["score"])
+        self._cache_store(self._sentiment_cache, cache_key, sentiment)
+        return sentiment
+    
     def _detect_intent_keywords(self, text_lower: str, lang: str) -> str:
         """Detect intent using semantic keyword matching (bilingual).
         
-        Uses natural language patterns, NOT regex. Semantic understanding of context.
+        Uses the precompiled per-language matcher, so the message is scanned
+        once regardless of how many keywords are configured. Keywords only
+        match on word boundaries ("hi" does not fire inside "this").
         
         Args:
             text_lower: Lowercase message text
@@ -272,98 +545,18 @@ class NLPEngine:
         Returns:
             str: Detected intent or "normal" if no clear match
         """
-        # Define bilingual keyword patterns for each intent
-        # Format: {intent: ([id_keywords], [en_keywords])}
-        intent_patterns = {
-            "gratitude": (
-                # Indonesian
-                ["terima kasih", "makasih", "thanks", "thx", "tengkyu", "matursuwun"],
-                # English
-                ["thank you", "thanks", "thx", "appreciate", "grateful"]
-            ),
-            "apology": (
-                # Indonesian
-                ["maaf", "mohon maaf", "sorry", "sori", "minta maaf", "nyesel"],
-                # English
-                ["sorry", "apologize", "apologies", "my bad", "forgive me"]
-            ),
-            "greeting": (
-                # Indonesian
-                ["hai", "halo", "hi", "hey", "selamat pagi", "selamat siang", 
-                 "selamat sore", "selamat malam", "assalamualaikum", "salam"],
-                # English
-                ["hi", "hello", "hey", "good morning", "good afternoon", 
-                 "good evening", "good night", "greetings", "yo", "sup"]
-            ),
-            "compliment": (
-                # Indonesian
-                ["cantik", "ganteng", "keren", "hebat", "pintar", "bagus", 
-                 "luar biasa", "amazing", "perfect", "terbaik"],
-                # English
-                ["beautiful", "pretty", "handsome", "awesome", "amazing", "great",
-                 "wonderful", "perfect", "best", "brilliant", "smart"]
-            ),
-            "insult": (
-                # Indonesian
-                ["bodoh", "tolol", "goblok", "idiot", "bego", "dungu", "anjing", 
-                 "monyet", "kampret", "jelek", "buruk"],
-                # English
-                ["stupid", "idiot", "dumb", "moron", "fool", "ugly", "ugly"]
-            ),
-            "affection": (
-                # Indonesian
-                ["sayang", "cinta", "suka", "rindu", "kangen", "peluk", "cium",
-                 "love you", "i love", "aku sayang"],
-                # English
-                ["love you", "i love", "miss you", "hug", "kiss", "darling", 
-                 "sweetheart", "dear", "honey"]
-            ),
-            "romantic_interest": (
-                # Indonesian
-                ["pacar", "pacaran", "jadian", "menikah", "nikah", "istri", "suami",
-                 "marry me", "be my", "jadi pacarku"],
-                # English
-                ["marry me", "be my girlfriend", "be my boyfriend", "date me",
-                 "go out with me", "relationship", "couple"]
-            ),
-            "question": (
-                # Indonesian (question markers)
-                ["apa", "siapa", "kenapa", "bagaimana", "dimana", "kapan", "berapa",
-                 "apakah", "mengapa", "gimana", "gmn"],
-                # English
-                ["what", "who", "why", "how", "where", "when", "which", "whose"]
-            ),
-            "toxic_behavior": (
-                # Indonesian
-                ["mati", "bunuh", "ancam", "hancurkan", "hajar", "babat", 
-                 "gebuk", "pukul", "tendang"],
-                # English
-                ["kill", "die", "threat", "destroy", "hurt", "harm", "attack"]
-            ),
-            "rudeness": (
-                # Indonesian
-                ["babi", "tai", "shit", "fuck", "bangsat", "kontol", "memek",
-                 "jancok", "cok", "asu"],
-                # English
-                ["fuck", "shit", "damn", "hell", "ass", "bitch", "bastard"]
-            )
-        }
-        
-        # Check each intent pattern
-        for intent, (id_keywords, en_keywords) in intent_patterns.items():
-            keywords = id_keywords if lang == "id" else en_keywords
-            
-            # Check if any keyword appears in text
-            for keyword in keywords:
-                if keyword in text_lower:
-                    # Special handling for questions - check for question mark
-                    if intent == "question":
-                        if "?" in text_lower or text_lower.startswith(keyword):
-                            return intent
-                    else:
-                        return intent
-        
-        return "normal"
+        matcher = _INTENT_MATCHERS["id" if lang == "id" else "en"]
+        has_question_mark = "?" in text_lower
+        
+        best: Optional[str] = None
+        for intent, position in matcher.scan(text_lower):
+            # Question words only count with a question mark or as the opening word
+            if intent == "question" and not (has_question_mark or position == 0):
+                continue
+            if best is None or matcher.priority[intent] < matcher.priority[best]:
+                best = intent
+        
+        return best or "normal"
     
     def _map_sentiment_to_intent(self, sentiment: str, text_lower: str, lang: str) -> str:
         """Map sentiment label to intent category with context awareness.
@@ -379,21 +572,12 @@ class NLPEngine:
         # Sentiment mapping with contextual refinement
         if "positive" in sentiment:
             # Positive sentiment could be gratitude, compliment, or affection
-            if any(word in text_lower for word in ["terima", "thanks", "thank"]):
-                return "gratitude"
-            elif any(word in text_lower for word in ["bagus", "hebat", "keren", "great", "awesome"]):
-                return "compliment"
-            else:
-                return "affection"  # Default positive intent
+            return _POSITIVE_SENTIMENT_CUES.first_label(text_lower) or "affection"  # Default positive intent
                 
         elif "negative" in sentiment:
             # Negative sentiment could be insult, rudeness, or toxic
-            if any(word in text_lower for word in ["maaf", "sorry", "apologize"]):
-                return "apology"  # Negative but apologetic
-            elif any(word in text_lower for word in ["bodoh", "tolol", "stupid", "idiot"]):
-                return "insult"
-            else:
-                return "rudeness"  # Default negative intent
+            # Apology outranks insult: negative but apologetic
+            return _NEGATIVE_SENTIMENT_CUES.first_label(text_lower) or "rudeness"  # Default negative intent
                 
         else:
             # Neutral sentiment - could be question or normal conversation
@@ -457,7 +641,7 @@ class NLPEngine:
         elif intent == "romantic_interest":
             signals["romantic_interest"] = 0.8
             signal_reasons.append(f"romantic=0.8 (intent=romantic_interest)")
-        elif any(word in text_lower for word in ["jadi pacarnya", "pacaran", "istri", "suami", "marry"]):
+        elif _ROMANTIC_CUES.contains(text_lower):
             signals["romantic_interest"] = 0.9
             signal_reasons.append(f"romantic=0.9 (romantic keywords detected)")
         elif emotion == "love":
@@ -492,19 +676,12 @@ class NLPEngine:
         """
         text_lower = text.lower()
         
-        # Check for direct address patterns
-        alya_patterns = [
-            "alya", "kamu", "lu", "elu", "lo", "mu", "kau",
-            "you", "ur", "yourself", "yourself"
-        ]
-        
         # If message starts with or contains direct address, likely directed at Alya
-        for pattern in alya_patterns:
-            if text_lower.startswith(pattern) or f" {pattern} " in text_lower:
-                return True
+        if _ALYA_ADDRESS_RE.search(text_lower):
+            return True
         
         # If message is a question or response in conversation context, likely directed at Alya
-        if text_lower.endswith("?") or any(word in text_lower for word in ["apa", "siapa", "bagaimana"]):
+        if text_lower.endswith("?") or _ALYA_QUESTION_CUES.contains(text_lower):
             return True
         
         # Default to True if not clear (safer assumption)
@@ -603,7 +780,10 @@ class NLPEngine:
             "waifu": ["✨", "🌸", "😳", "💖"]
         }
         emojis = mood_emoji_map.get(mood, ["✨"])
-        return emojis[:count]
+        # Don't echo emoji the message already carries
+        used = {seq.replace("\ufe0f", "") for seq in find_emoji(message)}
+        fresh = [e for e in emojis if e not in used]
+        return (fresh or emojis)[:count]
 
     def get_emotion_description(self, emotion: str) -> str:
         """Get a human-readable description for an emotion label."""
@@ -192,7 +192,7 @@ class PersonaManager:
         self,
         username: str,
         query: str,
-        media_context: str,
+        media_context: Optional[str],
         lang: str = DEFAULT_LANGUAGE
     ) -> str:
         """Construct a prompt for media analysis.
@@ -200,7 +200,8 @@ class PersonaManager:
         Args:
             username: User's name
             query: User's query about the media
-            media_context: The context extracted from the media (e.g., text from image)
+            media_context: The context extracted from the media (e.g., text from image),
+                or None when the media itself is attached to the request
             lang: The user's preferred language
             
         Returns:
@@ -214,6 +215,8 @@ class PersonaManager:
         base_instructions = persona_lang.get("base_instructions", "")
         analysis_guidelines = "\n- ".join(persona_lang.get("analysis_guidelines", []))
         response_format = persona_lang.get("response_format", "")
+        if media_context is None:
+            media_context = "[The media is attached to this message.]"
 
         prompt = f"""
 {base_instructions}
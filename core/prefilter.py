@@ -0,0 +1,96 @@
+"""
+Cheap heuristic pre-classifier for short chat messages.
+
+Many group messages are a lone emoji, laughter ("wkwk", "haha") or a quick
+acknowledgement ("ok", "sip"). Running the transformer models on those is
+wasted work, so this stage labels them with a confidence score and lets
+NLPEngine skip inference when it is confident enough.
+"""
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from utils.emoji import find_emoji, strip_emoji
+
+MAX_FAST_PATH_WORDS = 3
+
+
+@dataclass
+class PrefilterResult:
+    emotion: str
+    intent: str
+    confidence: float
+    reason: str
+
+
+EMOJI_EMOTIONS = {
+    "joy": set("😀😃😄😁😆😅😂🤣😊☺😇🙂😉😍🥰😘😗😙😚😋😛😜🤪😝🤗🤭😺😸😹😻❤🧡💛💚💙💜🤍🖤💖💗💓💞💕💘💝✨🎉🥳👍👏🙌💯🔥🌸"),
+    "sadness": set("😢😭😞😔😟🙁☹😣😖😫😩🥺😿💔🥲"),
+    "anger": set("😠😡🤬👿💢😤🖕"),
+    "fear": set("😨😱😰😧😦🙀😬"),
+    "surprise": set("😮😯😲😳🤯😵🫢"),
+    "neutral": set("😐😑😶🙄😒🤔🫠😏🆗👌🙏"),
+}
+_EMOTION_BY_EMOJI = {ch: emotion for emotion, chars in EMOJI_EMOTIONS.items() for ch in chars}
+
+_LAUGHTER_RE = re.compile(
+    r"^(?:w+k+[wk]*|k+w+[wk]*|(?:ha|he|hi|xi|hu)h?(?:(?:ha|he|hi|xi|hu)h?)+|a?ha+|"
+    r"l+o+l+|lmf?ao+|rofl|awok(?:awok)*|ngakak|xd+)[\s!.?~]*$"
+)
+
+ACKNOWLEDGEMENTS = {
+    "ok", "oke", "okey", "okay", "okee", "okeh", "k", "kk", "sip", "siap",
+    "y", "ya", "yaa", "yap", "yep", "yup", "yes", "iya", "iyaa", "iy",
+    "noted", "hmm", "hm", "hmmm", "oh", "ohh", "oo", "ooh", "owh",
+    "gpp", "gapapa", "sure", "alright",
+}
+_TRAILING_PUNCT = " \t\n!.?~,"
+
+
+def classify_short_message(text: str) -> Optional[PrefilterResult]:
+    """Label trivially short messages without running any model.
+
+    Args:
+        text: Raw user message
+
+    Returns:
+        PrefilterResult with a confidence in [0, 1], or None when the message
+        needs the full model pipeline.
+    """
+    if not text:
+        return None
+
+    stripped = text.strip()
+    if not stripped or len(stripped.split()) > MAX_FAST_PATH_WORDS:
+        return None
+
+    # Emoji-only messages: each sequence votes with its base code point (❤️ -> ❤).
+    # Bare text-presentation symbols listed in EMOJI_EMOTIONS (❤, ☺, ☹) count too.
+    sequences = find_emoji(stripped)
+    leftover = [ch for ch in strip_emoji(stripped)[0] if not ch.isspace()]
+    if (sequences or leftover) and all(ch in _EMOTION_BY_EMOJI for ch in leftover):
+        votes = Counter(
+            _EMOTION_BY_EMOJI[base] for base in [seq[0] for seq in sequences] + leftover
+            if base in _EMOTION_BY_EMOJI
+        )
+        if not votes:
+            return PrefilterResult("neutral", "normal", 0.6, "emoji_unknown")
+        emotion, count = votes.most_common(1)[0]
+        confidence = 0.9 if count == sum(votes.values()) else 0.6 + 0.3 * count / sum(votes.values())
+        return PrefilterResult(emotion, "normal", round(confidence, 2), "emoji_only")
+
+    lowered = stripped.lower().strip(_TRAILING_PUNCT)
+    if not lowered:
+        return PrefilterResult("neutral", "normal", 0.9, "punctuation_only")
+
+    # Laughter is overwhelmingly amusement
+    words = lowered.split()
+    if all(_LAUGHTER_RE.match(word) for word in words):
+        return PrefilterResult("joy", "normal", 0.85, "laughter")
+
+    # Quick acknowledgements carry no emotional weight
+    if all(word.strip(_TRAILING_PUNCT) in ACKNOWLEDGEMENTS for word in words):
+        return PrefilterResult("neutral", "normal", 0.8, "acknowledgement")
+
+    return None
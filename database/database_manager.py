@@ -61,6 +61,21 @@ def get_user_lang(user_id: int) -> str:
     return DEFAULT_LANGUAGE
 
 
+def voice_language_of(user: Any) -> str:
+    """
+    Resolve the voice language from an already loaded user row.
+
+    Uses voice_language, then language_code, then DEFAULT_LANGUAGE, so
+    callers holding the row can skip another query.
+    """
+    if user is not None:
+        if getattr(user, "voice_language", None):
+            return user.voice_language
+        if getattr(user, "language_code", None):
+            return user.language_code
+    return DEFAULT_LANGUAGE
+
+
 # --- Utility: Centralized user creation (DRY) ---
 def create_default_user(session: Session, user_id: int, username: str = None, first_name: str = None, last_name: str = None) -> 'User':
     """Create a new user with default values and commit to session."""
@@ -175,15 +190,10 @@ class DatabaseManager:
         try:
             with db_session_context() as session:
                 user = session.query(User).filter(User.id == user_id).first()
-                if user:
-                    if user.voice_language:
-                        return user.voice_language
-                    if user.language_code:
-                        return user.language_code
+                return voice_language_of(user)
         except Exception as e:
             logger.error(f"Failed to get voice language for user {user_id}: {e}")
         
-        from config.settings import DEFAULT_LANGUAGE
         return DEFAULT_LANGUAGE
 
     def get_user_settings(self, user_id: int) -> Dict[str, Any]:
@@ -17,6 +17,11 @@ import psutil
 import platform
 import html
 
+from utils.analyze import analysis_cache
+from utils.image_prep import image_stats
+from utils.russian_translator import learned_translations
+from utils.voice_queue import stt_jobs, tts_jobs
+
 logger = logging.getLogger(__name__)
 
 
@@ -193,6 +198,28 @@ class AdminHandler:
             
             # Format datetime first, then escape all characters
             boot_time_str = datetime.fromtimestamp(boot_time).strftime("%Y-%m-%d %H:%M:%S")
+            stt_q = stt_jobs.stats()
+            tts_q = tts_jobs.stats()
+            stt_line = f"{stt_q['running']}/{stt_q['max_concurrency']} running, {stt_q['waiting']} waiting (peak {stt_q['peak_waiting']})"
+            tts_line = f"{tts_q['running']}/{tts_q['max_concurrency']} running, {tts_q['waiting']} waiting (peak {tts_q['peak_waiting']})"
+            img = image_stats.stats()
+            image_line = f"{img['prepared']} prepared, {round(100 * img['saved_ratio'])}% smaller, avg {img['avg_prep_ms']} ms"
+            for target, request in img["requests"].items():
+                image_line += f"; {target} {request['avg_kb']} KB, {request['avg_ms']} ms/request"
+            ask = analysis_cache.stats()
+            ask_line = (
+                f"{ask['contexts']['size']} contexts ({round(100 * ask['contexts']['hit_rate'])}% hit), "
+                f"{ask['answers']['size']} answers ({round(100 * ask['answers']['hit_rate'])}% hit)"
+            )
+            ru = learned_translations.stats()
+            ru_line = f"{ru['size']} learned words, {round(100 * ru['hit_rate'])}% hit ({ru['hits']}/{ru['hits'] + ru['misses']})"
+            nlp_engine = context.bot_data.get("nlp_engine")
+            fast = nlp_engine.get_fast_path_stats() if nlp_engine else {"fast_path_hits": 0, "model_calls_avoided": 0}
+            fast_line = f"{fast['fast_path_hits']} messages, {fast['model_calls_avoided']} model calls avoided"
+            cache_stats = nlp_engine.get_cache_stats() if nlp_engine else {}
+            nlp_cache_line = ", ".join(
+                f"{name} {entry['size']} ({round(100 * entry['hit_rate'])}% hit)" for name, entry in cache_stats.items()
+            ) or "n/a"
             
             # Build message
             raw_msg = (
@@ -207,6 +234,13 @@ class AdminHandler:
                 f"Disk: {round(disk.used / (1024 ** 3), 2)}GB/"
                 f"{round(disk.total / (1024 ** 3), 2)}GB ({disk.percent}%)\n"
                 f"Uptime: {boot_time_str}\n"
+                f"STT Queue: {stt_line}\n"
+                f"TTS Queue: {tts_line}\n"
+                f"Images: {image_line}\n"
+                f"Ask Cache: {ask_line}\n"
+                f"RU Dict: {ru_line}\n"
+                f"NLP Fast Path: {fast_line}\n"
+                f"NLP Cache: {nlp_cache_line}\n"
                 f"\nAlya siap 24 jam buat admin-sama!"
             )
             
@@ -225,6 +259,13 @@ class AdminHandler:
                 f"{self._escape_markdown(f'{round(disk.total / (1024 ** 3), 2)}GB')} "
                 f"{self._escape_markdown(f'({disk.percent}%)')}\n"
                 f"{self._escape_markdown('Uptime:')} {self._escape_markdown(boot_time_str)}\n"
+                f"{self._escape_markdown('STT Queue:')} {self._escape_markdown(stt_line)}\n"
+                f"{self._escape_markdown('TTS Queue:')} {self._escape_markdown(tts_line)}\n"
+                f"{self._escape_markdown('Images:')} {self._escape_markdown(image_line)}\n"
+                f"{self._escape_markdown('Ask Cache:')} {self._escape_markdown(ask_line)}\n"
+                f"{self._escape_markdown('RU Dict:')} {self._escape_markdown(ru_line)}\n"
+                f"{self._escape_markdown('NLP Fast Path:')} {self._escape_markdown(fast_line)}\n"
+                f"{self._escape_markdown('NLP Cache:')} {self._escape_markdown(nlp_cache_line)}\n"
                 f"\n_{self._escape_markdown('Alya siap 24 jam buat admin-sama!')}_"
             )
             
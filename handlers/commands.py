@@ -1,14 +1,14 @@
 import logging
-import os
-import tempfile
 import time
 
 from telegram import Update, BotCommand, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.constants import ChatAction
 from telegram.ext import ContextTypes, MessageHandler, filters, CommandHandler, CallbackQueryHandler
 
-from config.settings import SAUCENAO_PREFIX, COMMAND_PREFIX, DEFAULT_LANGUAGE
+from config.settings import SAUCENAO_PREFIX, COMMAND_PREFIX, DEFAULT_LANGUAGE, SAUCENAO_IMAGE_MAX_EDGE
 from database.database_manager import db_manager, get_user_lang
+from utils.image_prep import pick_photo_size
+from utils.media_io import fetch_media
 from utils.saucenao import SauceNAOSearcher, SauceNAOError
 from utils.search_engine import search_web
 from utils.analyze import MediaAnalyzer
@@ -112,26 +112,30 @@ class CommandsHandler:
         sauce_texts = get_sauce_texts(lang)
 
         photo_to_process = None
+        # Smallest Telegram size that still covers what SauceNAO needs
         if message.reply_to_message and message.reply_to_message.photo:
-            photo_to_process = message.reply_to_message.photo[-1]
+            photo_to_process = pick_photo_size(message.reply_to_message.photo, SAUCENAO_IMAGE_MAX_EDGE)
         elif message.photo:
-            photo_to_process = message.photo[-1]
+            photo_to_process = pick_photo_size(message.photo, SAUCENAO_IMAGE_MAX_EDGE)
 
         if not photo_to_process:
             await message.reply_html(sauce_texts["usage"])
             return
 
         status_message = await message.reply_text(sauce_texts["searching"])
-        temp_path = None
         try:
             logger.info(f"Processing sauce request from user {user.id}")
-            photo_file = await photo_to_process.get_file()
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
-                await photo_file.download_to_drive(temp_file.name)
-                temp_path = temp_file.name
-            
-            logger.info(f"Image downloaded to {temp_path}, sending to SauceNAO")
-            search_results = await self.saucenao_searcher.search(temp_path)
+            # An exact repeat of a searched photo is answered without downloading it
+            search_results = self.saucenao_searcher.cache.get_by_file_id(photo_to_process.file_unique_id)
+            if search_results is not None:
+                logger.info("SauceNAO cache hit for repeated Telegram file, skipping download")
+            else:
+                photo_file = await photo_to_process.get_file()
+                async with fetch_media(photo_file, suffix='.jpg') as image:
+                    logger.info("Image downloaded, sending to SauceNAO")
+                    search_results = await self.saucenao_searcher.search(
+                        image.source, file_unique_id=photo_to_process.file_unique_id
+                    )
             logger.info(f"SauceNAO returned {len(search_results.get('results', []))} processed results")
             
             response_text, keyboard = format_sauce_results(search_results, lang)
@@ -150,9 +154,6 @@ class CommandsHandler:
         except Exception as e:
             logger.error(f"General error in sauce command for user {user.id}: {e}", exc_info=True)
             await status_message.edit_text(sauce_texts["error_unknown"])
-        finally:
-            if temp_path and os.path.exists(temp_path):
-                os.unlink(temp_path)
 
     async def handle_analyze_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Unified handler for !ask commands. Routes based on actual user reply intent."""
@@ -6,9 +6,6 @@ import random
 from typing import Dict, List, Optional, Any
 import asyncio
 import re
-import os
-import tempfile
-import unicodedata
 import langdetect
 
 from telegram import Update
@@ -32,7 +29,8 @@ from database.database_manager import DatabaseManager, db_manager, get_user_lang
 from core.nlp import NLPEngine, ContextManager
 from utils.formatters import format_response, format_error_response, format_paragraphs, format_persona_response, get_translate_prompt
 from utils.telegram_helpers import ChatActionSender
-from utils.russian_translator import detect_russian_expressions, RUSSIAN_TRANSLATIONS
+from utils.voice_queue import stt_jobs
+from utils.russian_translator import detect_russian_expressions, learned_translations, RUSSIAN_TRANSLATIONS
 
 
 logger = logging.getLogger(__name__)
@@ -140,6 +138,7 @@ class ConversationHandler:
                         replied_msg=replied,
                         context=context,
                         chat_id=update.effective_chat.id,
+                        user_id=user.id,
                         lang=lang
                     )
                 else:
@@ -432,103 +431,6 @@ Respond naturally, empathetically, and reference prior conversation when relevan
                 logger.error(f"Translation step failed: {e}")
         return text
 
-    def _split_mixed_quote_paragraphs(self, response: str) -> str:
-        """
-        Aggressively split paragraphs that mix narration and quoted dialogue.
-        Handles dialogue tags, multiple quotes, emoji, and complex nested structures.
-        
-        Args:
-            response: Raw response text from Gemini
-            
-        Returns:
-            Response with quotes separated into their own paragraphs
-        """
-        if not response:
-            return response
-        
-        def extract_emoji(text: str) -> tuple[str, str]:
-            """Extract emoji from text using Unicode character categories."""
-            
-            emoji_chars = []
-            clean_chars = []
-            
-            for char in text:
-                cat = unicodedata.category(char)
-                if (cat in ('So', 'Sk') or 
-                    char in ('\uFE0F', '\u200D') or
-                    ord(char) >= 0x1F000):
-                    emoji_chars.append(char)
-                else:
-                    clean_chars.append(char)
-            
-            return ''.join(clean_chars).strip(), ''.join(emoji_chars).strip()
-        
-        paragraphs = response.split('\n\n')
-        cleaned_paragraphs = []
-        
-        for para in paragraphs:
-            para = para.strip()
-            if not para:
-                continue
-            
-            if '"' not in para:
-                cleaned_paragraphs.append(para)
-                continue
-            
-            if para.startswith('"') and para.endswith('"') and para.count('"') == 2:
-                cleaned_paragraphs.append(para)
-                continue
-            
-            parts = []
-            current_pos = 0
-            in_quote = False
-            quote_start = -1
-            
-            i = 0
-            while i < len(para):
-                if para[i] == '"':
-                    if not in_quote:
-                        if current_pos < i:
-                            narration = para[current_pos:i].strip().rstrip(',').strip()
-                            if narration:
-                                parts.append(('narration', narration))
-                        quote_start = i
-                        in_quote = True
-                    else:
-                        quote_text = para[quote_start+1:i].strip()
-                        if quote_text:
-                            parts.append(('quote', quote_text))
-                        current_pos = i + 1
-                        in_quote = False
-                i += 1
-            
-            if current_pos < len(para):
-                remaining = para[current_pos:].strip()
-                if remaining:
-                    remaining_no_emoji, emoji_str = extract_emoji(remaining)
-                    remaining_no_emoji = remaining_no_emoji.rstrip(',').strip()
-                    
-                    if remaining_no_emoji:
-                        parts.append(('narration', remaining_no_emoji))
-                    
-                    if emoji_str:
-                        if parts and parts[-1][0] == 'quote':
-                            last_quote = parts[-1][1]
-                            parts[-1] = ('quote', f"{last_quote} {emoji_str}")
-                        elif parts and parts[-1][0] == 'narration':
-                            last_narration = parts[-1][1]
-                            parts[-1] = ('narration', f"{last_narration} {emoji_str}")
-                        else:
-                            parts.append(('narration', emoji_str))
-            
-            for part_type, text in parts:
-                if part_type == 'quote':
-                    cleaned_paragraphs.append(f'"{text}"')
-                else:
-                    cleaned_paragraphs.append(text)
-        
-        return '\n\n'.join(cleaned_paragraphs)
-
     async def _process_and_send_response(
         self,
         update: Update,
@@ -545,42 +447,46 @@ Respond naturally, empathetically, and reference prior conversation when relevan
             self.db.save_message(user.id, "assistant", response)
             self.memory.save_bot_response(user.id, response)
             
-            # Step 1: Split mixed quote-narration paragraphs
-            response = self._split_mixed_quote_paragraphs(response)
-            
-            # Step 2: Clean and append Russian translation
+            # Step 1: Clean and append Russian translation
             response = self._clean_and_append_russian_translation(response, lang)
             
-            # Step 3: Format for Telegram
-            formatted_response = format_persona_response(response, use_html=True)
+            # Step 2: Format for Telegram (splits mixed quote-narration paragraphs)
+            formatted_response = format_persona_response(response, use_html=True, split_quotes=True)
             formatted_response = f"{formatted_response}\u200C"
 
-            if loading_msg:
-                try:
-                    await loading_msg.edit_text(formatted_response, parse_mode="HTML")
-                except Exception as e:
-                    logger.error(f"Failed to edit message: {e}")
+            async def show_text_response():
+                if loading_msg:
+                    try:
+                        await loading_msg.edit_text(formatted_response, parse_mode="HTML")
+                    except Exception as e:
+                        logger.error(f"Failed to edit message: {e}")
+                        await update.message.reply_html(formatted_response)
+                else:
                     await update.message.reply_html(formatted_response)
-            else:
-                await update.message.reply_html(formatted_response)
                 
             if requires_tts:
                 from utils.voice_helpers import send_voice_reply
                 
                 voice_processor = context.application.bot_data.get("voice_processor")
-                await send_voice_reply(
-                    update=update,
-                    context=context,
-                    text=response,
-                    voice_processor=voice_processor,
-                    db_manager=self.db,
-                    source_lang=lang
+                # The text edit overlaps voice translation and the recording message
+                await asyncio.gather(
+                    show_text_response(),
+                    send_voice_reply(
+                        update=update,
+                        context=context,
+                        text=response,
+                        voice_processor=voice_processor,
+                        db_manager=self.db,
+                        source_lang=lang
+                    )
                 )
+            else:
+                await show_text_response()
         except Exception as e:
             logger.error(f"Error processing response: {e}", exc_info=True)
             await self._send_error_response(update, user.first_name, lang, loading_msg=loading_msg)
             
-    async def _extract_replied_voice_context(self, replied_msg: Any, context: ContextTypes.DEFAULT_TYPE, chat_id: int, lang: str) -> str:
+    async def _extract_replied_voice_context(self, replied_msg: Any, context: ContextTypes.DEFAULT_TYPE, chat_id: int, user_id: int, lang: str) -> str:
         """Helper to download and transcribe a replied-to voice note for conversation context."""
         voice_processor = context.application.bot_data.get("voice_processor")
         if not voice_processor:
@@ -589,13 +495,12 @@ Respond naturally, empathetically, and reference prior conversation when relevan
         try:
             await context.bot.send_chat_action(chat_id=chat_id, action=ChatAction.TYPING)
             file = await context.bot.get_file(replied_msg.voice.file_id)
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                ogg_path = os.path.join(tmp_dir, f"reply_voice_{replied_msg.voice.file_id}.ogg")
-                await file.download_to_drive(ogg_path)
-                transcription_data = await voice_processor.transcribe_audio(ogg_path, lang=lang)
-                if transcription_data:
-                    return f"{replied_msg.from_user.first_name} said (Voice Note): {transcription_data[0]}"
-                return f"{replied_msg.from_user.first_name} sent an unrecognizable voice note."
+            transcription_data = await stt_jobs.run(
+                user_id, lambda: voice_processor.transcribe_telegram_file(file, lang=lang)
+            )
+            if transcription_data:
+                return f"{replied_msg.from_user.first_name} said (Voice Note): {transcription_data[0]}"
+            return f"{replied_msg.from_user.first_name} sent an unrecognizable voice note."
         except Exception as e:
             logger.error(f"Failed to transcribe replied voice note: {e}")
             return f"{replied_msg.from_user.first_name} sent a voice note."
@@ -613,6 +518,13 @@ Respond naturally, empathetically, and reference prior conversation when relevan
             word_clean = word.strip().lower()
             translations_dict[word_clean] = translation.strip()
         
+        # Remember model-provided meanings for words the static dict lacks
+        learned_translations.add_many(
+            {word: translation for word, translation in translations_dict.items()
+             if word not in RUSSIAN_TRANSLATIONS},
+            source="marker"
+        )
+        
         clean_response = re.sub(
             ru_marker_pattern,
             lambda m: m.group(1).strip(),
@@ -620,11 +532,18 @@ Respond naturally, empathetically, and reference prior conversation when relevan
             flags=re.IGNORECASE
         )
         
-        detected_russian = detect_russian_expressions(clean_response)
+        # Unknown Cyrillic words too: the learned dictionary may know them
+        detected_russian = detect_russian_expressions(clean_response, include_unknown=True)
         for word in detected_russian:
             word_lower = word.lower()
-            if word_lower not in translations_dict and word_lower in RUSSIAN_TRANSLATIONS:
+            if word_lower in translations_dict:
+                continue
+            if word_lower in RUSSIAN_TRANSLATIONS:
                 translations_dict[word_lower] = RUSSIAN_TRANSLATIONS[word_lower]
+            else:
+                learned = learned_translations.get(word_lower)
+                if learned:
+                    translations_dict[word_lower] = learned
         
         clean_response = re.sub(
             r'(?i)(💬\s*)?(?:Terjemahan|Translation)\s+Russian.*',
@@ -4,8 +4,6 @@ Handles voice message input and generates voice responses using the Alya voice m
 """
 import asyncio
 import logging
-import os
-import tempfile
 from typing import Optional
 from pathlib import Path
 
@@ -18,10 +16,11 @@ from core.persona import PersonaManager
 from core.memory import MemoryManager
 from core.mood_manager import MoodManager
 from core.nlp import NLPEngine, ContextManager
-from database.database_manager import DatabaseManager, db_manager, get_user_lang
+from database.database_manager import DatabaseManager, db_manager, get_user_lang, voice_language_of
 from utils.voice_processor import VoiceProcessor
 from utils.voice_helpers import send_voice_reply
-from utils.telegram_helpers import ChatActionSender, start_loading_animation
+from utils.telegram_helpers import ChatActionSender, QueuePositionNotice, start_loading_animation
+from utils.voice_queue import QueueFullError, stt_jobs
 from utils.formatters import format_persona_response
 from config.settings import VOICE_ENABLED, DEFAULT_LANGUAGE, ADMIN_IDS, AFFECTION_POINTS, COMMAND_PREFIX
 
@@ -124,22 +123,43 @@ class VoiceHandler:
             async with ChatActionSender(context, chat.id, ChatAction.TYPING):
                 # 1. Download and Transcribe
                 voice = update.message.voice
+                user_lang = db_user_dict.get('language_code', DEFAULT_LANGUAGE)
+                # The listening message carries the queue position while the
+                # transcription waits and becomes the transcript afterwards
+                listening_text = (
+                    "<blockquote><b>🎧 Alya is listening...</b></blockquote>" if user_lang == 'en'
+                    else "<blockquote><b>🎧 Alya lagi dengerin...</b></blockquote>"
+                )
+                listening_msg_task = asyncio.create_task(update.message.reply_html(listening_text))
                 file = await context.bot.get_file(voice.file_id)
+                listening_msg = await listening_msg_task
                 
-                with tempfile.TemporaryDirectory() as tmp_dir:
-                    ogg_path = os.path.join(tmp_dir, f"voice_{voice.file_id}.ogg")
-                    await file.download_to_drive(ogg_path)
-                    
-                    transcription_data = await self.voice_processor.transcribe_audio(ogg_path, lang=db_user_dict.get('language_code', DEFAULT_LANGUAGE))
-                    if not transcription_data:
-                        await update.message.reply_html("❌ Gagal mengenali suara kamu...")
-                        return
-                    
-                    user_text, detected_lang = transcription_data
-                    logger.info(f"🎙️ Voice transcribed (lang={detected_lang}): {user_text}")
+                queue_notice = QueuePositionNotice(
+                    listening_msg,
+                    "⏳ Voice note queued, position {position}" if user_lang == 'en'
+                    else "⏳ Voice note kamu lagi ngantri, posisi {position}",
+                    restore_text=listening_text
+                )
+                async def transcribe():
+                    await queue_notice.clear()
+                    return await self.voice_processor.transcribe_telegram_file(file, lang=user_lang)
+
+                try:
+                    transcription_data = await stt_jobs.run(user.id, transcribe, on_position=queue_notice.update)
+                except QueueFullError:
+                    await listening_msg.edit_text("⏳ Alya lagi kebanjiran voice note, coba kirim lagi sebentar ya...", parse_mode="HTML")
+                    return
+                finally:
+                    await queue_notice.clear()
+                if not transcription_data:
+                    await listening_msg.edit_text("❌ Gagal mengenali suara kamu...", parse_mode="HTML")
+                    return
+                
+                user_text, detected_lang = transcription_data
+                logger.info(f"🎙️ Voice transcribed (lang={detected_lang}): {user_text}")
                 
                 lang_flag = {"en": "🇺🇸", "id": "🇮🇩", "jp": "🎌"}.get(detected_lang, "🌐")
-                await update.message.reply_html(f"🎤 <i>({lang_flag} {detected_lang.upper()}): {user_text}</i>")
+                await listening_msg.edit_text(f"🎤 <i>({lang_flag} {detected_lang.upper()}): {user_text}</i>", parse_mode="HTML")
 
                 phrase = "Alya is thinking" if db_user_dict.get('language_code', DEFAULT_LANGUAGE) == 'en' else "Alya lagi mikir"
                 loading_msg = await update.message.reply_text(f"<blockquote><b>💭 {phrase}...</b></blockquote>", parse_mode="HTML")
@@ -204,22 +224,31 @@ class VoiceHandler:
                     return
 
             ui_text = format_persona_response(response, use_html=True) + "\u200C"
-            try:
-                await loading_msg.edit_text(ui_text, parse_mode="HTML")
-            except Exception:
-                await update.message.reply_html(ui_text)
+
+            async def show_text_response():
+                try:
+                    await loading_msg.edit_text(ui_text, parse_mode="HTML")
+                except Exception:
+                    await update.message.reply_html(ui_text)
 
             # Only send voice reply if it's a private chat or Alya was explicitly addressed in a group
             if not is_group_chat or is_reply_to_alya or has_trigger:
                 source_lang = db_user_dict.get('language_code', DEFAULT_LANGUAGE)
-                await send_voice_reply(
-                    update=update,
-                    context=context,
-                    text=response,
-                    voice_processor=self.voice_processor,
-                    db_manager=self.db_manager,
-                    source_lang=source_lang
+                # The text edit overlaps voice translation and the recording message
+                await asyncio.gather(
+                    show_text_response(),
+                    send_voice_reply(
+                        update=update,
+                        context=context,
+                        text=response,
+                        voice_processor=self.voice_processor,
+                        db_manager=self.db_manager,
+                        source_lang=source_lang,
+                        voice_lang=voice_language_of(db_user)
+                    )
                 )
+            else:
+                await show_text_response()
 
             # 5. Metadata Update
             if self.memory_manager:
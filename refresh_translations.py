@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Offline batch refresh of the learned Russian translation dictionary.
+
+Re-translates learned entries with Gemini in batches (one request per batch
+instead of one per chat response) and writes the results back to
+RUSSIAN_LEARNED_TRANSLATIONS_PATH. Run it while the bot is stopped, since
+the bot keeps its own in-memory copy of the dictionary.
+
+Usage:
+    python refresh_translations.py [--older-than DAYS] [--batch-size N] [--dry-run]
+    python refresh_translations.py --stats
+"""
+import argparse
+import sys
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+try:
+    import google.generativeai as genai
+    from config.settings import GEMINI_API_KEYS, GEMINI_MODEL
+    from utils.russian_translator import (
+        build_gemini_translation_prompt,
+        learned_translations,
+        parse_translation_response,
+    )
+except ImportError as e:
+    print(f"❌ Import error: {e}")
+    print("Please ensure all dependencies are installed: pip install -r requirements.txt")
+    sys.exit(1)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def select_words(older_than_days: int) -> list:
+    """Return learned words last updated more than ``older_than_days`` ago."""
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    words = []
+    for word, entry in learned_translations.entries().items():
+        try:
+            updated_at = datetime.fromisoformat(entry.get("updated_at", ""))
+        except ValueError:
+            updated_at = datetime.min
+        if updated_at <= cutoff:
+            words.append(word)
+    return sorted(words)
+
+
+def refresh(words: list, batch_size: int, dry_run: bool) -> int:
+    """Translate ``words`` in batches and store the answers. Returns changed count."""
+    if not GEMINI_API_KEYS:
+        logger.error("No Gemini API keys configured")
+        return 0
+    genai.configure(api_key=GEMINI_API_KEYS[0])
+    model = genai.GenerativeModel(model_name=GEMINI_MODEL)
+
+    changed = 0
+    for start in range(0, len(words), batch_size):
+        batch = words[start:start + batch_size]
+        try:
+            response = model.generate_content(build_gemini_translation_prompt(batch))
+            translations = parse_translation_response(response.text or "")
+        except Exception as e:
+            logger.error(f"Batch {start // batch_size + 1} failed: {e}")
+            continue
+
+        translations = {word: meaning for word, meaning in translations.items() if word in batch}
+        logger.info(f"Batch {start // batch_size + 1}: {len(translations)}/{len(batch)} translated")
+        if dry_run:
+            for word, meaning in sorted(translations.items()):
+                print(f"  {word} = {meaning}")
+            continue
+        changed += learned_translations.add_many(translations, source="refresh")
+    return changed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Refresh learned Russian translations")
+    parser.add_argument("--older-than", type=int, default=0, help="Only refresh entries older than N days")
+    parser.add_argument("--batch-size", type=int, default=30)
+    parser.add_argument("--dry-run", action="store_true", help="Print translations without saving")
+    parser.add_argument("--stats", action="store_true", help="Show dictionary stats and exit")
+    args = parser.parse_args()
+
+    if args.stats:
+        entries = learned_translations.entries()
+        sources = Counter(entry.get("source", "unknown") for entry in entries.values())
+        print(f"📚 {len(entries)} learned translations in {learned_translations.path}")
+        for source, count in sorted(sources.items()):
+            print(f"  {source}: {count}")
+        return 0
+
+    words = select_words(args.older_than)
+    if not words:
+        logger.info("Nothing to refresh")
+        return 0
+
+    logger.info(f"Refreshing {len(words)} learned translations in batches of {args.batch_size}")
+    changed = refresh(words, args.batch_size, args.dry_run)
+    logger.info(f"✅ Done, {changed} entries updated")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
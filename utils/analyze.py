@@ -1,8 +1,10 @@
 import io
 import logging
 import asyncio
+import time
+import unicodedata
 from pathlib import Path
-from typing import Dict, Any, Optional, Union, BinaryIO
+from typing import Dict, Any, Optional, Tuple, Union, BinaryIO
 
 from PIL import Image, UnidentifiedImageError
 from telegram import Update
@@ -10,13 +12,76 @@ from telegram.constants import ChatAction
 from telegram.ext import ContextTypes
 
 from core.persona import PersonaManager
-from core.gemini_client import GeminiClient
+from core.gemini_client import GeminiClient, is_fallback_response
+from config.settings import (
+    ANALYZE_ANSWER_CACHE_SIZE,
+    ANALYZE_ANSWER_CACHE_TTL,
+    ANALYZE_CONTEXT_CACHE_SIZE,
+    ANALYZE_CONTEXT_CACHE_TTL,
+    ANALYZE_IMAGE_MAX_EDGE,
+    ANALYZE_SINGLE_CALL,
+)
 from database.database_manager import db_manager, get_user_lang
 from handlers.response.system import get_system_error_response
+from utils.cache import TTLCache
+from utils.doc_extract import get_document_reader
+from utils.image_prep import image_stats, pick_photo_size, prepare_image_async
 
 logger = logging.getLogger(__name__)
 
 
+class AnalysisCache:
+    """
+    Cache of !ask work per Telegram file, for follow-up questions.
+
+    The extracted context of a file (prepared image, image description or
+    document text) is kept per ``file_unique_id``, so a new question about
+    the same file skips the download and extraction and only pays for the
+    answer. Final answers are kept per (file_unique_id, normalised query,
+    lang), so a repeated question costs nothing.
+    """
+
+    def __init__(self, context_size: int, context_ttl: float, answer_size: int, answer_ttl: float) -> None:
+        self._contexts = TTLCache(maxsize=context_size, ttl=context_ttl)
+        self._answers = TTLCache(maxsize=answer_size, ttl=answer_ttl)
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Fold case, width and spacing, and drop trailing punctuation."""
+        folded = unicodedata.normalize("NFKC", query or "").casefold()
+        return " ".join(folded.split()).strip(" .,!?;:")
+
+    def get_context(self, kind: str, file_unique_id: Optional[str], lang: Optional[str] = None) -> Any:
+        if not file_unique_id:
+            return None
+        return self._contexts.get((kind, file_unique_id, lang))
+
+    def set_context(self, kind: str, file_unique_id: Optional[str], value: Any, lang: Optional[str] = None) -> None:
+        if file_unique_id:
+            self._contexts.set((kind, file_unique_id, lang), value)
+
+    def _answer_key(self, file_unique_id: str, query: str, lang: str) -> Tuple[str, str, str]:
+        return (file_unique_id, self.normalize_query(query), lang)
+
+    def get_answer(self, file_unique_id: Optional[str], query: str, lang: str) -> Optional[str]:
+        if not file_unique_id:
+            return None
+        return self._answers.get(self._answer_key(file_unique_id, query, lang))
+
+    def set_answer(self, file_unique_id: Optional[str], query: str, lang: str, answer: str) -> None:
+        if file_unique_id and answer and not is_fallback_response(answer):
+            self._answers.set(self._answer_key(file_unique_id, query, lang), answer)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters for monitoring."""
+        return {"contexts": self._contexts.stats(), "answers": self._answers.stats()}
+
+
+analysis_cache = AnalysisCache(
+    ANALYZE_CONTEXT_CACHE_SIZE, ANALYZE_CONTEXT_CACHE_TTL, ANALYZE_ANSWER_CACHE_SIZE, ANALYZE_ANSWER_CACHE_TTL
+)
+
+
 class MediaAnalyzer:
     """Handles media analysis operations using Gemini API."""
 
@@ -31,6 +96,8 @@ class MediaAnalyzer:
         media_type: str,
         query: str,
         user_id: int,
+        file_unique_id: Optional[str] = None,
+        media_source: Any = None,
     ) -> str:
         """
         Analyzes media content using Gemini and returns a formatted response.
@@ -40,64 +107,99 @@ class MediaAnalyzer:
             media_type: The type of media ('image', 'document', 'text').
             query: The user's query about the media.
             user_id: The ID of the user requesting the analysis.
+            file_unique_id: Telegram file_unique_id of the photo or document; keys the
+                analysis cache.
+            media_source: Telegram PhotoSize or Document to download when media_content
+                is None and nothing usable is cached for file_unique_id.
 
         Returns:
             A string containing the analysis result.
         """
         lang = get_user_lang(user_id)
-        
+
+        cached_answer = analysis_cache.get_answer(file_unique_id, query, lang)
+        if cached_answer is not None:
+            logger.info(f"Analysis answer cache hit for {file_unique_id}, user {user_id}")
+            return cached_answer
+
         try:
-            # For images, we need to get the content description first
             if media_type in ("image", "photo"):
-                image = self._to_pil_image(media_content)
-                # Prepare image description message based on language
-                describe_message = "Describe this image in detail." if lang == 'en' else "Deskripsikan gambar ini secara detail."
-                media_context = await self.gemini_client.generate_response(
-                    user_id=user_id,
-                    username="User", # Username is not critical for this part
-                    message=describe_message,
-                    context="",
-                    relationship_level=0,
-                    is_admin=False,
-                    lang=lang,
-                    is_media_analysis=True,
-                    media_context=image # Pass the image object directly if supported
-                )
-                logger.debug(f"Image analysis completed for user {user_id}, context length: {len(media_context)}")
-                
+                media_context = None if ANALYZE_SINGLE_CALL else analysis_cache.get_context("description", file_unique_id, lang)
+                if media_context is None:
+                    prepared = analysis_cache.get_context("image", file_unique_id)
+                    if prepared is None:
+                        media_content = await self._download(media_content, media_source)
+                        # Downscaled, EXIF-free re-encode (ValueError if not an image)
+                        prepared = await prepare_image_async(media_content, ANALYZE_IMAGE_MAX_EDGE)
+                        analysis_cache.set_context("image", file_unique_id, prepared)
+                    # One multimodal request: the image and the query together
+                    if ANALYZE_SINGLE_CALL:
+                        request_start = time.perf_counter()
+                        analysis_result = await self.gemini_client.generate_media_response(
+                            user_id=user_id,
+                            username="User",
+                            query=query,
+                            media=[prepared.as_gemini_part()],
+                            lang=lang
+                        )
+                        image_stats.record_request("gemini", len(prepared.data), time.perf_counter() - request_start)
+                        if analysis_result:
+                            analysis_cache.set_answer(file_unique_id, query, lang, analysis_result)
+                            return analysis_result
+                        logger.warning(f"Single-call image analysis failed for user {user_id}, describing the image first")
+
+                    # Fallback: get the content description first, then answer over it
+                    # Prepare image description message based on language
+                    image = self._to_pil_image(prepared.data)
+                    describe_message = "Describe this image in detail." if lang == 'en' else "Deskripsikan gambar ini secara detail."
+                    media_context = await self.gemini_client.generate_response(
+                        user_id=user_id,
+                        username="User", # Username is not critical for this part
+                        message=describe_message,
+                        context="",
+                        relationship_level=0,
+                        is_admin=False,
+                        lang=lang,
+                        is_media_analysis=True,
+                        media_context=image # Pass the image object directly if supported
+                    )
+                    if not ANALYZE_SINGLE_CALL and not is_fallback_response(media_context):
+                        analysis_cache.set_context("description", file_unique_id, media_context, lang)
+                    logger.debug(f"Image analysis completed for user {user_id}, context length: {len(media_context)}")
+
             elif media_type == "document":
-                # Try to extract text from document
-                extracted_text = self._to_text(media_content, media_type)
-                
-                # If extraction was successful (not a placeholder message)
-                if extracted_text and not extracted_text.startswith("Document"):
-                    media_context = extracted_text
-                    logger.info(f"Successfully extracted {len(extracted_text)} chars from document for user {user_id}")
-                else:
-                    # For binary documents (PDF, DOCX), try to get OCR/description from Gemini
-                    # Note: This requires Gemini File API or converting doc to image
-                    logger.info(f"Binary document detected for user {user_id}, attempting image-based analysis")
-                    try:
-                        # Try to treat document as image (some formats like PDF first page)
-                        image = self._to_pil_image(media_content)
-                        describe_message = "Extract and describe the content of this document." if lang == 'en' else "Ekstrak dan deskripsikan isi dokumen ini."
-                        media_context = await self.gemini_client.generate_response(
+                media_context = analysis_cache.get_context("document", file_unique_id, lang)
+                if media_context is None:
+                    media_content = await self._download(media_content, media_source)
+                    reader = get_document_reader(self.gemini_client)
+                    document, media_context = await reader.context_for(media_content, lang, file_unique_id)
+                    if document.empty and bytes(media_content[:4]) == b"%PDF":
+                        # Scanned PDF without a text layer: let Gemini read the pages itself
+                        logger.info(f"PDF without text layer for user {user_id}, sending the file to Gemini")
+                        analysis_result = await self.gemini_client.generate_media_response(
                             user_id=user_id,
                             username="User",
-                            message=describe_message,
-                            context="",
-                            relationship_level=0,
-                            is_admin=False,
-                            lang=lang,
-                            is_media_analysis=True,
-                            media_context=image
+                            query=query,
+                            media=[{"mime_type": "application/pdf", "data": bytes(media_content)}],
+                            lang=lang
+                        )
+                        if analysis_result:
+                            analysis_cache.set_answer(file_unique_id, query, lang, analysis_result)
+                            return analysis_result
+                    if document.empty:
+                        media_context = (
+                            "[No readable text could be extracted from this document.]" if lang == 'en'
+                            else "[Tidak ada teks yang bisa dibaca dari dokumen ini.]"
                         )
-                        logger.debug(f"Document image analysis completed for user {user_id}")
-                    except Exception as img_error:
-                        # If image conversion fails, use extracted text even if it's a placeholder
-                        logger.warning(f"Could not process document as image for user {user_id}: {img_error}")
-                        media_context = extracted_text
-                        
+                    else:
+                        if document.truncated or media_context is not document.text:
+                            media_context += (
+                                "\n\n[Only part of the document is shown above, or a summary of it.]" if lang == 'en'
+                                else "\n\n[Di atas hanya sebagian isi dokumen, atau ringkasannya.]"
+                            )
+                        analysis_cache.set_context("document", file_unique_id, media_context, lang)
+                    logger.info(f"Document context for user {user_id}: {document.kind}, {len(media_context)} chars")
+
             elif media_type == "text":
                 media_context = str(media_content)
                 logger.debug(f"Text analysis for user {user_id}, length: {len(media_context)}")
@@ -120,12 +222,24 @@ class MediaAnalyzer:
             if not analysis_result:
                 raise ValueError("API returned an empty response.")
 
+            if media_type != "text":
+                analysis_cache.set_answer(file_unique_id, query, lang, analysis_result)
             return analysis_result
 
         except Exception as e:
             logger.error(f"Error analyzing {media_type} for user {user_id}: {e}", exc_info=True)
             return get_system_error_response(lang)
 
+    @staticmethod
+    async def _download(media_content: Optional[bytes], media_source: Any) -> bytes:
+        """Return the media bytes, fetching them from Telegram if not yet downloaded."""
+        if media_content is not None:
+            return media_content
+        if media_source is None:
+            raise ValueError("No media content or Telegram file to download")
+        media_content_file = await media_source.get_file()
+        return bytes(await media_content_file.download_as_bytearray())
+
     def _to_pil_image(self, media_content: Union[bytes, BinaryIO, bytearray]) -> Image.Image:
         """Converts binary media content to a PIL Image."""
         try:
@@ -138,42 +252,12 @@ class MediaAnalyzer:
             logger.error(f"Error converting to PIL image: {e}")
             raise
 
-    def _to_text(self, media_content: Union[bytes, BinaryIO, bytearray], media_type: str) -> str:
-        """
-        Convert document content to text for analysis.
-        
-        Note: This currently attempts basic text decoding. For advanced document 
-        processing (PDF, DOCX), Gemini's vision API handles the document image directly.
-        """
-        try:
-            if isinstance(media_content, (bytes, bytearray)):
-                # Try UTF-8 decode for plain text files
-                decoded = media_content.decode('utf-8', errors='replace')
-                # If decoded successfully and has readable content, return it
-                if decoded.strip() and len(decoded) > 10:
-                    logger.debug(f"Successfully decoded {media_type} as text ({len(decoded)} chars)")
-                    return decoded
-                else:
-                    # Empty or very short content - likely binary file
-                    logger.debug(f"Document appears to be binary, Gemini will handle via vision API")
-                    return "Document content will be analyzed via image processing."
-                    
-            elif hasattr(media_content, 'read'):
-                # If it's a file-like object
-                content_bytes = media_content.read()
-                return self._to_text(content_bytes, media_type)
-            
-            # Fallback for unsupported types
-            logger.info(f"Using Gemini vision API for {media_type} analysis")
-            return "Document will be analyzed using AI vision capabilities."
-            
-        except UnicodeDecodeError:
-            # Binary file (PDF, DOCX, etc.) - let Gemini handle it
-            logger.debug(f"Binary {media_type} detected, using Gemini vision API")
-            return "Document will be analyzed using AI vision capabilities."
-        except Exception as e:
-            logger.error(f"Error processing {media_type}: {e}")
-            return "Document will be analyzed using AI capabilities."
+    @staticmethod
+    def _is_image_document(document: Any) -> bool:
+        """Whether a Telegram document is an image Pillow can decode, sent as a file."""
+        return getattr(document, "mime_type", None) in (
+            "image/jpeg", "image/png", "image/webp", "image/bmp", "image/gif", "image/tiff"
+        )
 
     @staticmethod
     async def handle_analysis_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -191,6 +275,7 @@ class MediaAnalyzer:
         analyzer = MediaAnalyzer(context.bot_data["gemini_client"], context.bot_data["persona_manager"])
         
         media_content = None
+        media_source = None  # PhotoSize or Document, downloaded by analyze_media unless cached
         media_type = None
         query = ""
         
@@ -203,30 +288,22 @@ class MediaAnalyzer:
         elif message.reply_to_message:
             replied_message = message.reply_to_message
             if replied_message.photo:
-                media_content_file = await replied_message.photo[-1].get_file()
-                media_content_bytes = await media_content_file.download_as_bytearray()
-                media_content = bytes(media_content_bytes)
+                media_source = pick_photo_size(replied_message.photo, ANALYZE_IMAGE_MAX_EDGE)
                 media_type = "image"
             elif replied_message.document:
-                media_content_file = await replied_message.document.get_file()
-                media_content_bytes = await media_content_file.download_as_bytearray()
-                media_content = bytes(media_content_bytes)
-                media_type = "document"
+                media_source = replied_message.document
+                media_type = "image" if MediaAnalyzer._is_image_document(replied_message.document) else "document"
             # Extract query from the reply text
             query = message.text.replace("!ask", "").strip() if message.text else ""
         # Check if message itself contains media
         elif message.photo:
-            media_content_file = await message.photo[-1].get_file()
-            media_content_bytes = await media_content_file.download_as_bytearray()
-            media_content = bytes(media_content_bytes)
+            media_source = pick_photo_size(message.photo, ANALYZE_IMAGE_MAX_EDGE)
             media_type = "image"
             # Extract query from caption
             query = (message.caption or "").replace("!ask", "").strip()
         elif message.document:
-            media_content_file = await message.document.get_file()
-            media_content_bytes = await media_content_file.download_as_bytearray()
-            media_content = bytes(media_content_bytes)
-            media_type = "document"
+            media_source = message.document
+            media_type = "image" if MediaAnalyzer._is_image_document(message.document) else "document"
             # Extract query from caption
             query = (message.caption or "").replace("!ask", "").strip()
         # Plain text query
@@ -236,7 +313,7 @@ class MediaAnalyzer:
             query = media_content  # For text analysis, content and query are the same
         
         # If no media content found, show usage
-        if not media_content:
+        if not media_content and media_source is None:
             lang = get_user_lang(user.id)
             from handlers.response.analyze import analyze_response
             await message.reply_html(analyze_response(lang))
@@ -246,6 +323,7 @@ class MediaAnalyzer:
         if not query and media_type != "text":
             query = "Analyze this for me, please." if lang == 'en' else "Tolong analisis ini."
 
+
         phrase = "Alya is analyzing" if lang == 'en' else "Alya sedang menganalisis"
         loading_msg = await message.reply_text(f"<blockquote><b>🔍 {phrase}...</b></blockquote>", parse_mode="HTML")
 
@@ -257,7 +335,9 @@ class MediaAnalyzer:
                 media_content=media_content,
                 media_type=media_type,
                 query=query,
-                user_id=user.id
+                user_id=user.id,
+                file_unique_id=getattr(media_source, "file_unique_id", None),
+                media_source=media_source
             )
             # Use analysis formatter for informative responses (not persona conversation)
             from utils.analysis_formatter import format_analysis_response
@@ -0,0 +1,187 @@
+"""
+Quota-aware API key scheduler for Google Custom Search.
+
+Each CSE key has a daily query quota that resets at midnight Pacific time.
+The scheduler counts requests per key, remembers keys that answered with a
+quota error until the next reset, and hands out the remaining keys in
+round-robin order. State is persisted to a small JSON file (keys are stored
+by hash, never in clear) so a restart does not forget which keys are spent.
+Request counts are saved at most every ``save_interval`` seconds and on
+``flush()``; a key marked exhausted or failed is saved at once.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config.settings import (
+    GOOGLE_CSE_DAILY_LIMIT,
+    GOOGLE_CSE_KEY_COOLDOWN,
+    GOOGLE_CSE_KEY_STATE_PATH,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    from zoneinfo import ZoneInfo
+    _QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+except Exception:
+    # No tz database available; Pacific standard time is close enough
+    _QUOTA_TZ = timezone(timedelta(hours=-8))
+
+
+def _quota_day(now: Optional[float] = None) -> str:
+    """Return the current quota day (Pacific date) as YYYY-MM-DD."""
+    return datetime.fromtimestamp(now or time.time(), _QUOTA_TZ).date().isoformat()
+
+
+def _next_reset(now: Optional[float] = None) -> float:
+    """Return the epoch time of the next Pacific midnight."""
+    current = datetime.fromtimestamp(now or time.time(), _QUOTA_TZ)
+    tomorrow = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return tomorrow.timestamp()
+
+
+def _key_id(api_key: str) -> str:
+    return hashlib.sha1(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+class APIKeyScheduler:
+    """Round-robin key picker that skips keys out of daily quota."""
+
+    def __init__(
+        self,
+        state_path: str,
+        daily_limit: int = 100,
+        error_cooldown: float = 3600.0,
+        save_interval: float = 60.0,
+    ) -> None:
+        """
+        Args:
+            state_path: JSON file holding per-key usage across restarts
+            daily_limit: Requests per key per quota day (0 disables the count check)
+            error_cooldown: Seconds a key is skipped after a non-quota auth error
+            save_interval: Minimum seconds between saves of the request counts
+        """
+        self.path = Path(state_path)
+        self.daily_limit = daily_limit
+        self.error_cooldown = error_cooldown
+        self.save_interval = save_interval
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._keys: List[str] = []
+        self._cursor = 0
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._state = {k: v for k, v in data.items() if isinstance(v, dict)}
+        except Exception as e:
+            logger.warning(f"Could not load API key state from {self.path}: {e}")
+
+    def _save(self) -> None:
+        """Write state to disk (tmp file + rename). Caller holds the lock."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp_path.write_text(json.dumps(self._state, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        except Exception as e:
+            logger.error(f"Could not save API key state to {self.path}: {e}")
+
+    def _entry(self, api_key: str, now: float) -> Dict[str, Any]:
+        """Return the state for ``api_key``, resetting the count on a new quota day."""
+        day = _quota_day(now)
+        entry = self._state.setdefault(_key_id(api_key), {"day": day, "used": 0, "blocked_until": 0.0})
+        if entry.get("day") != day:
+            entry["day"] = day
+            entry["used"] = 0
+        return entry
+
+    def set_keys(self, api_keys: List[str]) -> None:
+        """Replace the managed key list (order is kept for round-robin)."""
+        with self._lock:
+            if api_keys != self._keys:
+                self._keys = list(api_keys)
+                self._cursor = 0
+
+    def _is_available(self, api_key: str, now: float) -> bool:
+        entry = self._entry(api_key, now)
+        if entry.get("blocked_until", 0.0) > now:
+            return False
+        return not self.daily_limit or entry["used"] < self.daily_limit
+
+    def ordered_keys(self) -> List[str]:
+        """Return usable keys, starting one further along the ring on every call."""
+        now = time.time()
+        with self._lock:
+            if not self._keys:
+                return []
+            start = self._cursor % len(self._keys)
+            self._cursor = start + 1
+            ring = self._keys[start:] + self._keys[:start]
+            return [key for key in ring if self._is_available(key, now)]
+
+    def record_request(self, api_key: str) -> None:
+        """Count one billed request against ``api_key`` (saved periodically)."""
+        with self._lock:
+            self._entry(api_key, time.time())["used"] += 1
+            self._dirty = True
+            if time.monotonic() - self._last_save >= self.save_interval:
+                self._save()
+
+    def flush(self) -> None:
+        """Save request counts that have not been written yet."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def mark_exhausted(self, api_key: str) -> None:
+        """Skip ``api_key`` until the next quota reset."""
+        now = time.time()
+        with self._lock:
+            entry = self._entry(api_key, now)
+            entry["blocked_until"] = _next_reset(now)
+            self._save()
+        logger.warning(f"API key {api_key[:5]}... is out of quota until the next reset")
+
+    def mark_failed(self, api_key: str) -> None:
+        """Skip ``api_key`` for ``error_cooldown`` seconds after an auth error."""
+        now = time.time()
+        with self._lock:
+            entry = self._entry(api_key, now)
+            entry["blocked_until"] = max(entry.get("blocked_until", 0.0), now + self.error_cooldown)
+            self._save()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-key usage (by key hash) for monitoring."""
+        now = time.time()
+        with self._lock:
+            keys = {}
+            for api_key in self._keys:
+                entry = self._entry(api_key, now)
+                keys[_key_id(api_key)] = {
+                    "used": entry["used"],
+                    "available": self._is_available(api_key, now),
+                    "blocked_until": entry.get("blocked_until", 0.0),
+                }
+            return {"daily_limit": self.daily_limit, "keys": keys}
+
+
+cse_key_scheduler = APIKeyScheduler(
+    GOOGLE_CSE_KEY_STATE_PATH,
+    daily_limit=GOOGLE_CSE_DAILY_LIMIT,
+    error_cooldown=GOOGLE_CSE_KEY_COOLDOWN,
+)
@@ -0,0 +1,139 @@
+"""
+Streaming audio decode for speech-to-text.
+
+Voice notes are streamed from Telegram in chunks straight into an ffmpeg
+subprocess (stdin pipe) that emits 16 kHz mono 16-bit PCM on stdout. PCM is
+yielded in fixed-size frames as soon as ffmpeg produces them, so the STT
+engine can start on the beginning of a long voice note while the rest is
+still downloading, and nothing is ever written to disk. Decoding stops
+after STT_MAX_AUDIO_SECONDS so peak memory stays bounded.
+"""
+import asyncio
+import logging
+from typing import AsyncIterator, Optional, Union
+
+from config.settings import STT_MAX_AUDIO_SECONDS
+from utils.http_client import http_clients
+from utils.stt import SAMPLE_RATE, SAMPLE_WIDTH
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+FRAME_SECONDS = 0.5
+FRAME_BYTES = int(SAMPLE_RATE * SAMPLE_WIDTH * FRAME_SECONDS)
+
+_FFMPEG_ARGS = (
+    "ffmpeg", "-hide_banner", "-loglevel", "error",
+    "-i", "pipe:0", "-f", "s16le", "-acodec", "pcm_s16le",
+    "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1",
+)
+
+
+async def iter_bytes(data: Union[bytes, bytearray], chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield an in-memory buffer in chunks."""
+    view = memoryview(data)
+    for offset in range(0, len(view), chunk_size):
+        yield bytes(view[offset:offset + chunk_size])
+
+
+async def iter_file(path: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield a local file in chunks, reading in a worker thread."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = await asyncio.to_thread(f.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+async def iter_telegram_file(tg_file, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Stream a telegram.File over the shared HTTP pool (or from disk in local mode)."""
+    file_path = tg_file.file_path or ""
+    if not file_path.startswith(("http://", "https://")):
+        async for chunk in iter_file(file_path, chunk_size):
+            yield chunk
+        return
+
+    session = http_clients.get("telegram")
+    async with session.get(file_path) as response:
+        response.raise_for_status()
+        async for chunk in response.content.iter_chunked(chunk_size):
+            yield chunk
+
+
+async def decode_pcm_stream(
+    chunks: AsyncIterator[bytes],
+    max_seconds: Optional[float] = STT_MAX_AUDIO_SECONDS,
+) -> AsyncIterator[bytes]:
+    """Decode any ffmpeg-readable audio stream into 16 kHz mono PCM frames.
+
+    Args:
+        chunks: Encoded audio (e.g. OGG/Opus) in arbitrary chunks
+        max_seconds: Stop after this much decoded audio (None for no limit)
+
+    Yields:
+        PCM frames of FRAME_BYTES (the last one may be shorter)
+    """
+    process = await asyncio.create_subprocess_exec(
+        *_FFMPEG_ARGS,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def feed() -> None:
+        try:
+            async for chunk in chunks:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg exited early (bad input or truncated by max_seconds)
+        finally:
+            if not process.stdin.is_closing():
+                process.stdin.close()
+
+    feeder = asyncio.create_task(feed())
+    max_bytes = int(max_seconds * SAMPLE_RATE * SAMPLE_WIDTH) if max_seconds else None
+    emitted = 0
+    buffer = bytearray()
+    truncated = False
+    try:
+        while True:
+            data = await process.stdout.read(CHUNK_SIZE)
+            if not data:
+                break
+            buffer.extend(data)
+            while len(buffer) >= FRAME_BYTES:
+                frame = bytes(buffer[:FRAME_BYTES])
+                del buffer[:FRAME_BYTES]
+                if max_bytes is not None and emitted + len(frame) > max_bytes:
+                    truncated = True
+                    break
+                emitted += len(frame)
+                yield frame
+            if truncated:
+                logger.warning(f"Voice note longer than {max_seconds}s, transcribing the first part only")
+                break
+
+        if not truncated:
+            if buffer:
+                yield bytes(buffer)
+            await feeder
+            if await process.wait() != 0:
+                stderr = (await process.stderr.read()).decode(errors="replace").strip()
+                raise RuntimeError(f"ffmpeg decode failed: {stderr or process.returncode}")
+    finally:
+        if not feeder.done():
+            feeder.cancel()
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        await asyncio.gather(feeder, return_exceptions=True)
+
+
+async def collect_pcm(chunks: AsyncIterator[bytes], max_seconds: Optional[float] = STT_MAX_AUDIO_SECONDS) -> bytes:
+    """Decode a whole stream into one PCM buffer."""
+    pcm = bytearray()
+    async for frame in decode_pcm_stream(chunks, max_seconds):
+        pcm.extend(frame)
+    return bytes(pcm)
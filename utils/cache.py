@@ -0,0 +1,233 @@
+"""
+Caching primitives shared across Alya Bot components: the in-memory
+``TTLCache`` and the SQLite-backed ``PersistentLRUCache``.
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries also expire after a fixed TTL.
+
+    Backed by an ``OrderedDict`` kept in recency order, so lookups, inserts
+    and evictions are amortised O(1). Expired entries are dropped lazily when
+    they are read or when they reach the LRU end during an insert, so no call
+    ever walks the whole cache.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 300.0) -> None:
+        """
+        Args:
+            maxsize: Maximum number of entries kept before LRU eviction
+            ttl: Seconds an entry stays valid after it was stored
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` on miss/expiry."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entries."""
+        now = time.monotonic()
+        self._data[key] = (value, now + self.ttl)
+        self._data.move_to_end(key)
+
+        # Opportunistically drop expired entries sitting at the LRU end
+        while self._data:
+            oldest_key, (_, expires_at) = next(iter(self._data.items()))
+            if expires_at > now or oldest_key == key:
+                break
+            self._data.popitem(last=False)
+            self.expirations += 1
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove ``key`` and return its value if still valid."""
+        entry = self._data.pop(key, None)
+        if entry is None or entry[1] <= time.monotonic():
+            return default
+        return entry[0]
+
+    def keys(self) -> List[Hashable]:
+        """Return the keys of all entries that have not expired."""
+        now = time.monotonic()
+        return [key for key, (_, expires_at) in self._data.items() if expires_at > now]
+
+    def clear(self) -> None:
+        """Drop every entry while keeping the counters."""
+        self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class PersistentLRUCache:
+    """Size-bounded LRU key-value cache stored in a SQLite file.
+
+    Survives restarts, so results that are expensive to recompute (model
+    inference) are only ever computed once per key. Values must be JSON
+    serialisable. Recency is tracked with a ``last_used`` timestamp and the
+    table is trimmed back to ``maxsize`` every ``trim_interval`` writes, so
+    it may briefly hold up to ``maxsize + trim_interval`` rows. Hits only
+    note the new timestamp in memory; the timestamps are written in one batch
+    with the next write, every ``trim_interval`` hits, or on ``close()``, so
+    lookups never commit to disk.
+    """
+
+    def __init__(self, path: str, maxsize: int = 50000, trim_interval: int = 100) -> None:
+        """
+        Args:
+            path: SQLite database file (parent directories are created)
+            maxsize: Maximum number of entries kept after a trim
+            trim_interval: Number of writes between LRU trims
+        """
+        self.path = path
+        self.maxsize = maxsize
+        self.trim_interval = trim_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._writes = 0
+        self._touched: Dict[str, float] = {}  # key -> last_used not yet written
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_last_used ON cache(last_used)")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the stored value for ``key`` and mark it recently used."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            self._touched[key] = time.time()
+            if len(self._touched) >= self.trim_interval:
+                self._flush_touched()
+                self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key``, trimming the least recently used rows."""
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, last_used) VALUES (?, ?, ?)",
+                (key, payload, time.time()),
+            )
+            self._touched.pop(key, None)
+            self._flush_touched()
+            self._writes += 1
+            if self._writes % self.trim_interval == 0:
+                self._trim()
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` if present."""
+        with self._lock:
+            self._touched.pop(key, None)
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _flush_touched(self) -> None:
+        """Write pending ``last_used`` timestamps (no commit). Caller holds the lock."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE cache SET last_used = ? WHERE key = ?",
+                [(last_used, key) for key, last_used in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _trim(self) -> None:
+        """Delete rows beyond ``maxsize`` in LRU order. Caller holds the lock."""
+        cursor = self._conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            "SELECT key FROM cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize,),
+        )
+        self.evictions += max(cursor.rowcount, 0)
+
+    def clear(self) -> None:
+        """Drop every entry while keeping the counters."""
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Flush and close the underlying database."""
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
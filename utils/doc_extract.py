@@ -0,0 +1,380 @@
+"""
+Document text extraction for !ask on PDFs, Office files and plain text.
+
+Extraction runs in a spawned process pool so large documents neither block
+the event loop nor hold the GIL, and reads incrementally so it can stop at
+DOC_MAX_PAGES / DOC_MAX_CHARS without parsing the rest:
+
+- PDF: the text layer, page by page (pypdf)
+- DOCX / PPTX / XLSX: the Office Open XML parts, streamed with iterparse
+- anything else: decoded as text, detecting the encoding from the BOM,
+  strict UTF-8, then charset_normalizer when available
+
+Documents longer than DOC_DIRECT_CHARS are summarised map-reduce style:
+chunks are summarised concurrently and the summaries merged until they fit.
+Extracted text and the digests (one per language) are cached by Telegram
+``file_unique_id`` so the same document is never parsed or summarised twice.
+"""
+import asyncio
+import codecs
+import io
+import logging
+import multiprocessing
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import iterparse
+
+from config.settings import (
+    DOC_CACHE_PATH,
+    DOC_CACHE_SIZE,
+    DOC_CHUNK_CHARS,
+    DOC_DIRECT_CHARS,
+    DOC_EXTRACT_WORKERS,
+    DOC_MAP_CONCURRENCY,
+    DOC_MAX_CHARS,
+    DOC_MAX_PAGES,
+)
+from utils.cache import PersistentLRUCache
+
+logger = logging.getLogger(__name__)
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_S_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+@dataclass
+class ExtractedDocument:
+    """Text pulled out of a document, plus how much of it was read."""
+
+    text: str
+    kind: str
+    pages: int = 0
+    truncated: bool = False
+    digests: Dict[str, str] = field(default_factory=dict)  # lang -> map-reduce digest
+
+    @property
+    def empty(self) -> bool:
+        return not self.text.strip()
+
+
+class _Collector:
+    """Accumulates text pieces up to a character budget."""
+
+    def __init__(self, max_chars: int) -> None:
+        self.max_chars = max_chars
+        self.parts: List[str] = []
+        self.size = 0
+        self.truncated = False
+
+    @property
+    def full(self) -> bool:
+        return self.size >= self.max_chars
+
+    def add(self, text: str) -> bool:
+        """Add a piece; returns False once the budget is used up."""
+        if self.full:
+            self.truncated = True
+            return False
+        if self.size + len(text) > self.max_chars:
+            text = text[: self.max_chars - self.size]
+            self.truncated = True
+        self.parts.append(text)
+        self.size += len(text)
+        return not self.full
+
+    def text(self, separator: str = "\n") -> str:
+        return separator.join(part for part in self.parts if part.strip()).strip()
+
+
+def _extract_pdf(data: bytes, max_pages: int, max_chars: int) -> ExtractedDocument:
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    collector = _Collector(max_chars)
+    pages_read = 0
+    for page in reader.pages:
+        if pages_read >= max_pages:
+            collector.truncated = True
+            break
+        pages_read += 1
+        if not collector.add(page.extract_text() or ""):
+            break
+    truncated = collector.truncated or pages_read < len(reader.pages)
+    return ExtractedDocument(collector.text("\n\n"), "pdf", pages_read, truncated)
+
+
+def _iter_xml_paragraphs(stream: Any, paragraph_tag: str, text_tag: str) -> Iterator[str]:
+    """Yield the text of each paragraph element, clearing parsed elements as it goes."""
+    pieces: List[str] = []
+    for event, element in iterparse(stream, events=("end",)):
+        if element.tag == text_tag and element.text:
+            pieces.append(element.text)
+        elif element.tag == paragraph_tag:
+            yield "".join(pieces)
+            pieces = []
+            element.clear()
+
+
+def _extract_docx(archive: zipfile.ZipFile, max_chars: int) -> ExtractedDocument:
+    collector = _Collector(max_chars)
+    with archive.open("word/document.xml") as stream:
+        for paragraph in _iter_xml_paragraphs(stream, f"{_W_NS}p", f"{_W_NS}t"):
+            if not collector.add(paragraph):
+                break
+    return ExtractedDocument(collector.text(), "docx", 0, collector.truncated)
+
+
+def _numbered_parts(archive: zipfile.ZipFile, pattern: str) -> List[str]:
+    regex = re.compile(pattern)
+    found = [(int(match.group(1)), name) for name in archive.namelist() if (match := regex.fullmatch(name))]
+    return [name for _, name in sorted(found)]
+
+
+def _extract_pptx(archive: zipfile.ZipFile, max_pages: int, max_chars: int) -> ExtractedDocument:
+    collector = _Collector(max_chars)
+    slides = _numbered_parts(archive, r"ppt/slides/slide(\d+)\.xml")
+    read = 0
+    for name in slides[:max_pages]:
+        read += 1
+        with archive.open(name) as stream:
+            lines = [line for line in _iter_xml_paragraphs(stream, f"{_A_NS}p", f"{_A_NS}t") if line.strip()]
+        if not collector.add(f"[Slide {read}]\n" + "\n".join(lines)):
+            break
+    return ExtractedDocument(collector.text("\n\n"), "pptx", read, collector.truncated or read < len(slides))
+
+
+def _extract_xlsx(archive: zipfile.ZipFile, max_pages: int, max_chars: int) -> ExtractedDocument:
+    shared: List[str] = []
+    if "xl/sharedStrings.xml" in archive.namelist():
+        with archive.open("xl/sharedStrings.xml") as stream:
+            shared = list(_iter_xml_paragraphs(stream, f"{_S_NS}si", f"{_S_NS}t"))
+
+    collector = _Collector(max_chars)
+    sheets = _numbered_parts(archive, r"xl/worksheets/sheet(\d+)\.xml")
+    read = 0
+    for name in sheets[:max_pages]:
+        read += 1
+        if not collector.add(f"[Sheet {read}]"):
+            break
+        with archive.open(name) as stream:
+            row: List[str] = []
+            cell_type = None
+            for event, element in iterparse(stream, events=("start", "end")):
+                if event == "start":
+                    if element.tag == f"{_S_NS}c":
+                        cell_type = element.get("t")
+                    continue
+                if element.tag == f"{_S_NS}v" and element.text is not None:
+                    value = element.text
+                    if cell_type == "s" and value.isdigit() and int(value) < len(shared):
+                        value = shared[int(value)]
+                    row.append(value)
+                elif element.tag == f"{_S_NS}t" and cell_type == "inlineStr" and element.text:
+                    row.append(element.text)
+                elif element.tag == f"{_S_NS}row":
+                    if row and not collector.add("\t".join(row)):
+                        break
+                    row = []
+                    element.clear()
+        if collector.full:
+            break
+    return ExtractedDocument(collector.text(), "xlsx", read, collector.truncated or read < len(sheets))
+
+
+def _decode_text(data: bytes) -> str:
+    for bom, encoding in ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")):
+        if data.startswith(bom):
+            return data.decode(encoding, errors="replace")
+    try:
+        # Incremental so a multi-byte character cut off by the size limit is not an error
+        return codecs.getincrementaldecoder("utf-8")().decode(data)
+    except UnicodeDecodeError:
+        pass
+    try:
+        from charset_normalizer import from_bytes
+        best = from_bytes(data[:200000]).best()
+        if best is not None:
+            return data.decode(best.encoding, errors="replace")
+    except ImportError:
+        pass
+    return data.decode("cp1252", errors="replace")
+
+
+def _looks_binary(data: bytes) -> bool:
+    sample = data[:4096]
+    if not sample:
+        return False
+    if b"\x00" in sample and not sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return True
+    control = sum(1 for byte in sample if byte < 32 and byte not in (9, 10, 12, 13))
+    return control / len(sample) > 0.1
+
+
+def extract_document(data: bytes, max_pages: int = DOC_MAX_PAGES, max_chars: int = DOC_MAX_CHARS) -> ExtractedDocument:
+    """Extract text from document bytes (blocking; runs in the worker processes)."""
+    if data.startswith(b"%PDF"):
+        try:
+            return _extract_pdf(data, max_pages, max_chars)
+        except ImportError:
+            logger.warning("pypdf not installed, PDF text layer unavailable")
+            return ExtractedDocument("", "pdf")
+
+    if data.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                names = set(archive.namelist())
+                if "word/document.xml" in names:
+                    return _extract_docx(archive, max_chars)
+                if any(name.startswith("ppt/slides/") for name in names):
+                    return _extract_pptx(archive, max_pages, max_chars)
+                if any(name.startswith("xl/worksheets/") for name in names):
+                    return _extract_xlsx(archive, max_pages, max_chars)
+        except zipfile.BadZipFile:
+            pass
+        return ExtractedDocument("", "archive")
+
+    if _looks_binary(data):
+        return ExtractedDocument("", "binary")
+
+    text = _decode_text(data[: max_chars * 4])
+    truncated = len(text) > max_chars or len(data) > max_chars * 4
+    return ExtractedDocument(text[:max_chars].strip(), "text", 0, truncated)
+
+
+def split_into_chunks(text: str, chunk_chars: int) -> List[str]:
+    """Split text into chunks of at most ``chunk_chars``, preferring paragraph breaks."""
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for paragraph in text.split("\n"):
+        while len(paragraph) > chunk_chars:
+            if current:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            chunks.append(paragraph[:chunk_chars])
+            paragraph = paragraph[chunk_chars:]
+        if size + len(paragraph) + 1 > chunk_chars and current:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(paragraph)
+        size += len(paragraph) + 1
+    if current and "".join(current).strip():
+        chunks.append("\n".join(current))
+    return chunks
+
+
+class DocumentReader:
+    """Turns a document into text context for analysis, with caching and summarisation."""
+
+    def __init__(self, gemini_client: Any = None) -> None:
+        self.gemini_client = gemini_client
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.cache: Optional[PersistentLRUCache] = None
+        if DOC_CACHE_SIZE > 0:
+            try:
+                self.cache = PersistentLRUCache(DOC_CACHE_PATH, maxsize=DOC_CACHE_SIZE)
+            except Exception as e:
+                logger.warning(f"Document cache disabled: {e}")
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn, not fork: the bot process already runs threads and an event loop
+            self._pool = ProcessPoolExecutor(
+                max_workers=DOC_EXTRACT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def extract(self, data: bytes, file_unique_id: Optional[str] = None) -> ExtractedDocument:
+        """Extract text, reusing the cached result for a Telegram file seen before."""
+        if self.cache is not None and file_unique_id:
+            cached = self.cache.get(file_unique_id)
+            if cached is not None:
+                logger.info(f"Document cache hit for {file_unique_id}")
+                known = {f.name for f in fields(ExtractedDocument)}
+                return ExtractedDocument(**{key: value for key, value in cached.items() if key in known})
+
+        loop = asyncio.get_running_loop()
+        try:
+            document = await loop.run_in_executor(self._get_pool(), extract_document, bytes(data))
+        except Exception as e:
+            logger.error(f"Document extraction failed: {e}")
+            return ExtractedDocument("", "error")
+        logger.info(
+            f"Extracted {len(document.text)} chars from {document.kind} document"
+            f"{f' ({document.pages} pages)' if document.pages else ''}{' [truncated]' if document.truncated else ''}"
+        )
+        self._store(file_unique_id, document)
+        return document
+
+    def _store(self, file_unique_id: Optional[str], document: ExtractedDocument) -> None:
+        if self.cache is not None and file_unique_id:
+            self.cache.set(file_unique_id, asdict(document))
+
+    async def context_for(
+        self, data: bytes, lang: str, file_unique_id: Optional[str] = None
+    ) -> Tuple[ExtractedDocument, str]:
+        """Return the document and the text to analyse: the full text, or a digest in ``lang`` if it is long."""
+        document = await self.extract(data, file_unique_id)
+        if document.empty or len(document.text) <= DOC_DIRECT_CHARS:
+            return document, document.text
+        digest = document.digests.get(lang)
+        if digest is None:
+            digest = await self._summarise(document.text, lang)
+            if digest:
+                document.digests[lang] = digest
+                self._store(file_unique_id, document)
+        return document, digest or document.text[:DOC_DIRECT_CHARS]
+
+    async def _summarise(self, text: str, lang: str) -> Optional[str]:
+        """Map-reduce: summarise chunks concurrently, then merge until it fits."""
+        if self.gemini_client is None:
+            return None
+        semaphore = asyncio.Semaphore(DOC_MAP_CONCURRENCY)
+
+        async def summarise_chunk(index: int, total: int, chunk: str) -> str:
+            async with semaphore:
+                summary = await self.gemini_client.summarize_text(chunk, lang, part=f"{index}/{total}")
+            return summary or chunk[: DOC_CHUNK_CHARS // 4]
+
+        rounds = 0
+        while len(text) > DOC_DIRECT_CHARS and rounds < 3:
+            rounds += 1
+            chunks = split_into_chunks(text, DOC_CHUNK_CHARS)
+            logger.info(f"Summarising document: round {rounds}, {len(chunks)} chunks")
+            summaries = await asyncio.gather(*(
+                summarise_chunk(index, len(chunks), chunk) for index, chunk in enumerate(chunks, 1)
+            ))
+            text = "\n\n".join(summaries)
+        return text[:DOC_DIRECT_CHARS]
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_reader: Optional[DocumentReader] = None
+
+
+def get_document_reader(gemini_client: Any = None) -> DocumentReader:
+    """Get or create the global document reader."""
+    global _reader
+    if _reader is None:
+        _reader = DocumentReader(gemini_client)
+    elif _reader.gemini_client is None:
+        _reader.gemini_client = gemini_client
+    return _reader
+
+
+def shutdown_document_reader() -> None:
+    """Stop the extraction pool and close the cache, if the reader was ever used."""
+    global _reader
+    if _reader is not None:
+        _reader.shutdown()
+        if _reader.cache is not None:
+            _reader.cache.close()
+        _reader = None
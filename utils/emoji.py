@@ -0,0 +1,167 @@
+"""
+Emoji code point tables and scanning helpers shared across Alya Bot.
+
+Code points are split by their Unicode Emoji_Presentation property:
+
+- ``EMOJI_PRESENTATION_RANGES`` render as emoji by default (😊, ⭐, 🇯🇵 halves)
+- ``TEXT_PRESENTATION_RANGES`` render as text (©, ™, ↔, ❤) and only count as
+  emoji when followed by variation selector-16 or a skin tone modifier
+- ``COMPONENT_RANGES`` are sequence glue (ZWJ, VS-16, keycap, tag characters)
+
+The tables are compiled once into character classes and a sequence regex, so
+every caller finds, strips or limits emoji with a single regex pass instead of
+a per-character ``unicodedata`` lookup.
+"""
+import re
+from typing import List, Tuple
+
+ZWJ = "\u200d"
+VARIATION_SELECTOR_16 = "\ufe0f"
+KEYCAP = "\u20e3"
+
+Ranges = Tuple[Tuple[int, int], ...]
+
+# Inclusive (start, end) code point ranges with Emoji_Presentation=Yes
+EMOJI_PRESENTATION_RANGES: Ranges = (
+    (0x231A, 0x231B), (0x23E9, 0x23EC), (0x23F0, 0x23F0), (0x23F3, 0x23F3),
+    (0x25FD, 0x25FE), (0x2614, 0x2615), (0x2648, 0x2653), (0x267F, 0x267F),
+    (0x2693, 0x2693), (0x26A1, 0x26A1), (0x26AA, 0x26AB), (0x26BD, 0x26BE),
+    (0x26C4, 0x26C5), (0x26CE, 0x26CE), (0x26D4, 0x26D4), (0x26EA, 0x26EA),
+    (0x26F2, 0x26F3), (0x26F5, 0x26F5), (0x26FA, 0x26FA), (0x26FD, 0x26FD),
+    (0x2705, 0x2705), (0x270A, 0x270B), (0x2728, 0x2728), (0x274C, 0x274C),
+    (0x274E, 0x274E), (0x2753, 0x2755), (0x2757, 0x2757), (0x2795, 0x2797),
+    (0x27B0, 0x27B0), (0x27BF, 0x27BF), (0x2B1B, 0x2B1C), (0x2B50, 0x2B50),
+    (0x2B55, 0x2B55),
+    (0x1F004, 0x1F004), (0x1F0CF, 0x1F0CF), (0x1F18E, 0x1F18E), (0x1F191, 0x1F19A),
+    (0x1F1E6, 0x1F1FF),                  # regional indicators (flag halves)
+    (0x1F201, 0x1F201), (0x1F21A, 0x1F21A), (0x1F22F, 0x1F22F), (0x1F232, 0x1F236),
+    (0x1F238, 0x1F23A), (0x1F250, 0x1F251), (0x1F300, 0x1F320), (0x1F32D, 0x1F335),
+    (0x1F337, 0x1F37C), (0x1F37E, 0x1F393), (0x1F3A0, 0x1F3CA), (0x1F3CF, 0x1F3D3),
+    (0x1F3E0, 0x1F3F0), (0x1F3F4, 0x1F3F4),
+    (0x1F3F8, 0x1F43E),                  # includes skin tone modifiers 1F3FB-1F3FF
+    (0x1F440, 0x1F440), (0x1F442, 0x1F4FC), (0x1F4FF, 0x1F53D), (0x1F54B, 0x1F54E),
+    (0x1F550, 0x1F567), (0x1F57A, 0x1F57A), (0x1F595, 0x1F596), (0x1F5A4, 0x1F5A4),
+    (0x1F5FB, 0x1F64F), (0x1F680, 0x1F6C5), (0x1F6CC, 0x1F6CC), (0x1F6D0, 0x1F6D2),
+    (0x1F6D5, 0x1F6D9), (0x1F6DC, 0x1F6DF), (0x1F6EB, 0x1F6EC), (0x1F6F4, 0x1F6FC),
+    (0x1F7E0, 0x1F7EB), (0x1F7F0, 0x1F7F0), (0x1F90C, 0x1F93A), (0x1F93C, 0x1F945),
+    (0x1F947, 0x1F9FF), (0x1FA70, 0x1FA7C), (0x1FA80, 0x1FAC6), (0x1FAC8, 0x1FAC8),
+    (0x1FACC, 0x1FADD), (0x1FADF, 0x1FAEB), (0x1FAEF, 0x1FAFA),
+)
+
+# Emoji=Yes but Emoji_Presentation=No (keycap bases 0-9 # * excluded)
+TEXT_PRESENTATION_RANGES: Ranges = (
+    (0x00A9, 0x00A9), (0x00AE, 0x00AE), (0x203C, 0x203C), (0x2049, 0x2049),
+    (0x2122, 0x2122), (0x2139, 0x2139), (0x2194, 0x2199), (0x21A9, 0x21AA),
+    (0x2328, 0x2328), (0x23CF, 0x23CF), (0x23ED, 0x23EF), (0x23F1, 0x23F2),
+    (0x23F8, 0x23FA), (0x24C2, 0x24C2), (0x25AA, 0x25AB), (0x25B6, 0x25B6),
+    (0x25C0, 0x25C0), (0x25FB, 0x25FC), (0x2600, 0x2604), (0x260E, 0x260E),
+    (0x2611, 0x2611), (0x2618, 0x2618), (0x261D, 0x261D), (0x2620, 0x2620),
+    (0x2622, 0x2623), (0x2626, 0x2626), (0x262A, 0x262A), (0x262E, 0x262F),
+    (0x2638, 0x263A), (0x2640, 0x2640), (0x2642, 0x2642), (0x265F, 0x2660),
+    (0x2663, 0x2663), (0x2665, 0x2666), (0x2668, 0x2668), (0x267B, 0x267B),
+    (0x267E, 0x267E), (0x2692, 0x2692), (0x2694, 0x2697), (0x2699, 0x2699),
+    (0x269B, 0x269C), (0x26A0, 0x26A0), (0x26A7, 0x26A7), (0x26B0, 0x26B1),
+    (0x26C8, 0x26C8), (0x26CF, 0x26CF), (0x26D1, 0x26D1), (0x26D3, 0x26D3),
+    (0x26E9, 0x26E9), (0x26F0, 0x26F1), (0x26F4, 0x26F4), (0x26F7, 0x26F9),
+    (0x2702, 0x2702), (0x2708, 0x2709), (0x270C, 0x270D), (0x270F, 0x270F),
+    (0x2712, 0x2712), (0x2714, 0x2714), (0x2716, 0x2716), (0x271D, 0x271D),
+    (0x2721, 0x2721), (0x2733, 0x2734), (0x2744, 0x2744), (0x2747, 0x2747),
+    (0x2763, 0x2764), (0x27A1, 0x27A1), (0x2934, 0x2935), (0x2B05, 0x2B07),
+    (0x3030, 0x3030), (0x303D, 0x303D), (0x3297, 0x3297), (0x3299, 0x3299),
+    (0x1F170, 0x1F171), (0x1F17E, 0x1F17F), (0x1F202, 0x1F202), (0x1F237, 0x1F237),
+    (0x1F321, 0x1F321), (0x1F324, 0x1F32C), (0x1F336, 0x1F336), (0x1F37D, 0x1F37D),
+    (0x1F396, 0x1F397), (0x1F399, 0x1F39B), (0x1F39E, 0x1F39F), (0x1F3CB, 0x1F3CE),
+    (0x1F3D4, 0x1F3DF), (0x1F3F3, 0x1F3F3), (0x1F3F5, 0x1F3F5), (0x1F3F7, 0x1F3F7),
+    (0x1F43F, 0x1F43F), (0x1F441, 0x1F441), (0x1F4FD, 0x1F4FD), (0x1F549, 0x1F54A),
+    (0x1F56F, 0x1F570), (0x1F573, 0x1F579), (0x1F587, 0x1F587), (0x1F58A, 0x1F58D),
+    (0x1F590, 0x1F590), (0x1F5A5, 0x1F5A5), (0x1F5A8, 0x1F5A8), (0x1F5B1, 0x1F5B2),
+    (0x1F5BC, 0x1F5BC), (0x1F5C2, 0x1F5C4), (0x1F5D1, 0x1F5D3), (0x1F5DC, 0x1F5DE),
+    (0x1F5E1, 0x1F5E1), (0x1F5E3, 0x1F5E3), (0x1F5E8, 0x1F5E8), (0x1F5EF, 0x1F5EF),
+    (0x1F5F3, 0x1F5F3), (0x1F5FA, 0x1F5FA), (0x1F6CB, 0x1F6CB), (0x1F6CD, 0x1F6CF),
+    (0x1F6E0, 0x1F6E5), (0x1F6E9, 0x1F6E9), (0x1F6F0, 0x1F6F0), (0x1F6F3, 0x1F6F3),
+)
+
+COMPONENT_RANGES: Ranges = (
+    (0x200D, 0x200D),                    # zero width joiner
+    (0x20E3, 0x20E3),                    # combining enclosing keycap
+    (0xFE0F, 0xFE0F),                    # variation selector-16
+    (0xE0020, 0xE007F),                  # tag sequences (subdivision flags)
+)
+
+
+def _char_class(ranges: Ranges) -> str:
+    parts = []
+    for start, end in ranges:
+        if start == end:
+            parts.append(re.escape(chr(start)))
+        else:
+            parts.append(f"{re.escape(chr(start))}-{re.escape(chr(end))}")
+    return "[" + "".join(parts) + "]"
+
+
+# Any code point that can be part of an emoji, in either presentation
+EMOJI_CHAR_CLASS = _char_class(EMOJI_PRESENTATION_RANGES + TEXT_PRESENTATION_RANGES + COMPONENT_RANGES)
+
+# Code points that are emoji on their own, plus stray sequence components
+EMOJI_CHAR_RE = re.compile(_char_class(EMOJI_PRESENTATION_RANGES + COMPONENT_RANGES))
+
+_PRESENTATION_CLASS = _char_class(EMOJI_PRESENTATION_RANGES)
+_TEXT_CLASS = _char_class(TEXT_PRESENTATION_RANGES)
+_MODIFIERS = "[\ufe0f\U0001F3FB-\U0001F3FF\U000E0020-\U000E007F]*"
+# Text-presentation symbols are emoji only with VS-16 or a skin tone right after
+_BASE = f"(?:{_PRESENTATION_CLASS}|{_TEXT_CLASS}(?=[\ufe0f\U0001F3FB-\U0001F3FF]))"
+# After a ZWJ the sequence is already an emoji, so either presentation joins it
+_JOINED = f"(?:{_PRESENTATION_CLASS}|{_TEXT_CLASS})"
+
+# One user-perceived emoji: flag pair, keycap, or base + modifiers joined by ZWJ
+_SEQUENCE_PATTERN = (
+    "[\U0001F1E6-\U0001F1FF]{2}"
+    "|[0-9#*]\ufe0f?\u20e3"
+    f"|{_BASE}{_MODIFIERS}(?:\u200d{_JOINED}{_MODIFIERS})*"
+)
+EMOJI_SEQUENCE_RE = re.compile(_SEQUENCE_PATTERN)
+
+# Adjacent emoji sequences ("😂😂😂") as one run
+EMOJI_RUN_RE = re.compile(f"(?:{_SEQUENCE_PATTERN})+")
+
+
+def find_emoji(text: str) -> List[str]:
+    """Return every emoji sequence in ``text`` (ZWJ families and flags count once)."""
+    return EMOJI_SEQUENCE_RE.findall(text) if text else []
+
+
+def is_emoji_only(text: str) -> bool:
+    """True if ``text`` is non-empty and contains only emoji and whitespace."""
+    if not text or not text.strip():
+        return False
+    return EMOJI_CHAR_RE.sub("", EMOJI_SEQUENCE_RE.sub("", text)).strip() == ""
+
+
+def strip_emoji(text: str) -> Tuple[str, str]:
+    """Split ``text`` into (text without emoji, concatenated emoji sequences)."""
+    if not text:
+        return "", ""
+    emoji = "".join(EMOJI_SEQUENCE_RE.findall(text))
+    # Sequences first so keycap digits go too, then any stray components
+    return EMOJI_CHAR_RE.sub("", EMOJI_SEQUENCE_RE.sub("", text)), emoji
+
+
+def limit_emoji(text: str, max_total: int, runs: bool = False) -> str:
+    """Keep the first ``max_total`` emoji in ``text`` and drop the rest.
+
+    Args:
+        text: Text to trim
+        max_total: Number of emoji (or runs) to keep
+        runs: Count each run of adjacent emoji once instead of every sequence
+    """
+    if not text:
+        return text
+    pattern = EMOJI_RUN_RE if runs else EMOJI_SEQUENCE_RE
+    count = 0
+
+    def _keep(match: "re.Match[str]") -> str:
+        nonlocal count
+        count += 1
+        return match.group(0) if count <= max_total else ""
+
+    return pattern.sub(_keep, text)
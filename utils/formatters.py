@@ -4,6 +4,10 @@ Neutral response formatters for Alya Bot.
 Handles HTML/Markdown escaping and message structure with deterministic output and
 proper error handling. Keep formatting simple: conversation paragraphs are rendered
 as Telegram HTML blockquotes (green bubble), roleplay is italic, and actions are bold.
+
+Responses are tokenised once into typed segments (quote, action, roleplay, code,
+text, emoji) and rendered from those; every regex used on the hot path is compiled
+at module level.
 """
 
 from __future__ import annotations
@@ -11,6 +15,7 @@ from __future__ import annotations
 import html
 import logging
 import re
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 from typing import Any, List, Optional, Union
@@ -22,22 +27,61 @@ from config.settings import (
     MAX_MESSAGE_LENGTH,
     MAX_EMOJI_PER_RESPONSE,
 )
+from utils.emoji import EMOJI_CHAR_CLASS, is_emoji_only, limit_emoji, strip_emoji
 
 logger = logging.getLogger(__name__)
 
 
+# ---------- Compiled patterns ----------
+
+_SAFE_TAG_PATTERNS = [
+    (tag, re.compile(rf"<{tag}(?:\s[^>]*)?>.*?</{tag}>", re.IGNORECASE | re.DOTALL))
+    for tag in ("b", "i", "u", "s", "code", "pre", "blockquote", "a")
+]
+# Zero-width joiners are kept only inside emoji ZWJ sequences such as family emoji
+_INVISIBLE_CHARS_RE = re.compile(
+    r"[\u200b\u200c\u200e\u200f\u202a-\u202e\u2060-\u2069\ufeff]"
+    rf"|(?<!{EMOJI_CHAR_CLASS})\u200d|\u200d(?!{EMOJI_CHAR_CLASS})"
+)
+_PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
+_EXCESS_NEWLINES_RE = re.compile(r"\n{3,}")
+_LEADING_ASTERISKS_RE = re.compile(r"^\*+\s*")
+_TRAILING_ASTERISKS_RE = re.compile(r"\s*\*+$")
+_STRAY_ASTERISKS_RE = re.compile(r"(?<![<>/])\*+(?![<>/])")
+_ACTION_LABEL_RE = re.compile(r"(?i)^\s*action\s*[:\-—]?\s*(.+)$")
+_DOUBLE_QUOTED_RE = re.compile(r'"([^"]*)"')
+_USERNAME_PLACEHOLDER_RE = re.compile(r"\{username(?:-(?:san|kun|chan|sama))?\}", re.IGNORECASE)
+_HTML_OPEN_TAG_RE = re.compile(r"<([a-z]+)[^>]*>")
+_HTML_CLOSE_TAG_RE = re.compile(r"</([a-z]+)[^>]*>")
+_ELLIPSIS_RUN_RE = re.compile(r"[.]{4,}")
+_EXCLAMATION_RUN_RE = re.compile(r"[!]{3,}")
+_QUESTION_RUN_RE = re.compile(r"[?]{3,}")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n\s*\n+")
+_META_HEADER_RE = re.compile(r"(?i)(alya['']?s\s+response|mood\s+actions?|roleplay)\s*:\s*\*?")
+_MOOD_LABEL_RE = re.compile(r"(?i)^(mood|emosi)\s*[:：]\s*(.+)$")
+_ROLEPLAY_ELEMENT_RES = [
+    re.compile(pattern, re.MULTILINE)
+    for pattern in (
+        r"\*[^*]+\*",
+        r"__[^_]+__",
+        r"^>",
+        r"```[\s\S]+?```",
+        r"`[^`]+`",
+        r"(?i)^[\s*_]*\b(action|roleplay|italic)\b\s*[:\-—]?",
+    )
+]
 # ---------- Basic escaping ----------
 
 def escape_html(text: str) -> str:
     """Escape HTML for Telegram, preserving safe formatting tags."""
     if not text:
         return ""
+    if "<" not in text:
+        return html.escape(text)
 
     protected: List[tuple[str, str]] = []
-    safe_tags = ["b", "i", "u", "s", "code", "pre", "blockquote", "a"]
-    for tag in safe_tags:
-        pattern = rf"<{tag}(?:\s[^>]*)?>.*?</{tag}>"
-        for i, match in enumerate(re.findall(pattern, text, re.IGNORECASE | re.DOTALL)):
+    for tag, pattern in _SAFE_TAG_PATTERNS:
+        for i, match in enumerate(pattern.findall(text)):
             placeholder = f"__SAFE_TAG_{tag}_{i}__"
             protected.append((placeholder, match))
             text = text.replace(match, placeholder, 1)
@@ -63,7 +107,7 @@ def format_paragraphs(text: str, use_html: bool = True) -> str:
     if not text:
         return ""
 
-    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text.strip()) if p.strip()]
+    paragraphs = [p.strip() for p in _PARAGRAPH_SPLIT_RE.split(text.strip()) if p.strip()]
     formatted = "\n\n".join(paragraphs)
     return escape_html(formatted) if use_html else escape_markdown_v2(formatted)
 
@@ -72,8 +116,8 @@ def clean_html_entities(text: str) -> str:
     """Clean malformed HTML entities/tags for Telegram HTML mode."""
     if not text:
         return ""
-    text = re.sub(r"<([a-z]+)[^>]*>", lambda m: f"<{m.group(1)}>", text)
-    text = re.sub(r"</([a-z]+)[^>]*>", lambda m: f"</{m.group(1)}>", text)
+    text = _HTML_OPEN_TAG_RE.sub(lambda m: f"<{m.group(1)}>", text)
+    text = _HTML_CLOSE_TAG_RE.sub(lambda m: f"</{m.group(1)}>", text)
     return text
 
 
@@ -90,7 +134,7 @@ def format_markdown_response(
     
     if username:
         safe_username = escape_markdown_v2(username)
-        text = re.sub(r"\{username(?:-(?:san|kun|chan|sama))?\}", safe_username, text, flags=re.IGNORECASE)
+        text = _USERNAME_PLACEHOLDER_RE.sub(lambda _: safe_username, text)
     
     other_subs = {
         "{telegram_username}": telegram_username,
@@ -115,10 +159,10 @@ def _sanitize_response(response: str, username: str) -> str:
         if s.startswith(p):
             s = s[len(p) :].strip()
             break
-    s = re.sub(r"[.]{4,}", "...", s)
-    s = re.sub(r"[!]{3,}", "!!", s)
-    s = re.sub(r"[?]{3,}", "??", s)
-    s = re.sub(r"\n\s*\n\s*\n+", "\n\n", s)
+    s = _ELLIPSIS_RUN_RE.sub("...", s)
+    s = _EXCLAMATION_RUN_RE.sub("!!", s)
+    s = _QUESTION_RUN_RE.sub("??", s)
+    s = _BLANK_LINES_RE.sub("\n\n", s)
     return s.strip()
 
 
@@ -138,9 +182,9 @@ def _preprocess_meta_lines(text: str) -> str:
     out: List[str] = []
     for ln in lines:
         s = ln.strip()
-        if re.fullmatch(r"(?i)(alya['']?s\s+response|mood\s+actions?|roleplay)\s*:\s*\*?", s):
+        if _META_HEADER_RE.fullmatch(s):
             continue
-        m = re.match(r"(?i)^(mood|emosi)\s*[:：]\s*(.+)$", s)
+        m = _MOOD_LABEL_RE.match(s)
         if m:
             content = m.group(2).strip().strip("*").strip()
             out.append(f"__{content}__")
@@ -179,14 +223,14 @@ def format_response(
 
     if username:
         safe_username = escape_html(username) if use_html else escape_markdown_v2(username)
-        message = re.sub(r"\{username(?:-(?:san|kun|chan|sama))?\}", safe_username, message, flags=re.IGNORECASE)
+        message = _USERNAME_PLACEHOLDER_RE.sub(lambda _: safe_username, message)
     
     if target_name and "{target}" in message:
         safe_target = escape_html(target_name) if use_html else escape_markdown_v2(target_name)
         message = message.replace("{target}", safe_target)
 
     formatted = format_persona_response(message, max_paragraphs, use_html, lang)
-    formatted = re.sub(r"\n{3,}", "\n\n", formatted).strip()
+    formatted = _EXCESS_NEWLINES_RE.sub("\n\n", formatted).strip()
 
     if len(formatted) <= MAX_MESSAGE_LENGTH:
         return formatted or fallback
@@ -200,56 +244,43 @@ def format_persona_response(
     max_paragraphs: Optional[int] = 10,
     use_html: bool = True,
     lang: str = DEFAULT_LANGUAGE,
+    split_quotes: bool = False,
 ) -> str:
-    """Render persona response paragraphs with formatting rules."""
+    """Render persona response paragraphs with formatting rules.
+
+    Args:
+        message: Raw persona response
+        max_paragraphs: Keep at most this many paragraphs, counted after
+            quote splitting (None/0 = all)
+        use_html: Render Telegram HTML instead of plain Markdown-ish text
+        lang: Language used for the optional translation map
+        split_quotes: Split paragraphs mixing narration and "dialogue" into
+            separate segments (see _split_mixed_quote_paragraphs)
+    """
     if not message:
         return ""
-    
-    message = message.replace("\\n", "\n")
-    
-    message = re.sub(r'[\u200b-\u200f\u202a-\u202e\u2060-\u2069\ufeff]', '', message)
 
-    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", message.strip()) if p.strip()]
-    if max_paragraphs and max_paragraphs > 0:
-        paragraphs = paragraphs[: max_paragraphs]
-
-    out: List[str] = []
-    for para in paragraphs:
-        rendered = _format_single_paragraph(para, use_html, lang)
-        if rendered:
-            out.append(rendered)
-
-    final_text = "\n\n".join(out)
+    segments = tokenize_response(message, max_paragraphs, split_quotes)
+    final_text = "\n\n".join(filter(None, (render_segment(seg, use_html) for seg in segments)))
     final_text = _limit_emoji_in_text(final_text, max_total=MAX_EMOJI_PER_RESPONSE)
     final_text = translate_response(final_text, lang)
-    
+
     if use_html:
-        final_text = re.sub(r'(?<![<>/])\*+(?![<>/])', '', final_text)
-    
+        final_text = _STRAY_ASTERISKS_RE.sub("", final_text)
+
     return final_text.strip()
 
 
 # ---------- Detection ----------
 
 def _contains_roleplay_elements(message: str) -> bool:
-    patterns = [
-        r"\*[^*]+\*",
-        r"__[^_]+__",
-        r"^>",
-        r"```[\s\S]+?```",
-        r"`[^`]+`",
-        r"(?i)^[\s*_]*\b(action|roleplay|italic)\b\s*[:\-—]?",
-    ]
-    for pat in patterns:
-        if re.search(pat, message, re.MULTILINE):
-            return True
-    return False
+    return any(pattern.search(message) for pattern in _ROLEPLAY_ELEMENT_RES)
 
 
 # ---------- Core formatting helpers ----------
 
 def _split_long_message(message: str, use_html: bool) -> List[str]:
-    paragraphs = re.split(r"\n\s*\n", message)
+    paragraphs = _PARAGRAPH_SPLIT_RE.split(message)
     parts: List[str] = []
     current = ""
     for para in paragraphs:
@@ -313,197 +344,209 @@ def get_translate_prompt(text: str, lang: str = DEFAULT_LANGUAGE) -> str:
     return text if not prompt else prompt.replace("{text}", text)
 
 
-# ---------- Paragraph helpers ----------
+# ---------- Tokenising ----------
 
-def _strip_stray_asterisks(text: str) -> str:
-    """Remove stray asterisks and invisible control characters from text."""
-    if not text:
-        return text
-    
-    text = re.sub(r'[\u200b-\u200f\u202a-\u202e\u2060-\u2069\ufeff]', '', text)
-    text = re.sub(r"^\*+\s*", "", text)
-    text = re.sub(r"\s*\*+$", "", text)
-    
-    return text.strip()
+@dataclass
+class Segment:
+    """One typed piece of a persona response.
 
+    ``text`` is the segment content with its markers removed; ``trailing`` is
+    plain text that followed the closing marker on the same paragraph.
+    """
 
-def _is_roleplay_text(text: str) -> bool:
-    """Check if text is roleplay/descriptive narration."""
-    if not text:
-        return False
-    return text.startswith("__") and "__" in text[2:]
+    kind: str  # "quote", "action", "roleplay", "code", "text" or "emoji"
+    text: str
+    trailing: str = ""
+    block: bool = False  # code only: ``` fenced block instead of inline `code`
 
 
-def _is_blockquote(text: str) -> bool:
-    t = text.strip()
-    return t.startswith(">") or (t.startswith('"') and t.endswith('"'))
+def tokenize_response(
+    message: str,
+    max_paragraphs: Optional[int] = 10,
+    split_quotes: bool = False,
+) -> List[Segment]:
+    """Split a persona response into typed segments in one pass.
 
+    Invisible control characters are removed once for the whole message, then
+    each paragraph is classified a single time.
+    """
+    if not message:
+        return []
 
-def _is_code_block(text: str) -> bool:
-    if not text:
-        return False
-    t = text.strip()
-    if t.startswith("```") and t.endswith("```"):
-        return True
-    if t.startswith("`") and t.endswith("`") and "```" not in t:
-        return True
-    return False
-
-
-def _format_blockquote(text: str, use_html: bool) -> str:
-    if text.startswith(">"):
-        content = text[1:].strip()
-    else:
-        content = text.strip('"').strip("'")
-    return f"<blockquote>{escape_html(content)}</blockquote>" if use_html else f"> {content}"
+    message = _INVISIBLE_CHARS_RE.sub("", message.replace("\\n", "\n"))
+    paragraphs = [p.strip() for p in _PARAGRAPH_SPLIT_RE.split(message.strip()) if p.strip()]
+    if split_quotes:
+        # The limit counts the split pieces, as each becomes its own paragraph
+        paragraphs = [piece for para in paragraphs for piece in _split_quote_paragraph(para)]
+    if max_paragraphs and max_paragraphs > 0:
+        paragraphs = paragraphs[:max_paragraphs]
 
+    segments: List[Segment] = []
+    for para in paragraphs:
+        segment = _classify_paragraph(para.strip())
+        if segment is not None:
+            segments.append(segment)
+    return segments
 
-def _format_action(text: str, use_html: bool) -> str:
-    """Format action text (starting with asterisk) as bold."""
-    if not text:
-        return ""
-    
-    text = text.strip()
-    text = re.sub(r'[\u200b-\u200f\u202a-\u202e\u2060-\u2069\ufeff]', '', text)
-    text = re.sub(r"^\*+\s*", "", text)
-    
-    closing_idx = text.find("*")
-    
-    if closing_idx != -1:
-        content = text[:closing_idx].strip()
-        remainder = text[closing_idx + 1:].strip()
-        remainder = re.sub(r"^\*+\s*", "", remainder)
-    else:
-        content = text.strip("*").strip()
-        remainder = ""
-    
-    if not content:
-        return ""
-    
-    if use_html:
-        result = f"<b>{escape_html(content)}</b>"
-        if remainder:
-            result += f" {escape_html(remainder)}"
-        return result
-    
-    result = f"*{content}*"
-    if remainder:
-        result += f" {remainder}"
-    return result
 
+def _classify_paragraph(para: str) -> Optional[Segment]:
+    """Classify one paragraph (already stripped of invisible characters)."""
+    if not para:
+        return None
 
-def _format_roleplay(text: str, use_html: bool) -> str:
-    """Format roleplay text (contains __ markers anywhere) as italic."""
-    if not text or "__" not in text:
-        return ""
-    
-    text = re.sub(r'[\u200b-\u200f\u202a-\u202e\u2060-\u2069\ufeff]', '', text)
-    
-    stripped = text.strip()
-    if stripped.startswith("__"):
-        closing_idx = stripped.find("__", 2)
-        if closing_idx != -1:
-            content = stripped[2:closing_idx].strip()
-            remainder = stripped[closing_idx + 2:].strip()
-            
-            if use_html:
-                result = f"<i>{escape_html(content)}</i>"
-                if remainder:
-                    result += f" {escape_html(remainder)}"
-                return result
-            
-            result = f"__{content}__"
-            if remainder:
-                result += f" {remainder}"
-            return result
-    
-    clean_text = text.replace("__", "").strip()
-    clean_text = _strip_stray_asterisks(clean_text)
-    return f"<i>{escape_html(clean_text)}</i>" if use_html else f"_{clean_text}_"
+    if "__" in para:
+        return _roleplay_segment(para)
 
+    if para.startswith("*"):
+        remaining = para[1:]
+        close_pos = remaining.find("*")
+        if close_pos == -1:
+            return _action_segment(para)
+        return Segment(
+            "roleplay",
+            _strip_stray_asterisks(remaining[:close_pos].strip()),
+            remaining[close_pos + 1:].strip(),
+        )
+
+    action_match = _ACTION_LABEL_RE.match(para)
+    if action_match:
+        return _action_segment(action_match.group(1).strip())
 
-def _format_code_block(text: str, use_html: bool) -> str:
-    if text.startswith("```") and text.endswith("```"):
-        content = text[3:-3].strip()
-        return f"<pre>{escape_html(content)}</pre>" if use_html else f"```\n{content}\n```"
-    content = text[1:-1].strip()
-    return f"<code>{escape_html(content)}</code>" if use_html else f"`{content}`"
+    if para.startswith("```") and para.endswith("```"):
+        return Segment("code", para[3:-3].strip(), block=True)
+    if para.startswith("`") and para.endswith("`") and "```" not in para:
+        return Segment("code", para[1:-1].strip())
 
+    if para.startswith(">"):
+        return Segment("quote", para[1:].strip())
 
-def _format_normal_text(text: str, use_html: bool) -> str:
-    """Format normal conversation text as blockquote (green bubble)."""
-    text = _strip_stray_asterisks(text)
-    return f"<blockquote>{escape_html(text)}</blockquote>" if use_html else f"> {text}"
+    if para[0] in "\"'" and ('"' in para[1:] or "'" in para[1:]):
+        return Segment("quote", _strip_stray_asterisks(para))
 
+    text = _strip_stray_asterisks(para)
+    if is_emoji_only(text):
+        return Segment("emoji", text)
+    return Segment("text", text)
 
-def _format_single_paragraph(para: str, use_html: bool, lang: str = DEFAULT_LANGUAGE) -> str:
-    """Format a single paragraph based on its content type."""
-    para = (para or "").strip()
-    if not para:
-        return ""
 
-    para = re.sub(r'[\u200b-\u200f\u202a-\u202e\u2060-\u2069\ufeff]', '', para)
+def _roleplay_segment(text: str) -> Segment:
+    """Roleplay narration marked with __double underscores__."""
+    if text.startswith("__"):
+        closing_idx = text.find("__", 2)
+        if closing_idx != -1:
+            return Segment("roleplay", text[2:closing_idx].strip(), text[closing_idx + 2:].strip())
+    return Segment("roleplay", _strip_stray_asterisks(text.replace("__", "").strip()))
 
-    if "__" in para:
-        return _format_roleplay(para, use_html)
 
-    if para.lstrip().startswith("*"):
-        stripped_start = para.lstrip()
-        first_ast_pos = len(para) - len(stripped_start)
-        remaining = stripped_start[1:]
-        
-        close_pos = remaining.find("*")
-        if close_pos != -1:
-            clean_text = remaining[:close_pos].strip()
-            trailing = remaining[close_pos + 1:].strip()
-            clean_text = _strip_stray_asterisks(clean_text)
-            content = escape_html(clean_text) if use_html else clean_text
-            result = f"<i>{content}</i>" if use_html else f"_{content}_"
-            if trailing:
-                result += f" {trailing}"
-            return result
-        else:
-            return _format_action(para, use_html)
+def _action_segment(text: str) -> Optional[Segment]:
+    """Action text (leading asterisk or "Action:" label), rendered bold."""
+    text = _LEADING_ASTERISKS_RE.sub("", text.strip())
+    closing_idx = text.find("*")
+    if closing_idx != -1:
+        content = text[:closing_idx].strip()
+        remainder = _LEADING_ASTERISKS_RE.sub("", text[closing_idx + 1:].strip())
+    else:
+        content = text.strip("*").strip()
+        remainder = ""
+    if not content:
+        return None
+    return Segment("action", content, remainder)
 
-    action_match = re.match(r"(?i)^\s*action\s*[:\-—]?\s*(.+)$", para)
-    if action_match:
-        return _format_action(action_match.group(1).strip(), use_html)
 
-    if _is_code_block(para):
-        return _format_code_block(para, use_html)
+def _strip_stray_asterisks(text: str) -> str:
+    """Remove leading/trailing stray asterisks from text."""
+    if not text:
+        return text
+    text = _LEADING_ASTERISKS_RE.sub("", text)
+    text = _TRAILING_ASTERISKS_RE.sub("", text)
+    return text.strip()
 
-    if para.startswith(">"):
-        return _format_blockquote(para, use_html)
 
-    stripped = para.strip()
-    has_opening_quote = stripped.startswith('"') or stripped.startswith("'")
-    has_closing_quote = '"' in stripped[1:] or "'" in stripped[1:]
-    
-    if has_opening_quote and has_closing_quote:
-        content = _strip_stray_asterisks(para)
-        return f"<blockquote>{escape_html(content)}</blockquote>" if use_html else f"> {content}"
+# ---------- Quote splitting ----------
+
+def _split_quote_paragraph(para: str) -> List[str]:
+    """Split a paragraph mixing narration and "dialogue" into separate pieces.
+
+    Quoted dialogue becomes its own ``"..."`` piece, narration between quotes
+    stays plain, and emoji in the trailing narration are moved to the end of
+    the last piece.
+    """
+    if '"' not in para:
+        return [para]
+    if para.startswith('"') and para.endswith('"') and para.count('"') == 2:
+        return [para]
+
+    parts: List[List[str]] = []  # [kind, text]
+    pos = 0
+    for match in _DOUBLE_QUOTED_RE.finditer(para):
+        narration = para[pos:match.start()].strip().rstrip(",").strip()
+        if narration:
+            parts.append(["narration", narration])
+        quote_text = match.group(1).strip()
+        if quote_text:
+            parts.append(["quote", quote_text])
+        pos = match.end()
+
+    remaining = para[pos:].strip()
+    if remaining:
+        narration, emoji_str = strip_emoji(remaining)
+        narration = narration.strip().rstrip(",").strip()
+        emoji_str = emoji_str.strip()
+        if narration:
+            parts.append(["narration", narration])
+        if emoji_str:
+            if parts:
+                parts[-1][1] = f"{parts[-1][1]} {emoji_str}"
+            else:
+                parts.append(["narration", emoji_str])
+
+    return [f'"{text}"' if kind == "quote" else text for kind, text in parts]
+
+
+def _split_mixed_quote_paragraphs(response: str) -> str:
+    """Split every paragraph that mixes narration and quoted dialogue.
+
+    Args:
+        response: Raw response text from Gemini
+
+    Returns:
+        Response with quotes separated into their own paragraphs
+    """
+    if not response:
+        return response
+    pieces: List[str] = []
+    for para in response.split("\n\n"):
+        para = para.strip()
+        if para:
+            pieces.extend(_split_quote_paragraph(para))
+    return "\n\n".join(pieces)
+
+
+# ---------- Rendering ----------
+
+def render_segment(segment: Segment, use_html: bool = True) -> str:
+    """Render one segment as Telegram HTML (or plain Markdown-ish text)."""
+    kind, text, trailing = segment.kind, segment.text, segment.trailing
+
+    if kind == "roleplay":
+        body = f"<i>{escape_html(text)}</i>" if use_html else f"_{text}_"
+    elif kind == "action":
+        body = f"<b>{escape_html(text)}</b>" if use_html else f"*{text}*"
+    elif kind == "code":
+        if segment.block:
+            return f"<pre>{escape_html(text)}</pre>" if use_html else f"```\n{text}\n```"
+        return f"<code>{escape_html(text)}</code>" if use_html else f"`{text}`"
+    else:
+        # quote, text and emoji all render as a conversation bubble
+        return f"<blockquote>{escape_html(text)}</blockquote>" if use_html else f"> {text}"
 
-    return _format_normal_text(para, use_html)
+    if trailing:
+        body += f" {escape_html(trailing)}" if use_html else f" {trailing}"
+    return body
 
 
 # ---------- Emoji limiter ----------
 
 def _limit_emoji_in_text(text: str, max_total: int = 15) -> str:
-    pattern = re.compile(
-        r"[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF"
-        r"\U0001F1E0-\U0001F1FF\U0001F900-\U0001F9FF]+",
-        flags=re.UNICODE,
-    )
-    emojis = pattern.findall(text)
-    if len(emojis) <= max_total:
-        return text
-
-    count = 0
-    def _keep(match: re.Match) -> str:
-        nonlocal count
-        if count < max_total:
-            count += 1
-            return match.group(0)
-        return ""
-
-    return pattern.sub(_keep, text)
\ No newline at end of file
+    """Keep at most ``max_total`` emoji runs ("😂😂😂" counts once)."""
+    return limit_emoji(text, max_total, runs=True)
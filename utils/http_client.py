@@ -0,0 +1,83 @@
+"""
+Shared outbound HTTP sessions for Alya Bot integrations.
+
+Every integration (Google CSE, SauceNAO, GitHub, the TTS service, Google
+Translate) gets a named aiohttp session with its own timeout. All sessions
+sit on one keep-alive connector with DNS caching and per-host connection
+limits, so calls reuse warm TCP/TLS connections instead of paying a fresh
+handshake each time. The registry is started in the application's
+post_init and closed on shutdown.
+"""
+import logging
+from typing import Dict, Optional
+
+import aiohttp
+
+from config.settings import (
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_LIMIT_PER_HOST,
+    HTTP_POOL_LIMIT,
+    HTTP_TIMEOUTS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClientRegistry:
+    """Application-lifetime registry of pooled aiohttp sessions."""
+
+    def __init__(self) -> None:
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+
+    async def start(self) -> None:
+        """Create the shared connector (must run inside the event loop)."""
+        self._get_connector()
+        logger.info(
+            f"HTTP client pool ready (limit={HTTP_POOL_LIMIT}, per_host={HTTP_LIMIT_PER_HOST}, "
+            f"dns_ttl={HTTP_DNS_CACHE_TTL}s)"
+        )
+
+    def _get_connector(self) -> aiohttp.TCPConnector:
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_LIMIT_PER_HOST,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            )
+            self._sessions.clear()
+        return self._connector
+
+    def get(self, name: str) -> aiohttp.ClientSession:
+        """Return the pooled session for an integration, creating it on first use.
+
+        Args:
+            name: Integration name, used to pick the timeout from HTTP_TIMEOUTS
+        """
+        connector = self._get_connector()
+        session = self._sessions.get(name)
+        if session is None or session.closed:
+            timeout = HTTP_TIMEOUTS.get(name, HTTP_TIMEOUTS["default"])
+            session = aiohttp.ClientSession(
+                connector=connector,
+                connector_owner=False,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            )
+            self._sessions[name] = session
+        return session
+
+    async def close(self) -> None:
+        """Close every session and the shared connector."""
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+        self._sessions.clear()
+        if self._connector is not None and not self._connector.closed:
+            await self._connector.close()
+        self._connector = None
+        logger.info("HTTP client pool closed")
+
+
+http_clients = HTTPClientRegistry()
@@ -0,0 +1,114 @@
+"""
+Perceptual image hashing for Alya Bot.
+
+A difference hash (dHash) reduces an image to 64 bits that stay nearly the
+same across re-compression, resizing and small edits, so near-duplicate
+images can be matched by Hamming distance. ``HammingIndex`` finds stored
+hashes within a small distance without scanning every entry.
+"""
+import io
+from typing import BinaryIO, Dict, List, Optional, Set, Tuple, Union
+
+from PIL import Image
+
+HASH_BITS = 64
+_BAND_BITS = 8
+_BANDS = HASH_BITS // _BAND_BITS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+ImageSource = Union[str, bytes, bytearray, BinaryIO]
+
+
+def dhash(image: ImageSource, hash_size: int = 8) -> int:
+    """Compute the difference hash of an image.
+
+    Args:
+        image: File path, raw bytes or a binary file object
+        hash_size: Hash side length; 8 gives a 64-bit hash
+
+    Returns:
+        Hash as an unsigned integer
+    """
+    if isinstance(image, (bytes, bytearray)):
+        image = io.BytesIO(image)
+    with Image.open(image) as img:
+        img.draft("L", (hash_size * 4, hash_size * 4))  # cheap JPEG downscale while decoding
+        pixels = list(img.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS).getdata())
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+class HammingIndex:
+    """Set of 64-bit hashes searchable by Hamming distance.
+
+    Each hash is split into eight 8-bit bands. Two hashes within distance
+    ``d <= 7`` must agree exactly on at least one band (pigeonhole), so a
+    lookup only compares against hashes sharing a band with the query.
+    """
+
+    MAX_DISTANCE = _BANDS - 1
+
+    def __init__(self) -> None:
+        self._bands: List[Dict[int, Set[int]]] = [{} for _ in range(_BANDS)]
+        self._hashes: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, value: int) -> bool:
+        return value in self._hashes
+
+    @staticmethod
+    def _band_values(value: int):
+        for band in range(_BANDS):
+            yield band, (value >> (band * _BAND_BITS)) & _BAND_MASK
+
+    def add(self, value: int) -> None:
+        if value in self._hashes:
+            return
+        self._hashes.add(value)
+        for band, key in self._band_values(value):
+            self._bands[band].setdefault(key, set()).add(value)
+
+    def remove(self, value: int) -> None:
+        if value not in self._hashes:
+            return
+        self._hashes.discard(value)
+        for band, key in self._band_values(value):
+            bucket = self._bands[band].get(key)
+            if bucket is not None:
+                bucket.discard(value)
+                if not bucket:
+                    del self._bands[band][key]
+
+    def clear(self) -> None:
+        self._hashes.clear()
+        for band in self._bands:
+            band.clear()
+
+    def nearest(self, value: int, max_distance: int) -> Optional[Tuple[int, int]]:
+        """Return (hash, distance) of the closest stored hash within ``max_distance``."""
+        if value in self._hashes:
+            return value, 0
+        max_distance = min(max_distance, self.MAX_DISTANCE)
+        best: Optional[Tuple[int, int]] = None
+        seen: Set[int] = set()
+        for band, key in self._band_values(value):
+            for candidate in self._bands[band].get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = hamming_distance(value, candidate)
+                if distance <= max_distance and (best is None or distance < best[1]):
+                    best = (candidate, distance)
+        return best
@@ -0,0 +1,175 @@
+"""
+Image preprocessing before uploads to Gemini and SauceNAO.
+
+Telegram sends each photo in several sizes; ``pick_photo_size`` takes the
+smallest one that still covers the edge a task needs, so less is downloaded.
+``prepare_image`` then shrinks the image to a max edge (using JPEG
+``draft()`` so large photos are decoded at reduced scale), applies and
+strips EXIF, and re-encodes to compact JPEG or WebP. Decoding runs in a
+small dedicated thread pool.
+
+Payload sizes, preprocessing time and request latency per target are kept
+in ``image_stats`` for /spek. Latency covers the whole request, including
+the service's own processing (model generation for Gemini), not just the
+upload.
+"""
+import asyncio
+import io
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+from PIL import Image, ImageOps
+
+from config.settings import IMAGE_PREP_FORMAT, IMAGE_PREP_QUALITY, IMAGE_PREP_WORKERS
+
+logger = logging.getLogger(__name__)
+
+_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+_EXTENSIONS = {"image/jpeg": "jpg", "image/webp": "webp"}
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+@dataclass
+class PreparedImage:
+    """Re-encoded image ready for upload."""
+
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+    original_size: int
+
+    @property
+    def filename(self) -> str:
+        return f"image.{_EXTENSIONS[self.mime_type]}"
+
+    def as_gemini_part(self) -> Dict[str, Any]:
+        """Inline blob part for google.generativeai content lists."""
+        return {"mime_type": self.mime_type, "data": self.data}
+
+
+class ImagePrepStats:
+    """Counters for preprocessing savings and request latency per target."""
+
+    def __init__(self) -> None:
+        self.prepared = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.prep_seconds = 0.0
+        self.requests: Dict[str, Dict[str, float]] = {}
+
+    def record_prepare(self, bytes_in: int, bytes_out: int, seconds: float) -> None:
+        self.prepared += 1
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.prep_seconds += seconds
+
+    def record_request(self, target: str, payload_bytes: int, seconds: float) -> None:
+        """Record one request carrying ``payload_bytes`` to ``target`` and its full latency."""
+        entry = self.requests.setdefault(target, {"count": 0, "bytes": 0, "seconds": 0.0})
+        entry["count"] += 1
+        entry["bytes"] += payload_bytes
+        entry["seconds"] += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "prepared": self.prepared,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "saved_ratio": round(1 - self.bytes_out / self.bytes_in, 3) if self.bytes_in else 0.0,
+            "avg_prep_ms": round(1000 * self.prep_seconds / self.prepared) if self.prepared else 0,
+            "requests": {
+                target: {
+                    "count": int(entry["count"]),
+                    "avg_kb": round(entry["bytes"] / entry["count"] / 1024, 1),
+                    "avg_ms": round(1000 * entry["seconds"] / entry["count"]),
+                }
+                for target, entry in self.requests.items()
+            },
+        }
+
+
+image_stats = ImagePrepStats()
+
+
+def pick_photo_size(photo_sizes: Sequence[Any], min_edge: int) -> Any:
+    """Pick the smallest Telegram PhotoSize whose longer edge is at least ``min_edge``.
+
+    Falls back to the largest size when none is big enough.
+    """
+    by_edge = sorted(photo_sizes, key=lambda size: max(size.width, size.height))
+    for size in by_edge:
+        if max(size.width, size.height) >= min_edge:
+            return size
+    return by_edge[-1]
+
+
+def prepare_image(
+    data: bytes,
+    max_edge: int,
+    fmt: str = IMAGE_PREP_FORMAT,
+    quality: int = IMAGE_PREP_QUALITY,
+) -> PreparedImage:
+    """Downscale to ``max_edge``, strip metadata and re-encode (blocking).
+
+    The original bytes are kept when they are already small enough, carry no
+    EXIF and re-encoding would not make them smaller.
+
+    Raises:
+        ValueError: If the data is not a readable image
+    """
+    fmt = fmt.upper() if fmt.upper() in _MIME_TYPES else "JPEG"
+    start = time.perf_counter()
+    try:
+        image = Image.open(io.BytesIO(data))
+        source_format = image.format
+        # JPEG only: let the decoder scale down by 1/2..1/8 before full decode
+        image.draft("RGB", (max_edge, max_edge))
+        had_exif = bool(image.info.get("exif")) or bool(image.getexif())
+        image = ImageOps.exif_transpose(image)
+        original_edge = max(image.size)
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Invalid or unsupported image: {e}") from e
+
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        if fmt == "JPEG":
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, quality=quality, optimize=True)
+    output = buffer.getvalue()
+
+    resized = max(image.size) < original_edge
+    if not resized and not had_exif and source_format == fmt and len(output) >= len(data):
+        output = data
+
+    elapsed = time.perf_counter() - start
+    image_stats.record_prepare(len(data), len(output), elapsed)
+    logger.debug(
+        f"Prepared image {original_edge}px/{len(data)} B -> {max(image.size)}px/{len(output)} B "
+        f"{fmt} in {elapsed * 1000:.0f} ms"
+    )
+    return PreparedImage(output, _MIME_TYPES[fmt], image.width, image.height, len(data))
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=IMAGE_PREP_WORKERS, thread_name_prefix="image-prep")
+    return _executor
+
+
+async def prepare_image_async(data: bytes, max_edge: int, **kwargs: Any) -> PreparedImage:
+    """Run ``prepare_image`` in the preprocessing thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), lambda: prepare_image(bytes(data), max_edge, **kwargs))
@@ -1,16 +1,85 @@
 """
 Language translation utilities for voice responses.
+
+Dialogue is translated with the public Google Translate endpoint over the
+shared aiohttp pool. Results are cached by (source, target, text hash)
+because TTS often retranslates the same lines. Long texts are split at
+sentence boundaries to stay under the endpoint's URL limit and the chunks
+are translated concurrently. Gemini is only used when the endpoint fails.
 """
+import asyncio
+import hashlib
 import logging
 import re
-from typing import Optional
+from typing import Any, List, Optional
+from urllib.parse import quote
+
+from config.settings import TRANSLATE_CACHE_SIZE, TRANSLATE_CACHE_TTL, TRANSLATE_MAX_QUERY_CHARS
+from utils.cache import TTLCache
+from utils.http_client import http_clients
 
 logger = logging.getLogger(__name__)
 
+GOOGLE_TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+
+# Google Translate uses 'ja' for Japanese, not 'jp'
+_LANG_MAP = {"jp": "ja"}
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?\u3002\uff01\uff1f])\s+")
+
+
+def _encoded_length(text: str) -> int:
+    return len(quote(text, safe=""))
+
+
+def split_for_translation(text: str, max_chars: int = TRANSLATE_MAX_QUERY_CHARS) -> List[str]:
+    """Split text into chunks whose URL-encoded length fits ``max_chars``.
+
+    Sentences are packed greedily; a sentence that is too long on its own is
+    split on whitespace, and a single oversized word is cut by characters.
+    """
+    if _encoded_length(text) <= max_chars:
+        return [text]
+
+    pieces: List[str] = []
+    for sentence in _SENTENCE_SPLIT_RE.split(text):
+        if _encoded_length(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        for word in sentence.split():
+            while _encoded_length(word) > max_chars:
+                cut = max_chars
+                while _encoded_length(word[:cut]) > max_chars:
+                    cut //= 2
+                pieces.append(word[:cut])
+                word = word[cut:]
+            pieces.append(word)
+
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        candidate = f"{current} {piece}" if current else piece
+        if current and _encoded_length(candidate) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
 
 class LanguageTranslator:
     """Translator for converting responses to different languages."""
 
+    def __init__(self) -> None:
+        self._cache = TTLCache(maxsize=TRANSLATE_CACHE_SIZE, ttl=TRANSLATE_CACHE_TTL)
+        self._fallback_client: Any = None
+
+    def set_fallback_client(self, gemini_client: Any) -> None:
+        """Sets the GeminiClient used when Google Translate fails."""
+        self._fallback_client = gemini_client
+
     def extract_dialogue(self, text: str) -> str:
         """Extract dialogue from text, removing roleplay action markers."""
         text = re.sub(r'[*_]{1,3}.*?[*_]{1,3}', '', text).strip()
@@ -26,34 +95,52 @@ class LanguageTranslator:
 
         return text
 
+    async def _google_translate(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        """Translate one chunk with the Google Translate endpoint."""
+        params = {"client": "gtx", "sl": source_lang, "tl": target_lang, "dt": "t", "q": text}
+        try:
+            session = http_clients.get("translate")
+            async with session.get(GOOGLE_TRANSLATE_URL, params=params) as response:
+                if response.status != 200:
+                    logger.warning(f"⚠️ Translate endpoint returned {response.status}")
+                    return None
+                data = await response.json(content_type=None)
+        except Exception as e:
+            logger.warning(f"⚠️ Translation error: {e}")
+            return None
+
+        if data and isinstance(data, list) and data[0]:
+            return "".join(s[0] for s in data[0] if s[0])
+        return None
+
     async def translate_text(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
-        """Translate text using Google Translate API."""
+        """Translate text using Google Translate API, falling back to Gemini."""
         if not text or source_lang == target_lang:
             return text
 
-        try:
-            import requests
-            import urllib.parse
-
-            # Google Translate uses 'ja' for Japanese, not 'jp'
-            lang_map = {"jp": "ja"}
-            sl = lang_map.get(source_lang, source_lang)
-            tl = lang_map.get(target_lang, target_lang)
-
-            url = (
-                f"https://translate.googleapis.com/translate_a/single"
-                f"?client=gtx&sl={sl}&tl={tl}&dt=t"
-                f"&q={urllib.parse.quote(text)}"
-            )
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data and isinstance(data, list) and data[0]:
-                    return "".join(s[0] for s in data[0] if s[0])
-        except Exception as e:
-            logger.warning(f"⚠️ Translation error: {e}")
+        sl = _LANG_MAP.get(source_lang, source_lang)
+        tl = _LANG_MAP.get(target_lang, target_lang)
+        cache_key = (sl, tl, hashlib.sha1(text.encode("utf-8")).hexdigest())
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        chunks = split_for_translation(text)
+        results = await asyncio.gather(*(self._google_translate(chunk, sl, tl) for chunk in chunks))
+
+        if all(results):
+            translated = " ".join(r.strip() for r in results)
+        elif self._fallback_client is not None:
+            logger.info("Google Translate failed, falling back to Gemini")
+            translated = await self._fallback_client.translate_text(text, source_lang, target_lang)
+        else:
+            translated = None
+
+        if not translated:
+            return text
 
-        return text
+        self._cache.set(cache_key, translated)
+        return translated
 
 
 _translator: Optional[LanguageTranslator] = None
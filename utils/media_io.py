@@ -0,0 +1,66 @@
+"""
+In-memory download helpers for Telegram media.
+
+Photos are fetched with ``download_as_bytearray`` and handed to SauceNAO as
+bytes, so the common path never touches the disk. Files larger than
+MEDIA_SPILL_TO_DISK_BYTES (opt-in, 0 disables it) are written to a temporary
+file instead, to keep memory bounded on small hosts. Voice notes go through
+the streaming decoder in utils/audio_stream.py instead.
+"""
+import io
+import logging
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, BinaryIO, Optional, Union
+
+from config.settings import MEDIA_SPILL_TO_DISK_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MediaPayload:
+    """Downloaded media, held either as bytes or as a temporary file path."""
+
+    data: Optional[bytes] = None
+    path: Optional[str] = None
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """Bytes when held in memory, otherwise the spill file path."""
+        return self.data if self.data is not None else self.path
+
+    def open(self) -> BinaryIO:
+        """Return a readable binary stream over the media."""
+        if self.data is not None:
+            return io.BytesIO(self.data)
+        return open(self.path, "rb")
+
+
+@asynccontextmanager
+async def fetch_media(tg_file: Any, suffix: str = "") -> AsyncIterator[MediaPayload]:
+    """Download a Telegram ``File`` into memory, spilling very large files to disk.
+
+    Args:
+        tg_file: telegram.File returned by ``get_file()``
+        suffix: Extension for the spill file (e.g. ".ogg")
+    """
+    file_size = getattr(tg_file, "file_size", None) or 0
+    if MEDIA_SPILL_TO_DISK_BYTES and file_size > MEDIA_SPILL_TO_DISK_BYTES:
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        try:
+            logger.debug(f"Spilling {file_size} byte media to {path}")
+            await tg_file.download_to_drive(path)
+            yield MediaPayload(path=path)
+        finally:
+            try:
+                os.unlink(path)
+            except OSError as e:
+                logger.warning(f"Failed to delete {path}: {e}")
+        return
+
+    data = await tg_file.download_as_bytearray()
+    yield MediaPayload(data=bytes(data))
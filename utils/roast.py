@@ -19,11 +19,11 @@ from utils.formatters import escape_markdown_v2
 from core.persona import PersonaManager
 from database.database_manager import db_manager, get_user_lang, DatabaseManager
 from handlers.response.roast import get_roast_response, get_usage_response
+from utils.http_client import http_clients
 
 # Need to import time here for rate limiter
 import time
 import yaml
-import aiohttp
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -277,25 +277,25 @@ class RoastHandler:
         url = f"https://api.github.com/users/{username}"
         events_url = f"https://api.github.com/users/{username}/events/public"
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                # Fetch user profile
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        logger.warning(f"GitHub API returned {response.status} for user {username}")
-                        return None
-                    user_data = await response.json()
+        session = http_clients.get("github")
+        try:
+            # Fetch user profile
+            async with session.get(url) as response:
+                if response.status != 200:
+                    logger.warning(f"GitHub API returned {response.status} for user {username}")
+                    return None
+                user_data = await response.json()
 
-                # Fetch recent activity
-                async with session.get(events_url) as response:
-                    if response.status == 200:
-                        events = await response.json()
-                        # Get the type of the most recent event
-                        user_data["recent_activity"] = events[0]["type"] if events else "None"
-                    else:
-                        user_data["recent_activity"] = "Could not fetch"
-                
-                return user_data
-            except Exception as e:
-                logger.error(f"Failed to fetch GitHub data for {username}: {e}")
-                return None
\ No newline at end of file
+            # Fetch recent activity
+            async with session.get(events_url) as response:
+                if response.status == 200:
+                    events = await response.json()
+                    # Get the type of the most recent event
+                    user_data["recent_activity"] = events[0]["type"] if events else "None"
+                else:
+                    user_data["recent_activity"] = "Could not fetch"
+            
+            return user_data
+        except Exception as e:
+            logger.error(f"Failed to fetch GitHub data for {username}: {e}")
+            return None
\ No newline at end of file
@@ -5,10 +5,14 @@ Detects when Alya uses Russian (Cyrillic) expressions in emotional moments
 and provides translations to users.
 """
 
+import json
 import logging
+import os
 import re
-from config.settings import DEFAULT_LANGUAGE
-from typing import Dict, List, Optional
+from datetime import datetime
+from pathlib import Path
+from config.settings import DEFAULT_LANGUAGE, RUSSIAN_LEARNED_TRANSLATIONS_PATH
+from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -92,7 +96,134 @@ EMOTION_PRIORITY_EXPRESSIONS: set = {
 }
 
 
-def detect_russian_expressions(text: str) -> List[str]:
+_DIACRITIC_CHARS = "àáâãäåèéêëìíîïòóôõöùúûüýÿžčščđ"
+
+# Longest variants first so "bozhe" wins over "boz" inside the alternation
+_LATIN_VARIANT_ALTERNATION = "|".join(
+    re.escape(variant) for variant in sorted(RUSSIAN_LATIN_VARIANTS, key=len, reverse=True)
+)
+
+_CYRILLIC_RE = re.compile(r'[а-яёА-ЯЁ]')
+
+# One tokenisation pass yields every kind of hit: Cyrillic words, Latin words
+# carrying a diacritic and whole-word Latin variants of Russian expressions
+_RUSSIAN_TOKEN_RE = re.compile(
+    rf'(?P<cyrillic>[а-яёА-ЯЁ]+)'
+    rf'|(?P<diacritic>\b[a-zA-Z]*[{_DIACRITIC_CHARS}][a-zA-Z]*\b)'
+    rf'|(?P<variant>\b(?:{_LATIN_VARIANT_ALTERNATION})\b)',
+    re.IGNORECASE,
+)
+
+_RUSSIAN_HINT_RE = re.compile(
+    rf'[а-яёА-ЯЁ{_DIACRITIC_CHARS}]|\b(?:{_LATIN_VARIANT_ALTERNATION})\b',
+    re.IGNORECASE,
+)
+
+_DIACRITIC_TRANSLATION = str.maketrans({
+    'é': 'e', 'è': 'e', 'ê': 'e',
+    'ä': 'a', 'ö': 'o', 'ü': 'u',
+    'ž': 'z', 'č': 'c', 'š': 's', 'ć': 'c', 'đ': 'd',
+    'à': 'a', 'ù': 'u', 'ì': 'i',
+    'ý': 'y',
+})
+
+
+class LearnedTranslations:
+    """Dictionary of AI-produced translations persisted to a JSON file.
+
+    Words missing from RUSSIAN_TRANSLATIONS are translated by Gemini once and
+    remembered here, so later responses reuse the answer instead of paying
+    for another LLM round-trip. The file is loaded into memory on startup and
+    rewritten atomically whenever new words are learned.
+    """
+
+    MAX_TRANSLATION_LENGTH = 120
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._entries = {
+                word: entry for word, entry in data.items()
+                if isinstance(entry, dict) and entry.get("translation")
+            }
+            logger.info(f"Loaded {len(self._entries)} learned Russian translations")
+        except Exception as e:
+            logger.warning(f"Could not load learned translations from {self.path}: {e}")
+
+    def save(self) -> None:
+        """Write the dictionary to disk (tmp file + rename, never half-written)."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp_path.write_text(
+                json.dumps(self._entries, ensure_ascii=False, indent=2, sort_keys=True),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Could not save learned translations to {self.path}: {e}")
+
+    def get(self, word: str) -> Optional[str]:
+        """Return the learned translation for ``word`` and count the lookup."""
+        entry = self._entries.get(word.lower())
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["translation"]
+
+    def add_many(self, translations: Dict[str, str], source: str = "ai") -> int:
+        """Learn Cyrillic word -> translation pairs and persist them.
+
+        Returns:
+            Number of entries that were added or changed
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        changed = 0
+        for word, translation in translations.items():
+            word = word.strip().lower()
+            translation = translation.strip()
+            if not word or not _CYRILLIC_RE.search(word):
+                continue
+            if not translation or len(translation) > self.MAX_TRANSLATION_LENGTH:
+                continue
+            current = self._entries.get(word)
+            if current and current["translation"] == translation:
+                continue
+            self._entries[word] = {"translation": translation, "source": source, "updated_at": now}
+            changed += 1
+        if changed:
+            self.save()
+        return changed
+
+    def entries(self) -> Dict[str, Dict[str, str]]:
+        """Return a copy of all learned entries (word -> metadata)."""
+        return {word: dict(entry) for word, entry in self._entries.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return dictionary size and lookup hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+learned_translations = LearnedTranslations(RUSSIAN_LEARNED_TRANSLATIONS_PATH)
+
+
+def detect_russian_expressions(text: str, include_unknown: bool = False) -> List[str]:
     """Detect and extract Russian (Cyrillic) words from text.
     
     Only returns actual Cyrillic words. Latin variants like "baka" are excluded
@@ -100,6 +231,8 @@ def detect_russian_expressions(text: str) -> List[str]:
     
     Args:
         text: Text to analyze
+        include_unknown: Also return Cyrillic words missing from the static
+            dictionaries (for lookup in ``learned_translations``)
         
     Returns:
         List of unique Russian (Cyrillic) words found
@@ -107,46 +240,33 @@ def detect_russian_expressions(text: str) -> List[str]:
     if not text:
         return []
     
-    has_cyrillic = bool(re.search(r'[а-яёА-ЯЁ]', text))
-    
     detected_set = set()
+    latin_hits = set()
+    
+    for match in _RUSSIAN_TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        word = match.group().lower()
+        if kind == "cyrillic":
+            detected_set.add(word)
+        elif kind == "diacritic":
+            normalized = normalize_russian_variant(word)
+            canonical = RUSSIAN_LATIN_VARIANTS.get(normalized) or RUSSIAN_LATIN_VARIANTS.get(word)
+            if canonical:
+                latin_hits.add(canonical.lower())
+        else:
+            latin_hits.add(RUSSIAN_LATIN_VARIANTS[word].lower())
     
-    cyrillic_pattern = r'[а-яёА-ЯЁ]+'
-    cyrillic_matches = re.findall(cyrillic_pattern, text, re.UNICODE)
-    
-    if cyrillic_matches:
-        for match in cyrillic_matches:
-            detected_set.add(match.lower())
-
-    if has_cyrillic:
-        diacritic_pattern = r'\b[a-zA-Z]*[àáâãäåèéêëìíîïòóôõöùúûüýÿžžčščđ][a-zA-Z]*\b'
-        diacritic_matches = re.findall(diacritic_pattern, text, re.UNICODE)
-        
-        if diacritic_matches:
-            for match in diacritic_matches:
-                match_lower = match.lower()
-                normalized = normalize_russian_variant(match_lower)
-                
-                if normalized in RUSSIAN_LATIN_VARIANTS:
-                    canonical = RUSSIAN_LATIN_VARIANTS[normalized].lower()
-                    detected_set.add(canonical)
-                elif match_lower in RUSSIAN_LATIN_VARIANTS:
-                    canonical = RUSSIAN_LATIN_VARIANTS[match_lower].lower()
-                    detected_set.add(canonical)
-        
-        text_lower = text.lower()
-        for variant, canonical in RUSSIAN_LATIN_VARIANTS.items():
-            # Only check Latin variants if Cyrillic is present
-            pattern = rf'\b{re.escape(variant)}\b'
-            if re.search(pattern, text_lower):
-                detected_set.add(canonical.lower())
+    # Latin spellings only count when the response is already in Russian mood
+    if detected_set:
+        detected_set |= latin_hits
     
     filtered_words = [
         w for w in detected_set
-        if w in EMOTION_PRIORITY_EXPRESSIONS or (w in RUSSIAN_TRANSLATIONS and w not in RUSSIAN_STOPWORDS)
+        if w in EMOTION_PRIORITY_EXPRESSIONS
+        or (w not in RUSSIAN_STOPWORDS and (w in RUSSIAN_TRANSLATIONS or (include_unknown and len(w) > 2)))
     ]
     
-    return sorted(list(filtered_words))
+    return sorted(filtered_words)
 
 
 def has_russian_expressions(text: str) -> bool:
@@ -160,20 +280,7 @@ def has_russian_expressions(text: str) -> bool:
     """
     if not text:
         return False
-
-    if re.search(r'[а-яёА-ЯЁ]', text):
-        return True
-    
-    if re.search(r'[àáâãäåèéêëìíîïòóôõöùúûüýÿžčščđ]', text, re.UNICODE):
-        return True
-    
-    text_lower = text.lower()
-    for variant in RUSSIAN_LATIN_VARIANTS.keys():
-        pattern = rf'\b{re.escape(variant)}\b'
-        if re.search(pattern, text_lower):
-            return True
-    
-    return False
+    return _RUSSIAN_HINT_RE.search(text) is not None
 
 
 def get_russian_translations_for_words(
@@ -272,6 +379,10 @@ def get_translation_for_word(word: str) -> str:
         if canonical in RUSSIAN_TRANSLATIONS:
             return RUSSIAN_TRANSLATIONS[canonical]
     
+    learned = learned_translations.get(word_lower)
+    if learned:
+        return learned
+    
     romanized = romanize_russian_word(word)
     if romanized and romanized != word:
         return f"{romanized} (romanized)"
@@ -300,6 +411,10 @@ async def get_translation_for_word_with_ai(
     if word_lower in RUSSIAN_TRANSLATIONS:
         return RUSSIAN_TRANSLATIONS[word_lower]
     
+    learned = learned_translations.get(word_lower)
+    if learned:
+        return learned
+    
     if gemini_client:
         try:
             prompt = f"""Translate this Russian word to English with brief meaning:
@@ -323,6 +438,7 @@ Keep it short and simple."""
             )
             
             if translation and translation.strip():
+                learned_translations.add_many({word_lower: translation.strip()})
                 return translation.strip()
         except Exception as e:
             logger.debug(f"AI translation failed for '{word}': {e}")
@@ -396,7 +512,7 @@ async def format_russian_translation_block_with_ai(
     header = headers.get(lang, headers["en"])
     
     unique_words = sorted(set(russian_words))
-    unique_words = [w for w in unique_words if w and re.search(r'[а-яёА-ЯЁ]', w)]
+    unique_words = [w for w in unique_words if w and _CYRILLIC_RE.search(w)]
     
     if not unique_words:
         return ""
@@ -408,6 +524,10 @@ async def format_russian_translation_block_with_ai(
         word_lower = word.lower()
         if word_lower in RUSSIAN_TRANSLATIONS:
             known_translations[word] = RUSSIAN_TRANSLATIONS[word_lower]
+            continue
+        learned = learned_translations.get(word_lower)
+        if learned:
+            known_translations[word] = learned
         else:
             unknown_words.append(word)
     
@@ -429,14 +549,8 @@ async def format_russian_translation_block_with_ai(
             )
             
             if response:
-                for line in response.split("\n"):
-                    line = line.strip()
-                    if "=" in line:
-                        parts = line.split("=", 1)
-                        if len(parts) == 2:
-                            word_part = parts[0].strip().strip('"\'')
-                            meaning = parts[1].strip()
-                            ai_translations[word_part] = meaning
+                ai_translations = parse_translation_response(response)
+                learned_translations.add_many(ai_translations)
         except Exception as e:
             logger.debug(f"AI translation batch failed: {e}")
     
@@ -447,8 +561,8 @@ async def format_russian_translation_block_with_ai(
         
         if word in known_translations:
             translation = known_translations[word]
-        elif word in ai_translations:
-            translation = ai_translations[word]
+        elif word.lower() in ai_translations:
+            translation = ai_translations[word.lower()]
         else:
             romanized = romanize_russian_word(word)
             if romanized and romanized != word:
@@ -544,20 +658,7 @@ def normalize_russian_variant(word: str) -> str:
     if not word:
         return ""
     
-    normalized = word.lower().strip()
-    
-    diacritic_map = {
-        'é': 'e', 'è': 'e', 'ê': 'e',
-        'ä': 'a', 'ö': 'o', 'ü': 'u',
-        'ž': 'z', 'č': 'c', 'š': 's', 'ć': 'c', 'đ': 'd',
-        'à': 'a', 'ù': 'u', 'ì': 'i',
-        'ý': 'y', 'ý': 'y',
-    }
-    
-    for diacritic, replacement in diacritic_map.items():
-        normalized = normalized.replace(diacritic, replacement)
-    
-    return normalized
+    return word.lower().strip().translate(_DIACRITIC_TRANSLATION)
 
 
 def build_gemini_translation_prompt(russian_words: List[str]) -> str:
@@ -590,3 +691,23 @@ Examples:
 Keep meanings SHORT and concise. Only translate, no explanations."""
     
     return prompt
+
+
+def parse_translation_response(response: str) -> Dict[str, str]:
+    """Parse "word = meaning" lines from a Gemini translation response.
+    
+    Args:
+        response: Raw Gemini response to build_gemini_translation_prompt
+        
+    Returns:
+        Dictionary of lowercase word -> meaning
+    """
+    translations = {}
+    for line in response.split("\n"):
+        line = line.strip()
+        if "=" in line:
+            word_part, meaning = line.split("=", 1)
+            word_part = word_part.strip().strip('"\'').lower()
+            if word_part and meaning.strip():
+                translations[word_part] = meaning.strip()
+    return translations
@@ -10,10 +10,21 @@ The presentation logic is handled separately in the handlers.
 import logging
 import aiohttp
 import asyncio
+import time
 import traceback
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 
-from config.settings import SAUCENAO_API_KEY
+from config.settings import (
+    SAUCENAO_API_KEY,
+    SAUCENAO_CACHE_SIZE,
+    SAUCENAO_CACHE_TTL,
+    SAUCENAO_HASH_MAX_DISTANCE,
+    SAUCENAO_IMAGE_MAX_EDGE,
+)
+from utils.cache import TTLCache
+from utils.http_client import http_clients
+from utils.image_hash import HammingIndex, dhash
+from utils.image_prep import image_stats, prepare_image_async
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +41,71 @@ class SauceNAOError(Exception):
     pass
 
 
+class SauceNAOCache:
+    """
+    Local cache of processed SauceNAO results.
+
+    Results are stored under the image's perceptual hash and looked up first
+    by Telegram ``file_unique_id`` (exact repeat), then by the nearest stored
+    hash within a small Hamming distance (re-sent or re-compressed copies).
+    Both paths answer without spending SauceNAO quota.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, max_distance: int) -> None:
+        self.maxsize = maxsize
+        self.max_distance = max_distance
+        self._results = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._file_ids = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._index = HammingIndex()
+        self.file_id_hits = 0
+        self.hash_hits = 0
+
+    def get_by_file_id(self, file_unique_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return cached results for an exact Telegram file, if any."""
+        if not file_unique_id:
+            return None
+        image_hash = self._file_ids.get(file_unique_id)
+        if image_hash is None:
+            return None
+        results = self._results.get(image_hash)
+        if results is not None:
+            self.file_id_hits += 1
+        return results
+
+    def get_by_hash(self, image_hash: int) -> Optional[Dict[str, Any]]:
+        """Return cached results for the closest near-duplicate image, if any."""
+        match = self._index.nearest(image_hash, self.max_distance)
+        if match is None:
+            return None
+        results = self._results.get(match[0])
+        if results is None:
+            # Expired or evicted from the result cache
+            self._index.remove(match[0])
+            return None
+        self.hash_hits += 1
+        logger.info(f"SauceNAO cache hit for near-duplicate image (distance {match[1]})")
+        return results
+
+    def store(self, image_hash: int, results: Dict[str, Any], file_unique_id: Optional[str] = None) -> None:
+        self._results.set(image_hash, results)
+        self._index.add(image_hash)
+        if file_unique_id:
+            self._file_ids.set(file_unique_id, image_hash)
+        if len(self._index) > 2 * self.maxsize:
+            self._index.clear()
+            for live_hash in self._results.keys():
+                self._index.add(live_hash)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters for monitoring."""
+        return {
+            "size": len(self._results),
+            "indexed": len(self._index),
+            "file_id_hits": self.file_id_hits,
+            "hash_hits": self.hash_hits,
+        }
+
+
 class SauceNAOSearcher:
     """
     Handler for SauceNAO reverse image search API.
@@ -49,13 +125,15 @@ class SauceNAOSearcher:
         if not self.api_key:
             raise ValueError("SauceNAO API key is not configured.")
         self.base_url = "https://saucenao.com/search.php"
+        self.cache = SauceNAOCache(SAUCENAO_CACHE_SIZE, SAUCENAO_CACHE_TTL, SAUCENAO_HASH_MAX_DISTANCE)
 
-    async def search(self, image_path: str) -> Dict[str, Any]:
+    async def search(self, image: Union[bytes, str], file_unique_id: Optional[str] = None) -> Dict[str, Any]:
         """
-        Search for an image using the SauceNAO API with retry logic.
+        Search for an image, answering repeats and near-duplicates from the cache.
 
         Args:
-            image_path: Path to the image file.
+            image: Image bytes, or a path to the image file.
+            file_unique_id: Telegram file_unique_id of the image, if known.
 
         Returns:
             A dictionary containing the processed SauceNAO API response.
@@ -63,6 +141,31 @@ class SauceNAOSearcher:
         Raises:
             SauceNAOError: On network issues or API error responses.
         """
+        cached = self.cache.get_by_file_id(file_unique_id)
+        if cached is not None:
+            logger.info("SauceNAO cache hit for repeated Telegram file")
+            return cached
+
+        image_hash = None
+        try:
+            image_hash = await asyncio.to_thread(dhash, image)
+        except Exception as e:
+            logger.warning(f"Could not hash image for SauceNAO cache: {e}")
+
+        if image_hash is not None:
+            cached = self.cache.get_by_hash(image_hash)
+            if cached is not None:
+                if file_unique_id:
+                    self.cache.store(image_hash, cached, file_unique_id)
+                return cached
+
+        results = await self._search_api(image)
+        if image_hash is not None:
+            self.cache.store(image_hash, results, file_unique_id)
+        return results
+
+    async def _search_api(self, image: Union[bytes, str]) -> Dict[str, Any]:
+        """Post the image to the SauceNAO API with retry logic."""
         params = {
             'api_key': self.api_key,
             'output_type': 2,  # JSON output
@@ -70,40 +173,51 @@ class SauceNAOSearcher:
             'db': 999,         # Search all databases
             'hide': 0,         # Show low-similarity results from API
         }
+        if isinstance(image, (bytes, bytearray)):
+            image_data = bytes(image)
+        else:
+            image_data = await asyncio.to_thread(self._read_file, image)
+        try:
+            prepared = await prepare_image_async(image_data, SAUCENAO_IMAGE_MAX_EDGE)
+            image_data, filename, content_type = prepared.data, prepared.filename, prepared.mime_type
+        except ValueError as e:
+            logger.warning(f"Could not preprocess image for SauceNAO, uploading as is: {e}")
+            filename, content_type = 'image.jpg', 'image/jpeg'
 
         for attempt in range(MAX_RETRIES + 1):
             try:
-                async with aiohttp.ClientSession() as session:
-                    with open(image_path, 'rb') as img_file:
-                        form_data = aiohttp.FormData()
-                        form_data.add_field(
-                            'file', img_file,
-                            filename='image.jpg',
-                            content_type='image/jpeg'
+                session = http_clients.get("saucenao")
+                form_data = aiohttp.FormData()
+                form_data.add_field(
+                    'file', image_data,
+                    filename=filename,
+                    content_type=content_type
+                )
+                for key, value in params.items():
+                    form_data.add_field(key, str(value))
+
+                request_start = time.perf_counter()
+                async with session.post(self.base_url, data=form_data) as response:
+                    image_stats.record_request("saucenao", len(image_data), time.perf_counter() - request_start)
+                    if response.status == 200:
+                        data = await response.json()
+                        return self._process_results(data)
+                    
+                    # Handle non-200 responses
+                    error_text = await response.text()
+                    logger.error(
+                        f"SauceNAO API error. Status: {response.status}, "
+                        f"Response: {error_text}"
+                    )
+                    if response.status == 429:
+                        raise SauceNAOError("Rate limit reached.")
+                    
+                    # For other errors, retry if possible
+                    if attempt >= MAX_RETRIES:
+                        raise SauceNAOError(
+                            f"API request failed after multiple retries with "
+                            f"status code {response.status}."
                         )
-                        for key, value in params.items():
-                            form_data.add_field(key, str(value))
-
-                        async with session.post(self.base_url, data=form_data, timeout=30) as response:
-                            if response.status == 200:
-                                data = await response.json()
-                                return self._process_results(data)
-                            
-                            # Handle non-200 responses
-                            error_text = await response.text()
-                            logger.error(
-                                f"SauceNAO API error. Status: {response.status}, "
-                                f"Response: {error_text}"
-                            )
-                            if response.status == 429:
-                                raise SauceNAOError("Rate limit reached.")
-                            
-                            # For other errors, retry if possible
-                            if attempt >= MAX_RETRIES:
-                                raise SauceNAOError(
-                                    f"API request failed after multiple retries with "
-                                    f"status code {response.status}."
-                                )
 
             except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 logger.error(f"SauceNAO network error on attempt {attempt + 1}: {e}")
@@ -119,6 +233,11 @@ class SauceNAOSearcher:
         # This should not be reached, but as a fallback
         raise SauceNAOError("Failed to get a response from SauceNAO API.")
 
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        with open(path, 'rb') as img_file:
+            return img_file.read()
+
     def _process_results(self, api_response: Dict[str, Any]) -> Dict[str, Any]:
         """
         Filters, sorts, and structures the raw API results.
@@ -1,18 +1,31 @@
 """
 Web search engine integration using Google Custom Search Engine.
 Provides clean search API with key rotation for availability.
+
+Results are cached per (normalised query, search type, language, safe search)
+with a TTL per search type. Once an entry is past its TTL it is still served
+for SEARCH_STALE_TTL seconds while a background task refreshes it.
 """
+import asyncio
 import json
 import logging
 import os
-import random
+import time
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Union, Literal
+from typing import List, Dict, Any, Optional, Set, Tuple, Union, Literal
 
-import aiohttp
 from urllib.parse import urlparse, quote_plus
 
-from config.settings import DEFAULT_LANGUAGE
+from config.settings import (
+    DEFAULT_LANGUAGE,
+    SEARCH_CACHE_SIZE,
+    SEARCH_CACHE_TTLS,
+    SEARCH_PROFILE_PARALLELISM,
+    SEARCH_STALE_TTL,
+)
+from utils.api_key_scheduler import cse_key_scheduler
+from utils.cache import TTLCache
+from utils.http_client import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +43,67 @@ class SearchResult:
 class SearchError(Exception):
     pass
 
+class QuotaExceededError(SearchError):
+    pass
+
+class BadRequestError(SearchError):
+    """The request itself was rejected; another API key would not help."""
+    pass
+
+_QUOTA_REASONS = ("quota", "dailylimitexceeded", "ratelimitexceeded")
+# Error reasons that mean the key itself is unusable (cooldown via mark_failed)
+_AUTH_REASONS = {"keyinvalid", "api_key_invalid", "accessnotconfigured", "forbidden"}
+
+def _error_reasons(error_text: str) -> Set[str]:
+    """Collect the lower-cased ``reason`` fields of a Google API error body."""
+    try:
+        error = json.loads(error_text).get("error", {})
+    except (ValueError, AttributeError):
+        return set()
+    if not isinstance(error, dict):
+        return set()
+    entries = list(error.get("errors") or []) + list(error.get("details") or [])
+    return {str(entry.get("reason", "")).lower() for entry in entries if isinstance(entry, dict)}
+
+# Entries are (results, fetched_at); kept until the longest TTL plus the stale window
+_search_cache = TTLCache(
+    maxsize=SEARCH_CACHE_SIZE,
+    ttl=max(SEARCH_CACHE_TTLS.values()) + SEARCH_STALE_TTL,
+)
+_refreshing: Set[Tuple] = set()
+_refresh_tasks: Set["asyncio.Task"] = set()
+
+def _search_cache_key(
+    query: str,
+    max_results: int,
+    safe_search: str,
+    search_type: Optional[str],
+    language: str,
+    exact_terms: Optional[str],
+    site_restrict: Optional[str]
+) -> Tuple:
+    normalized = " ".join(query.lower().split())
+    return (normalized, search_type or "general", language, safe_search, max_results, exact_terms, site_restrict)
+
+def _search_ttl(search_type: Optional[str]) -> float:
+    return SEARCH_CACHE_TTLS.get(search_type or "general", SEARCH_CACHE_TTLS["general"])
+
+async def _refresh_cached_search(cache_key: Tuple, kwargs: Dict[str, Any]) -> None:
+    try:
+        results = await _search_uncached(**kwargs)
+        _search_cache.set(cache_key, (results, time.monotonic()))
+        logger.debug(f"Refreshed stale search cache entry for '{kwargs['query']}'")
+    except Exception as e:
+        logger.debug(f"Background search refresh failed for '{kwargs['query']}': {e}")
+    finally:
+        _refreshing.discard(cache_key)
+
+def get_search_cache_stats() -> Dict[str, Any]:
+    """Return search cache counters for monitoring."""
+    stats = _search_cache.stats()
+    stats["refreshing"] = len(_refreshing)
+    return stats
+
 async def search_web(
     query: str, 
     max_results: int = 8,
@@ -38,6 +112,98 @@ async def search_web(
     language: str = DEFAULT_LANGUAGE,
     exact_terms: Optional[str] = None,
     site_restrict: Optional[str] = None
+) -> List[SearchResult]:
+    kwargs = {
+        "query": query,
+        "max_results": max_results,
+        "safe_search": safe_search,
+        "search_type": search_type,
+        "language": language,
+        "exact_terms": exact_terms,
+        "site_restrict": site_restrict,
+    }
+    cache_key = _search_cache_key(query, max_results, safe_search, search_type, language, exact_terms, site_restrict)
+    cached = _search_cache.get(cache_key)
+    if cached is not None:
+        results, fetched_at = cached
+        age = time.monotonic() - fetched_at
+        ttl = _search_ttl(search_type)
+        if age <= ttl:
+            return list(results)
+        if age <= ttl + SEARCH_STALE_TTL:
+            if cache_key not in _refreshing:
+                _refreshing.add(cache_key)
+                task = asyncio.create_task(_refresh_cached_search(cache_key, kwargs))
+                _refresh_tasks.add(task)
+                task.add_done_callback(_refresh_tasks.discard)
+            return list(results)
+
+    results = await _search_uncached(**kwargs)
+    if results:
+        _search_cache.set(cache_key, (results, time.monotonic()))
+    return results
+
+async def _run_profile_fallbacks(
+    query: str,
+    site_restrict: Optional[str],
+    processed_results: List[SearchResult],
+    api_key: str,
+    cse_id: str,
+    max_results: int,
+    safe_search: str,
+    language: str,
+    search_type: Optional[str]
+) -> List[SearchResult]:
+    """Run profile fallback strategies concurrently, stopping at the first quality result."""
+    semaphore = asyncio.Semaphore(SEARCH_PROFILE_PARALLELISM)
+
+    async def run_strategy(strategy_name: str, alt_query: str, alt_params: dict) -> Tuple[str, List[SearchResult]]:
+        async with semaphore:
+            logger.debug(f"Trying profile search strategy: {strategy_name}")
+            alt_results = await _execute_search(
+                query=alt_query,
+                api_key=api_key,
+                cse_id=cse_id,
+                max_results=max_results,
+                safe_search=safe_search,
+                language=language,
+                search_type=search_type,
+                extra_params=alt_params
+            )
+            return strategy_name, _enrich_search_results(alt_results, search_type)
+
+    alt_strategies = _get_profile_fallback_strategies(query, site_restrict)
+    tasks = [
+        asyncio.create_task(run_strategy(name, alt_query, alt_params))
+        for name, (alt_query, alt_params) in alt_strategies.items()
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                strategy_name, alt_processed = await next_done
+            except Exception as e:
+                logger.debug(f"Profile strategy failed: {e}")
+                continue
+            if len(alt_processed) > len(processed_results):
+                logger.debug(f"Strategy '{strategy_name}' found better results: {len(alt_processed)} vs {len(processed_results)}")
+                processed_results = alt_processed
+                if _has_quality_profile_results(alt_processed):
+                    break
+    finally:
+        # Strategies still waiting on the semaphore never reach the API
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return processed_results
+
+async def _search_uncached(
+    query: str,
+    max_results: int = 8,
+    safe_search: str = "off",
+    search_type: Optional[str] = None,
+    language: str = DEFAULT_LANGUAGE,
+    exact_terms: Optional[str] = None,
+    site_restrict: Optional[str] = None
 ) -> List[SearchResult]:
     api_keys_str = os.getenv("GOOGLE_API_KEYS", "")
     cse_id = os.getenv("GOOGLE_CSE_ID")
@@ -45,9 +211,13 @@ async def search_web(
         logger.error("Missing Google API keys or CSE ID")
         raise SearchError("Google Search API configuration is missing")
     api_keys = [key.strip() for key in api_keys_str.split(",") if key.strip()]
-    random.shuffle(api_keys)
     if not api_keys:
         raise SearchError("No valid Google API keys found")
+    cse_key_scheduler.set_keys(api_keys)
+    api_keys = cse_key_scheduler.ordered_keys()
+    if not api_keys:
+        logger.error("All Google API keys are out of quota until the daily reset")
+        raise QuotaExceededError("All Google API keys are out of quota")
     enhanced_query, search_params = _prepare_query_by_type(query, search_type, site_restrict, exact_terms)
     errors = []
     for api_key in api_keys:
@@ -65,29 +235,10 @@ async def search_web(
             processed_results = _enrich_search_results(results, search_type)
             if search_type == "profile" and not _has_quality_profile_results(processed_results):
                 logger.debug(f"Primary profile search yielded poor results for '{query}', trying alternatives")
-                alt_strategies = _get_profile_fallback_strategies(query, site_restrict)
-                for strategy_name, (alt_query, alt_params) in alt_strategies.items():
-                    logger.debug(f"Trying profile search strategy: {strategy_name}")
-                    try:
-                        alt_results = await _execute_search(
-                            query=alt_query,
-                            api_key=api_key,
-                            cse_id=cse_id,
-                            max_results=max_results,
-                            safe_search=safe_search,
-                            language=language, 
-                            search_type=search_type,
-                            extra_params=alt_params
-                        )
-                        alt_processed = _enrich_search_results(alt_results, search_type)
-                        if len(alt_processed) > len(processed_results):
-                            logger.debug(f"Strategy '{strategy_name}' found better results: {len(alt_processed)} vs {len(processed_results)}")
-                            processed_results = alt_processed
-                            if _has_quality_profile_results(alt_processed):
-                                break
-                    except Exception as e:
-                        logger.debug(f"Profile strategy '{strategy_name}' failed: {e}")
-                        continue
+                processed_results = await _run_profile_fallbacks(
+                    query, site_restrict, processed_results, api_key, cse_id,
+                    max_results, safe_search, language, search_type
+                )
             if processed_results:
                 return processed_results
             if search_type == "profile" and "@" in query and not processed_results:
@@ -102,6 +253,9 @@ async def search_web(
                 if last_chance_results:
                     return last_chance_results
             return processed_results
+        except BadRequestError:
+            # Same request with another key fails the same way
+            raise
         except Exception as e:
             errors.append(f"{type(e).__name__}: {str(e)}")
             logger.warning(f"Search failed with API key {api_key[:5]}...: {e}")
@@ -265,39 +419,50 @@ async def _execute_search(
         params.update(extra_params)
     sanitized_params = {k: v for k, v in params.items() if k != "key"}
     logger.debug(f"Search query params: {sanitized_params}")
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, params=params, timeout=15) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                logger.error(f"Google CSE API error: {response.status} - {error_text}")
-                response.raise_for_status()
-            data = await response.json()
-            search_info = data.get("searchInformation", {})
-            total_results = search_info.get("totalResults", "0")
-            search_time = search_info.get("searchTime", 0)
-            logger.debug(f"Search returned {total_results} results in {search_time} seconds")
-            items = data.get("items", [])
-            if not items:
-                return []
-            results = []
-            for item in items:
-                result = SearchResult(
-                    title=item.get("title", ""),
-                    link=item.get("link", ""),
-                    snippet=item.get("snippet", ""),
-                    displayed_link=item.get("displayLink", ""),
-                    source=item.get("displayLink", "")
-                )
-                if "pagemap" in item:
-                    pagemap = item["pagemap"]
-                    result = _extract_pagemap_data(result, pagemap, search_type)
-                if result.link:
-                    try:
-                        result.source = urlparse(result.link).netloc
-                    except:
-                        pass
-                results.append(result)
-            return results
+    cse_key_scheduler.record_request(api_key)
+    session = http_clients.get("search")
+    async with session.get(url, params=params) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            logger.error(f"Google CSE API error: {response.status} - {error_text}")
+            if response.status == 429 or (
+                response.status == 403 and any(reason in error_text.lower() for reason in _QUOTA_REASONS)
+            ):
+                cse_key_scheduler.mark_exhausted(api_key)
+                raise QuotaExceededError(f"Quota exceeded for API key {api_key[:5]}...")
+            if response.status in (400, 403):
+                if _error_reasons(error_text) & _AUTH_REASONS:
+                    cse_key_scheduler.mark_failed(api_key)
+                elif response.status == 400:
+                    raise BadRequestError(f"Google CSE rejected the request: {error_text[:200]}")
+            response.raise_for_status()
+        data = await response.json()
+        search_info = data.get("searchInformation", {})
+        total_results = search_info.get("totalResults", "0")
+        search_time = search_info.get("searchTime", 0)
+        logger.debug(f"Search returned {total_results} results in {search_time} seconds")
+        items = data.get("items", [])
+        if not items:
+            return []
+        results = []
+        for item in items:
+            result = SearchResult(
+                title=item.get("title", ""),
+                link=item.get("link", ""),
+                snippet=item.get("snippet", ""),
+                displayed_link=item.get("displayLink", ""),
+                source=item.get("displayLink", "")
+            )
+            if "pagemap" in item:
+                pagemap = item["pagemap"]
+                result = _extract_pagemap_data(result, pagemap, search_type)
+            if result.link:
+                try:
+                    result.source = urlparse(result.link).netloc
+                except:
+                    pass
+            results.append(result)
+        return results
 
 def _extract_pagemap_data(
     result: SearchResult, 
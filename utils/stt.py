@@ -0,0 +1,242 @@
+"""
+Speech-to-text backends for VoiceProcessor.
+
+Every backend takes 16 kHz mono 16-bit PCM and returns the transcript:
+
+- ``google``: the speech_recognition web endpoint (no model, network bound)
+- ``local``: faster-whisper (CTranslate2, int8 on CPU) running in a process
+  pool, so inference neither blocks the event loop nor holds the GIL
+
+Backends can also consume PCM frames while the voice note is still being
+decoded (``transcribe_stream``); the local engine transcribes windows as
+soon as they fill, the default implementation waits for the whole clip.
+Consecutive windows share STT_STREAM_OVERLAP_SECONDS of audio, and the words
+heard twice at each seam are removed when the window texts are joined.
+
+The backend is chosen per language (STT_BACKEND_BY_LANG, then STT_BACKEND).
+When a local transcription fails or is empty, VoiceProcessor falls back to
+Google. faster-whisper is an optional dependency; without it the local
+backend reports itself unavailable.
+"""
+import asyncio
+import logging
+import multiprocessing
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from config.settings import (
+    STT_LOCAL_BEAM_SIZE,
+    STT_LOCAL_COMPUTE_TYPE,
+    STT_LOCAL_CPU_THREADS,
+    STT_LOCAL_MODEL,
+    STT_LOCAL_WORKERS,
+    STT_STREAM_OVERLAP_SECONDS,
+    STT_STREAM_WINDOW_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+
+# Bot language codes -> BCP-47 for Google, ISO 639-1 for Whisper
+GOOGLE_LANGUAGES = {"en": "en-US", "id": "id-ID", "ru": "ru-RU", "jp": "ja-JP"}
+WHISPER_LANGUAGES = {"en": "en", "id": "id", "ru": "ru", "jp": "ja"}
+
+# Longest run of words an overlap of a second or two can repeat
+_MAX_SEAM_WORDS = 8
+
+
+def _seam_key(word: str) -> str:
+    return re.sub(r"\W", "", word.casefold())
+
+
+def merge_window_texts(texts: List[str]) -> str:
+    """Join transcripts of overlapping windows, dropping words repeated at each seam.
+
+    The end of one window is heard again at the start of the next, so the
+    longest run of words ending the previous text that also starts the next
+    one is removed from the next. The previous text's last word may itself
+    be cut off by the window edge, so a match that skips it is accepted too.
+    """
+    words: List[str] = []
+    for text in texts:
+        new = text.split()
+        if not new:
+            continue
+        previous = [_seam_key(word) for word in words[-(_MAX_SEAM_WORDS + 1):]]
+        incoming = [_seam_key(word) for word in new[:_MAX_SEAM_WORDS]]
+        for size in range(min(len(incoming), _MAX_SEAM_WORDS), 0, -1):
+            if previous[-size:] == incoming[:size]:
+                new = new[size:]
+                break
+            if len(previous) > size and previous[-size - 1:-1] == incoming[:size]:
+                # Drop the clipped last word of the previous window as well
+                words.pop()
+                new = new[size:]
+                break
+        words.extend(new)
+    return " ".join(words)
+
+
+class STTBackend(ABC):
+    """Base class: transcribe 16 kHz mono PCM asynchronously."""
+
+    name = "base"
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    async def transcribe(self, pcm: bytes, lang: str) -> Optional[str]:
+        """Return the transcript of ``pcm``, or None if nothing was recognised."""
+
+    def shutdown(self) -> None:
+        """Release worker pools or other resources; nothing to do by default."""
+
+    async def transcribe_stream(self, frames: AsyncIterator[bytes], lang: str) -> Optional[str]:
+        """Transcribe PCM frames as they arrive; by default waits for the whole clip."""
+        pcm = bytearray()
+        async for frame in frames:
+            pcm.extend(frame)
+        return await self.transcribe(bytes(pcm), lang) if pcm else None
+
+
+class GoogleSTTBackend(STTBackend):
+    """speech_recognition's free Google endpoint, run in a worker thread."""
+
+    name = "google"
+
+    def __init__(self) -> None:
+        try:
+            import speech_recognition as sr
+            self._sr = sr
+            self.recognizer = sr.Recognizer()
+        except ImportError:
+            logger.error("❌ speech_recognition not installed")
+            self._sr = None
+            self.recognizer = None
+
+    def available(self) -> bool:
+        return self.recognizer is not None
+
+    async def transcribe(self, pcm: bytes, lang: str) -> Optional[str]:
+        audio_data = self._sr.AudioData(pcm, SAMPLE_RATE, SAMPLE_WIDTH)
+        try:
+            return await asyncio.to_thread(
+                self.recognizer.recognize_google, audio_data, language=GOOGLE_LANGUAGES.get(lang, "id-ID")
+            )
+        except self._sr.UnknownValueError:
+            return None
+
+
+# Per-process model for the local backend, loaded once by the pool initializer
+_worker_model: Any = None
+
+
+def _init_local_worker(model_name: str, compute_type: str, cpu_threads: int) -> None:
+    global _worker_model
+    from faster_whisper import WhisperModel
+    _worker_model = WhisperModel(model_name, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+
+
+def _local_transcribe(pcm: bytes, language: Optional[str], beam_size: int) -> str:
+    import numpy as np
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    segments, _ = _worker_model.transcribe(samples, language=language, beam_size=beam_size, vad_filter=True)
+    return " ".join(segment.text.strip() for segment in segments).strip()
+
+
+class LocalWhisperBackend(STTBackend):
+    """faster-whisper on CPU in a spawned process pool."""
+
+    name = "local"
+
+    def __init__(self) -> None:
+        self._pool: Optional[ProcessPoolExecutor] = None
+        try:
+            import faster_whisper  # noqa: F401
+            self._installed = True
+        except ImportError:
+            self._installed = False
+
+    def available(self) -> bool:
+        return self._installed
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn, not fork: the bot process already runs threads and an event loop
+            self._pool = ProcessPoolExecutor(
+                max_workers=STT_LOCAL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_local_worker,
+                initargs=(STT_LOCAL_MODEL, STT_LOCAL_COMPUTE_TYPE, STT_LOCAL_CPU_THREADS),
+            )
+            logger.info(
+                f"Local STT pool started (model={STT_LOCAL_MODEL}, compute={STT_LOCAL_COMPUTE_TYPE}, "
+                f"workers={STT_LOCAL_WORKERS})"
+            )
+        return self._pool
+
+    async def transcribe(self, pcm: bytes, lang: str) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        text = await loop.run_in_executor(
+            self._get_pool(), _local_transcribe, pcm, WHISPER_LANGUAGES.get(lang), STT_LOCAL_BEAM_SIZE
+        )
+        return text or None
+
+    async def transcribe_stream(self, frames: AsyncIterator[bytes], lang: str) -> Optional[str]:
+        """Submit each STT_STREAM_WINDOW_SECONDS window to the pool as soon as it is decoded.
+
+        Every window after the first starts with the last STT_STREAM_OVERLAP_SECONDS
+        of the previous one; the repeated words are removed by ``merge_window_texts``.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        language = WHISPER_LANGUAGES.get(lang)
+        frame_bytes = SAMPLE_RATE * SAMPLE_WIDTH
+        window_bytes = int(STT_STREAM_WINDOW_SECONDS * frame_bytes)
+        # Whole samples, so the carried-over tail never splits one
+        overlap_bytes = int(STT_STREAM_OVERLAP_SECONDS * SAMPLE_RATE) * SAMPLE_WIDTH
+        overlap_bytes = min(overlap_bytes, window_bytes // 2)
+        pending = []
+        window = bytearray()
+        fresh = 0  # bytes in ``window`` not already sent with the previous window
+        try:
+            async for frame in frames:
+                window.extend(frame)
+                fresh += len(frame)
+                if len(window) >= window_bytes:
+                    pending.append(loop.run_in_executor(
+                        pool, _local_transcribe, bytes(window), language, STT_LOCAL_BEAM_SIZE
+                    ))
+                    window = window[len(window) - overlap_bytes:] if overlap_bytes else bytearray()
+                    fresh = 0
+            if fresh:
+                pending.append(loop.run_in_executor(
+                    pool, _local_transcribe, bytes(window), language, STT_LOCAL_BEAM_SIZE
+                ))
+            texts = await asyncio.gather(*pending)
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+        return merge_window_texts([text for text in texts if text]) or None
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def create_backends() -> Dict[str, STTBackend]:
+    """Instantiate every backend that is usable in this environment."""
+    backends: Dict[str, STTBackend] = {}
+    for backend in (GoogleSTTBackend(), LocalWhisperBackend()):
+        if backend.available():
+            backends[backend.name] = backend
+        else:
+            logger.info(f"STT backend '{backend.name}' unavailable")
+    return backends
@@ -65,6 +65,41 @@ class ChatActionSender:
             except Exception as e:
                 logger.debug(f"ChatActionSender task cleanup error: {e}")
 
+class QueuePositionNotice:
+    """
+    Shows a queued job's position in an existing loading message.
+    Pass ``update`` as the on_position callback of a job queue and await
+    ``clear`` once the job has started or failed; if a position was shown,
+    the message is put back to ``restore_text``.
+    """
+
+    def __init__(self, message: Any, template: str, restore_text: Optional[str] = None):
+        self.message = message
+        self.template = template
+        self.restore_text = restore_text
+        self._shown = False
+        self._closed = False
+        self._lock = asyncio.Lock()
+
+    async def update(self, position: int) -> None:
+        async with self._lock:
+            if self._closed:
+                return
+            text = f"<blockquote><b>{self.template.format(position=position)}</b></blockquote>"
+            await self.message.edit_text(text, parse_mode="HTML")
+            self._shown = True
+
+    async def clear(self) -> None:
+        async with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._shown and self.restore_text:
+                try:
+                    await self.message.edit_text(self.restore_text, parse_mode="HTML")
+                except Exception as e:
+                    logger.debug(f"Failed to restore loading message after queue: {e}")
+
 # Keep strong references to background animation tasks to prevent garbage collection
 _active_animations = set()
 
@@ -1,16 +1,588 @@
 """
-TTS background queue worker for Alya Bot (Microservice Client).
-Dispatches TTS jobs to the external Alya-TTS service via REST API.
+TTS dispatcher for Alya Bot (Alya-TTS microservice client).
+
+``dispatch_tts`` writes each job to a local SQLite queue (TTS_QUEUE_PATH)
+and ``TTSQueueWorker`` submits queued jobs to the Alya-TTS service over the
+shared keep-alive session:
+
+- connection errors, timeouts and 5xx replies are retried with exponential
+  backoff and jitter, up to TTS_MAX_ATTEMPTS
+- 429/503 means the service is saturated: the whole dispatcher pauses for
+  Retry-After instead of sending more work, and the job keeps its attempts
+- once accepted, delivery is confirmed by the service calling back
+  TTS_CALLBACK_URL, or by polling ``GET /tts/<job_id>``
+- jobs that cannot be sent within TTS_JOB_MAX_AGE fail and the user is told
+  the voice service is unavailable
+
+Each job carries a ``content_hash`` of (voice_lang, normalised text). When
+the service reports the Telegram ``file_id`` of a delivered voice note, it
+is remembered in a local SQLite index (TTS_AUDIO_CACHE_PATH), and repeats
+of the same reply are answered with ``send_voice(file_id)`` without
+reaching the TTS service at all.
+
+Jobs survive restarts. Jobs still marked as sending at startup are resent
+with the same ``job_id`` so the service can deduplicate them. The bot token
+is added at send time and never written to the queue file.
 """
+import asyncio
+import hashlib
+import json
 import logging
-import os
-import httpx
-from typing import Optional
-from config.settings import BOT_TOKEN
+import random
+import sqlite3
+import threading
+import time
+import unicodedata
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from aiohttp import web
+from telegram.error import BadRequest
+
+from config.settings import (
+    BOT_TOKEN,
+    DEFAULT_LANGUAGE,
+    TTS_ACCEPT_WAIT,
+    TTS_AUDIO_CACHE_PATH,
+    TTS_AUDIO_CACHE_SIZE,
+    TTS_CALLBACK_HOST,
+    TTS_CALLBACK_PORT,
+    TTS_CALLBACK_SECRET,
+    TTS_CALLBACK_URL,
+    TTS_DELIVERY_TIMEOUT,
+    TTS_DISPATCH_CONCURRENCY,
+    TTS_JOB_MAX_AGE,
+    TTS_MAX_ATTEMPTS,
+    TTS_QUEUE_PATH,
+    TTS_QUEUE_RETENTION,
+    TTS_RETRY_BASE_DELAY,
+    TTS_RETRY_MAX_DELAY,
+    TTS_SERVICE_URL,
+    TTS_STATUS_POLL_INTERVAL,
+)
+from utils.cache import PersistentLRUCache
+from utils.http_client import http_clients
 
 logger = logging.getLogger(__name__)
 
-TTS_SERVICE_URL = os.getenv("TTS_SERVICE_URL", "http://localhost:5001")
+# Job states. "accepted" jobs wait for delivery confirmation; the last three are final
+PENDING = "pending"
+SENDING = "sending"
+ACCEPTED = "accepted"
+DELIVERED = "delivered"
+FAILED = "failed"
+UNCONFIRMED = "unconfirmed"
+FINAL_STATES = (DELIVERED, FAILED, UNCONFIRMED)
+
+# Service-side status values that count as delivered or failed
+_DELIVERED_STATUSES = {"delivered", "sent", "done", "completed", "success"}
+_FAILED_STATUSES = {"failed", "error"}
+
+
+def tts_content_hash(text: str, voice_lang: str) -> str:
+    """Hash of the voice language and whitespace/case-normalised text."""
+    normalised = " ".join(unicodedata.normalize("NFKC", text).lower().split())
+    return hashlib.sha256(f"{voice_lang}\n{normalised}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class TTSJob:
+    job_id: str
+    payload: Dict[str, Any]
+    status: str
+    attempts: int
+    created_at: float
+    updated_at: float
+
+
+class TTSJobStore:
+    """SQLite-backed job table for the TTS dispatcher."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tts_jobs ("
+            "job_id TEXT PRIMARY KEY, payload TEXT NOT NULL, status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, last_error TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tts_jobs_due ON tts_jobs(status, next_attempt_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def _row_to_job(row: tuple) -> TTSJob:
+        job_id, payload, status, attempts, created_at, updated_at = row
+        return TTSJob(job_id, json.loads(payload), status, attempts, created_at, updated_at)
+
+    def add(self, job_id: str, payload: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO tts_jobs (job_id, payload, status, attempts, next_attempt_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, 0, ?, ?, ?)",
+                (job_id, json.dumps(payload), PENDING, now, now, now),
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[TTSJob]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, payload, status, attempts, created_at, updated_at FROM tts_jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim(self, status: str, new_status: str, limit: int, next_attempt_at: Optional[float] = None) -> List[TTSJob]:
+        """Move up to ``limit`` due jobs from ``status`` to ``new_status`` in one transaction."""
+        if limit <= 0:
+            return []
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, payload, status, attempts, created_at, updated_at FROM tts_jobs "
+                "WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (status, now, limit),
+            ).fetchall()
+            if rows:
+                self._conn.executemany(
+                    "UPDATE tts_jobs SET status = ?, next_attempt_at = ?, updated_at = ? WHERE job_id = ?",
+                    [(new_status, next_attempt_at or now, now, row[0]) for row in rows],
+                )
+                self._conn.commit()
+        return [self._row_to_job(row) for row in rows]
+
+    def update(
+        self,
+        job_id: str,
+        status: str,
+        next_attempt_at: Optional[float] = None,
+        attempts: Optional[int] = None,
+        error: Optional[str] = None,
+        only_from: Optional[tuple] = None,
+    ) -> bool:
+        """Set a job's state; with ``only_from``, only if it is currently in one of those states."""
+        now = time.time()
+        sql = ("UPDATE tts_jobs SET status = ?, next_attempt_at = COALESCE(?, next_attempt_at), "
+               "attempts = COALESCE(?, attempts), last_error = COALESCE(?, last_error), updated_at = ? "
+               "WHERE job_id = ?")
+        params: list = [status, next_attempt_at, attempts, error, now, job_id]
+        if only_from:
+            sql += f" AND status IN ({','.join('?' * len(only_from))})"
+            params.extend(only_from)
+        with self._lock:
+            changed = self._conn.execute(sql, params).rowcount
+            self._conn.commit()
+        return changed > 0
+
+    def recover(self) -> int:
+        """Return jobs left in SENDING by a crash to the pending queue."""
+        with self._lock:
+            changed = self._conn.execute(
+                "UPDATE tts_jobs SET status = ?, next_attempt_at = ? WHERE status = ?",
+                (PENDING, time.time(), SENDING),
+            ).rowcount
+            self._conn.commit()
+        return changed
+
+    def next_due(self, include_accepted: bool = True) -> Optional[float]:
+        """Earliest next_attempt_at among jobs the worker still has to act on."""
+        statuses = (PENDING, ACCEPTED) if include_accepted else (PENDING,)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT MIN(next_attempt_at) FROM tts_jobs WHERE status IN ({','.join('?' * len(statuses))})",
+                statuses,
+            ).fetchone()
+        return row[0] if row else None
+
+    def expire_accepted(self, created_before: float) -> int:
+        """Give up waiting for delivery confirmation of jobs queued before ``created_before``."""
+        with self._lock:
+            changed = self._conn.execute(
+                "UPDATE tts_jobs SET status = ?, updated_at = ? WHERE status = ? AND created_at < ?",
+                (UNCONFIRMED, time.time(), ACCEPTED, created_before),
+            ).rowcount
+            self._conn.commit()
+        return changed
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs last updated before ``older_than``."""
+        with self._lock:
+            changed = self._conn.execute(
+                f"DELETE FROM tts_jobs WHERE status IN ({','.join('?' * len(FINAL_STATES))}) AND updated_at < ?",
+                (*FINAL_STATES, older_than),
+            ).rowcount
+            self._conn.commit()
+        return changed
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM tts_jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+class TTSQueueWorker:
+    """Background dispatcher draining the durable TTS queue."""
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(
+        self,
+        store_path: str = TTS_QUEUE_PATH,
+        service_url: str = TTS_SERVICE_URL,
+        audio_cache_path: str = TTS_AUDIO_CACHE_PATH,
+    ) -> None:
+        self.store = TTSJobStore(store_path)
+        # content_hash -> Telegram file_id of a voice note already sent for that text
+        self.audio_cache: Optional[PersistentLRUCache] = None
+        if TTS_AUDIO_CACHE_SIZE > 0:
+            try:
+                self.audio_cache = PersistentLRUCache(audio_cache_path, maxsize=TTS_AUDIO_CACHE_SIZE)
+            except Exception as e:
+                logger.warning(f"[TTS-Client] Audio cache disabled: {e}")
+        self.service_url = service_url
+        self.bot = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+        self._wakeup = asyncio.Event()
+        self._accept_waiters: Dict[str, asyncio.Future] = {}
+        self._paused_until = 0.0
+        self._last_purge = 0.0
+        self._callback_runner: Optional[web.AppRunner] = None
+        self.stats_counters = {
+            "sent": 0, "accepted": 0, "retried": 0, "saturated": 0, "delivered": 0, "failed": 0, "cache_replies": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self, bot=None) -> None:
+        """Start draining the queue (and the callback server, if configured)."""
+        if self.running:
+            return
+        self.bot = bot
+        self._wakeup = asyncio.Event()
+        recovered = self.store.recover()
+        if recovered:
+            logger.info(f"[TTS-Client] Resending {recovered} job(s) interrupted by the last shutdown")
+        if TTS_CALLBACK_PORT:
+            await self._start_callback_server()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"[TTS-Client] Dispatcher started ({TTS_DISPATCH_CONCURRENCY} concurrent, queue {self.store.path})")
+
+    async def stop(self) -> None:
+        """Stop the dispatcher; unfinished sends are resent on the next start."""
+        tasks = [task for task in (self._task, *self._inflight) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._inflight.clear()
+        self.store.recover()
+        for future in self._accept_waiters.values():
+            if not future.done():
+                future.set_result(False)
+        self._accept_waiters.clear()
+        if self._callback_runner is not None:
+            await self._callback_runner.cleanup()
+            self._callback_runner = None
+
+    def enqueue(self, job: Dict[str, Any]) -> str:
+        """Persist a job and wake the dispatcher; returns its job_id."""
+        payload = {key: value for key, value in job.items() if key not in ("job_id", "bot_token")}
+        job_id = job.get("job_id") or uuid.uuid4().hex
+        self.store.add(job_id, payload)
+        self._wakeup.set()
+        return job_id
+
+    async def wait_accepted(self, job_id: str, timeout: float = TTS_ACCEPT_WAIT) -> bool:
+        """Wait until the service accepts ``job_id`` (True) or the job fails (False).
+
+        Returns False at once when the dispatcher is not running; the job
+        stays queued and is sent after the next start.
+        """
+        job = self.store.get(job_id)
+        if job is None or job.status == FAILED:
+            return False
+        if job.status != PENDING and job.status != SENDING:
+            return True
+        if not self.running:
+            return False
+        future = self._accept_waiters.get(job_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._accept_waiters[job_id] = future
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            return False
+
+    async def send_cached(
+        self, bot, content_hash: str, chat_id: int, reply_to_message_id: int, loading_message_id: Optional[int] = None
+    ) -> bool:
+        """Reply with a previously delivered voice note for the same text, if known."""
+        if self.audio_cache is None:
+            return False
+        file_id = self.audio_cache.get(content_hash)
+        if not file_id:
+            return False
+        try:
+            await bot.send_voice(chat_id=chat_id, voice=file_id, reply_to_message_id=reply_to_message_id)
+        except BadRequest as e:
+            # file_id no longer valid (e.g. bot token changed): forget it and synthesise again
+            logger.warning(f"[TTS-Client] Cached voice {content_hash[:12]} rejected by Telegram: {e}")
+            self.audio_cache.delete(content_hash)
+            return False
+        except Exception as e:
+            # Timeouts and network errors: the voice note may still have arrived, so keep
+            # the file_id and do not synthesise a second copy
+            logger.warning(f"[TTS-Client] Sending cached voice {content_hash[:12]} to chat {chat_id} failed: {e}")
+            return True
+        self.stats_counters["cache_replies"] += 1
+        logger.info(f"[TTS-Client] Answered chat {chat_id} from the TTS audio cache")
+        if loading_message_id:
+            try:
+                await bot.delete_message(chat_id=chat_id, message_id=loading_message_id)
+            except Exception as e:
+                logger.debug(f"[TTS-Client] Failed to delete loading message: {e}")
+        return True
+
+    def _remember_audio(self, job_id: str, file_id: Optional[str]) -> None:
+        if self.audio_cache is None or not file_id:
+            return
+        job = self.store.get(job_id)
+        content_hash = job.payload.get("content_hash") if job else None
+        if content_hash:
+            self.audio_cache.set(content_hash, str(file_id))
+
+    def _resolve_waiter(self, job_id: str, accepted: bool) -> None:
+        future = self._accept_waiters.pop(job_id, None)
+        if future is not None and not future.done():
+            future.set_result(accepted)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+        task.add_done_callback(lambda _: self._wakeup.set())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                now = time.time()
+                if now - self._last_purge > 60:
+                    self._last_purge = now
+                    self.store.expire_accepted(now - TTS_DELIVERY_TIMEOUT)
+                    self.store.purge(now - TTS_QUEUE_RETENTION)
+
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    free = TTS_DISPATCH_CONCURRENCY - len(self._inflight)
+                    for job in self.store.claim(PENDING, SENDING, free):
+                        self._spawn(self._send(job))
+                    if TTS_STATUS_POLL_INTERVAL > 0:
+                        free = TTS_DISPATCH_CONCURRENCY - len(self._inflight)
+                        # Re-arm the poll time while claiming so a job is never polled twice at once
+                        for job in self.store.claim(ACCEPTED, ACCEPTED, free, now + TTS_STATUS_POLL_INTERVAL):
+                            self._spawn(self._poll(job))
+                    next_due = self.store.next_due(include_accepted=TTS_STATUS_POLL_INTERVAL > 0)
+                    delay = 60.0 if next_due is None else max(0.05, next_due - time.time())
+                    if len(self._inflight) >= TTS_DISPATCH_CONCURRENCY:
+                        delay = 60.0  # woken when a send finishes
+
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), min(delay, 60.0))
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[TTS-Client] Dispatcher loop error: {e}", exc_info=True)
+                await asyncio.sleep(1)
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(TTS_RETRY_MAX_DELAY, TTS_RETRY_BASE_DELAY * (2 ** max(0, attempts - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _send(self, job: TTSJob) -> None:
+        if time.time() - job.created_at > TTS_JOB_MAX_AGE:
+            await self._fail(job, "expired before the service accepted it")
+            return
+
+        payload = dict(job.payload, job_id=job.job_id, bot_token=BOT_TOKEN)
+        if TTS_CALLBACK_URL:
+            payload["callback_url"] = TTS_CALLBACK_URL
+        self.stats_counters["sent"] += 1
+        try:
+            session = http_clients.get("tts")
+            logger.info(f"[TTS-Client] Dispatching job {job.job_id} to {self.service_url}/tts for chat {job.payload.get('chat_id')}")
+            async with session.post(f"{self.service_url}/tts", json=payload) as response:
+                if response.status in (200, 202):
+                    await self._accepted(job, response)
+                elif response.status in (429, 503):
+                    self._saturated(job, _retry_after(response))
+                elif response.status >= 500 or response.status == 408:
+                    await self._retry(job, f"HTTP {response.status}: {(await response.text())[:200]}")
+                else:
+                    await self._fail(job, f"HTTP {response.status}: {(await response.text())[:200]}")
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            await self._retry(job, f"connection failed: {e!r}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"[TTS-Client] Unexpected error sending job {job.job_id}: {e}")
+            await self._retry(job, repr(e))
+
+    async def _accepted(self, job: TTSJob, response: aiohttp.ClientResponse) -> None:
+        self.stats_counters["accepted"] += 1
+        status = ""
+        file_id = None
+        try:
+            body = await response.json(content_type=None)
+            if isinstance(body, dict):
+                status = str(body.get("status", "")).lower()
+                file_id = body.get("file_id")
+        except Exception:
+            pass
+        if status in _DELIVERED_STATUSES:
+            self._mark_delivered(job.job_id, file_id)
+        else:
+            next_check = time.time() + TTS_STATUS_POLL_INTERVAL
+            # A callback may already have confirmed delivery while this response was in flight
+            self.store.update(job.job_id, ACCEPTED, next_attempt_at=next_check, only_from=(SENDING,))
+        logger.info(f"[TTS-Client] TTS job {job.job_id} accepted for chat {job.payload.get('chat_id')}")
+        self._resolve_waiter(job.job_id, True)
+
+    def _saturated(self, job: TTSJob, retry_after: Optional[float]) -> None:
+        """Back off the whole dispatcher; saturation does not use up the job's attempts."""
+        self.stats_counters["saturated"] += 1
+        delay = retry_after if retry_after is not None else self._backoff(job.attempts + 1)
+        self._paused_until = max(self._paused_until, time.time() + delay)
+        self.store.update(job.job_id, PENDING, next_attempt_at=time.time() + delay, error="service saturated")
+        logger.warning(f"[TTS-Client] Service saturated, pausing dispatch for {delay:.1f}s")
+
+    async def _retry(self, job: TTSJob, error: str) -> None:
+        attempts = job.attempts + 1
+        if attempts >= TTS_MAX_ATTEMPTS or time.time() - job.created_at > TTS_JOB_MAX_AGE:
+            await self._fail(job, error, attempts)
+            return
+        delay = self._backoff(attempts)
+        self.stats_counters["retried"] += 1
+        self.store.update(job.job_id, PENDING, next_attempt_at=time.time() + delay, attempts=attempts, error=error)
+        logger.warning(f"[TTS-Client] Job {job.job_id} attempt {attempts} failed ({error}), retrying in {delay:.1f}s")
+
+    async def _fail(self, job: TTSJob, error: str, attempts: Optional[int] = None) -> None:
+        if not self.store.update(job.job_id, FAILED, attempts=attempts, error=error, only_from=(PENDING, SENDING, ACCEPTED)):
+            return
+        self.stats_counters["failed"] += 1
+        logger.error(f"[TTS-Client] Job {job.job_id} failed: {error}")
+        self._resolve_waiter(job.job_id, False)
+        if self.bot is not None:
+            await _notify_tts_down(
+                self.bot, job.payload.get("chat_id"), job.payload.get("reply_to_message_id"), job.payload.get("user_lang")
+            )
+
+    def _mark_delivered(self, job_id: str, file_id: Optional[str] = None) -> None:
+        if self.store.update(job_id, DELIVERED, only_from=(PENDING, SENDING, ACCEPTED)):
+            self.stats_counters["delivered"] += 1
+        self._remember_audio(job_id, file_id)
+
+    async def _poll(self, job: TTSJob) -> None:
+        """Ask the service whether an accepted job has reached Telegram."""
+        if time.time() - job.created_at > TTS_DELIVERY_TIMEOUT:
+            self.store.update(job.job_id, UNCONFIRMED, only_from=(ACCEPTED,))
+            return
+        try:
+            session = http_clients.get("tts")
+            async with session.get(f"{self.service_url}/tts/{job.job_id}") as response:
+                if response.status in (404, 405):
+                    # Service does not track this job (or has no status endpoint)
+                    self.store.update(job.job_id, UNCONFIRMED, only_from=(ACCEPTED,))
+                    return
+                if response.status != 200:
+                    return
+                body = await response.json(content_type=None)
+            status = str(body.get("status", "")).lower() if isinstance(body, dict) else ""
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.debug(f"[TTS-Client] Status poll for {job.job_id} failed: {e}")
+            return
+        if isinstance(body, dict):
+            await self.handle_status(job.job_id, status, body.get("error"), body.get("file_id"))
+
+    async def handle_status(
+        self, job_id: str, status: str, error: Optional[str] = None, file_id: Optional[str] = None
+    ) -> bool:
+        """Apply a delivery status (and the voice note's file_id) reported by the service."""
+        status = (status or "").lower()
+        if status in _DELIVERED_STATUSES:
+            self._mark_delivered(job_id, file_id)
+            self._resolve_waiter(job_id, True)
+            return True
+        if status in _FAILED_STATUSES:
+            job = self.store.get(job_id)
+            if job is not None:
+                await self._fail(job, f"service reported failure: {error or status}")
+            return True
+        return False
+
+    async def _start_callback_server(self) -> None:
+        app = web.Application()
+        app.router.add_post("/tts/callback", self._handle_callback)
+        self._callback_runner = web.AppRunner(app, access_log=None)
+        await self._callback_runner.setup()
+        await web.TCPSite(self._callback_runner, TTS_CALLBACK_HOST, TTS_CALLBACK_PORT).start()
+        logger.info(f"[TTS-Client] Delivery callbacks on {TTS_CALLBACK_HOST}:{TTS_CALLBACK_PORT}/tts/callback")
+
+    async def _handle_callback(self, request: web.Request) -> web.Response:
+        if TTS_CALLBACK_SECRET and request.headers.get("X-Callback-Secret") != TTS_CALLBACK_SECRET:
+            return web.json_response({"error": "forbidden"}, status=403)
+        try:
+            body = await request.json()
+            job_id = str(body["job_id"])
+        except (ValueError, KeyError, TypeError):
+            return web.json_response({"error": "expected {job_id, status}"}, status=400)
+        if self.store.get(job_id) is None:
+            return web.json_response({"error": "unknown job"}, status=404)
+        handled = await self.handle_status(job_id, str(body.get("status", "")), body.get("error"), body.get("file_id"))
+        return web.json_response({"ok": handled})
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth per state plus dispatch counters, for monitoring."""
+        return {
+            "queue": self.store.counts(),
+            "inflight": len(self._inflight),
+            "paused_for": max(0.0, round(self._paused_until - time.time(), 1)),
+            "audio_cache": self.audio_cache.stats() if self.audio_cache is not None else None,
+            **self.stats_counters,
+        }
+
 
 async def dispatch_tts(
     bot,
@@ -21,55 +593,51 @@ async def dispatch_tts(
     voice_lang: str,
     user_lang: str,
     loading_message_id: Optional[int] = None
-) -> None:
+) -> Optional[str]:
     """
-    Send a TTS request to the Alya-TTS microservice.
-    This is fire-and-forget; it returns immediately after triggering the request.
+    Queue a TTS request for the Alya-TTS microservice.
+
+    Text that was voiced before is answered straight from the audio cache.
+    Otherwise waits up to TTS_ACCEPT_WAIT seconds for the service to accept
+    the job, so callers holding a voice queue slot keep it while the service
+    is busy; the job stays queued and retried after that. Returns the
+    job_id, or None when answered from the cache or the job could not be queued.
     """
+    worker = TTSQueueWorker.get_instance()
+    if worker.bot is None:
+        worker.bot = bot
+    content_hash = tts_content_hash(response_text, voice_lang)
+    if await worker.send_cached(bot, content_hash, chat_id, reply_to_message_id, loading_message_id):
+        return None
     try:
-        payload = {
+        job_id = worker.enqueue({
             "text": response_text,
             "voice_lang": voice_lang,
             "user_lang": user_lang,
             "chat_id": chat_id,
             "reply_to_message_id": reply_to_message_id,
-            "bot_token": BOT_TOKEN,
-            "loading_message_id": loading_message_id
-        }
-
-        async with httpx.AsyncClient() as client:
-            logger.info(f"[TTS-Client] Dispatching job to {TTS_SERVICE_URL}/tts for chat {chat_id}")
-            response = await client.post(
-                f"{TTS_SERVICE_URL}/tts", 
-                json=payload,
-                timeout=5.0
-            )
-            
-            if response.status_code in (200, 202):
-                logger.info(f"[TTS-Client] TTS job accepted for chat {chat_id}")
-            else:
-                logger.error(f"[TTS-Client] Microservice returned error {response.status_code}: {response.text}")
-                await _notify_tts_down(bot, chat_id, reply_to_message_id, user_lang)
-
-    except (httpx.ConnectError, httpx.TimeoutException) as e:
-        logger.warning(f"[TTS-Client] Microservice connection failed: {e}")
+            "loading_message_id": loading_message_id,
+            "content_hash": content_hash
+        })
+    except sqlite3.Error as e:
+        logger.error(f"[TTS-Client] Failed to queue TTS job: {e}")
         await _notify_tts_down(bot, chat_id, reply_to_message_id, user_lang)
-    except Exception as e:
-        logger.error(f"[TTS-Client] Unexpected error: {e}")
+        return None
+    await worker.wait_accepted(job_id)
+    return job_id
 
 async def _notify_tts_down(bot, chat_id: int, reply_to_message_id: int, user_lang: str = None):
     """Notify the user that voice service is currently unavailable."""
     if user_lang is None:
-        from config.settings import DEFAULT_LANGUAGE
         user_lang = DEFAULT_LANGUAGE
-    
+
     notifications = {
         "en": "🎙️ <i>Gomen, the voice service is currently unavailable...</i>",
         "id": "🎙️ <i>Gomen, layanan suara sedang tidak tersedia saat ini...</i>"
     }
-    
+
     text = notifications.get(user_lang, notifications["en"])
-    
+
     try:
         await bot.send_message(
             chat_id=chat_id,
@@ -79,19 +647,3 @@ async def _notify_tts_down(bot, chat_id: int, reply_to_message_id: int, user_lan
         )
     except Exception as e:
         logger.error(f"[TTS-Client] Failed to send notification: {e}")
-
-class TTSQueueWorker:
-    """Backward-compatible stub; actual dispatch is handled by dispatch_tts()."""
-    _instance = None
-
-    @classmethod
-    def get_instance(cls):
-        if cls._instance is None:
-            cls._instance = cls()
-        return cls._instance
-
-    def start(self):
-        pass
-
-    def enqueue(self, job):
-        pass
@@ -11,7 +11,8 @@ from telegram.ext import ContextTypes
 
 from utils.tts_queue import dispatch_tts
 from utils.language_translator import translate_response_for_voice
-from utils.telegram_helpers import start_loading_animation
+from utils.telegram_helpers import QueuePositionNotice, start_loading_animation
+from utils.voice_queue import QueueFullError, tts_jobs
 from config.settings import DEFAULT_LANGUAGE
 
 logger = logging.getLogger(__name__)
@@ -22,10 +23,14 @@ async def send_voice_reply(
     text: str,
     voice_processor: Any,
     db_manager: Any,
-    source_lang: Optional[str] = None
+    source_lang: Optional[str] = None,
+    voice_lang: Optional[str] = None
 ) -> None:
     """
     Translates text dialogue, shows a recording animation, and dispatches a TTS job.
+
+    The recording message is sent while the voice language is resolved and
+    the dialogue translated, so its round-trip overlaps the translation.
     
     Args:
         update: The Telegram update.
@@ -34,6 +39,8 @@ async def send_voice_reply(
         voice_processor: The VoiceProcessor instance.
         db_manager: The database manager to get user language settings.
         source_lang: The language the text is currently in.
+        voice_lang: The user's voice language, when the caller already has the
+            user row loaded (see voice_language_of); looked up otherwise.
     """
     if not voice_processor:
         logger.warning("Attempted to send voice reply but voice_processor is not available")
@@ -45,39 +52,65 @@ async def send_voice_reply(
     if source_lang is None:
         source_lang = DEFAULT_LANGUAGE
 
+    tts_phrase = "Alya is recording a voice note" if source_lang == 'en' else "Alya lagi ngerekam voice note"
+    loading_text = f"<blockquote><b>🎙️ {tts_phrase}.</b></blockquote>"
+    # 1. Create loading/recording message in the background
+    loading_msg_task = asyncio.create_task(update.message.reply_html(loading_text))
+
     try:
-        # 1. Get user's preferred voice language
-        voice_lang = db_manager.get_user_voice_language(user.id) if db_manager else "en"
+        # 2. Get user's preferred voice language
+        if voice_lang is None:
+            voice_lang = await asyncio.to_thread(db_manager.get_user_voice_language, user.id) if db_manager else "en"
         
-        # 2. Extract dialogue and translate for TTS
+        # 3. Extract dialogue and translate for TTS
         tts_text = await translate_response_for_voice(text, source_lang, voice_lang)
-        
-        # 3. Create loading/recording message
-        tts_phrase = "Alya is recording a voice note" if source_lang == 'en' else "Alya lagi ngerekam voice note"
-        tts_loading_msg = await update.message.reply_html(
-            f"<blockquote><b>🎙️ {tts_phrase}.</b></blockquote>"
-        )
+        tts_loading_msg = await loading_msg_task
 
-        from utils.telegram_helpers import start_loading_animation
-        # 4. Start animation
-        tts_loading_task = start_loading_animation(
-            tts_loading_msg, 
-            tts_phrase, 
-            frames=["🎙️", "🎶", "✨"], 
-            interval=3.5
+        # 4. While waiting for a free slot in the TTS queue, the loading
+        # message shows the queue position instead of the animation
+        queue_template = (
+            f"⏳ {tts_phrase} (queue position {{position}})"
+            if source_lang == 'en' else f"⏳ {tts_phrase} (antrian ke-{{position}})"
         )
+        queue_notice = QueuePositionNotice(tts_loading_msg, queue_template, restore_text=loading_text)
 
-        # 5. Dispatch job to TTS microservice (fire and forget)
-        await dispatch_tts(
-            bot=context.bot,
-            chat_id=chat_id,
-            reply_to_message_id=update.message.message_id,
-            voice_processor=voice_processor,
-            response_text=tts_text,
-            voice_lang=voice_lang,
-            user_lang=source_lang,
-            loading_message_id=tts_loading_msg.message_id
-        )
+        async def animate_and_dispatch():
+            # 5. Start animation and dispatch job to TTS microservice (fire and forget)
+            await queue_notice.clear()
+            start_loading_animation(
+                tts_loading_msg,
+                tts_phrase,
+                frames=["🎙️", "🎶", "✨"],
+                interval=3.5
+            )
+            await dispatch_tts(
+                bot=context.bot,
+                chat_id=chat_id,
+                reply_to_message_id=update.message.message_id,
+                voice_processor=voice_processor,
+                response_text=tts_text,
+                voice_lang=voice_lang,
+                user_lang=source_lang,
+                loading_message_id=tts_loading_msg.message_id
+            )
+
+        try:
+            await tts_jobs.run(user.id, animate_and_dispatch, on_position=queue_notice.update)
+        except QueueFullError:
+            busy = (
+                "Too many voice replies right now, try again in a moment."
+                if source_lang == 'en' else "Lagi banyak voice reply, coba lagi sebentar ya."
+            )
+            await tts_loading_msg.edit_text(f"<blockquote><b>🎙️ {busy}</b></blockquote>", parse_mode="HTML")
+        finally:
+            await queue_notice.clear()
             
     except Exception as e:
         logger.error(f"Error in send_voice_reply: {e}", exc_info=True)
+        if not loading_msg_task.done():
+            loading_msg_task.cancel()
+        elif not loading_msg_task.cancelled() and loading_msg_task.exception() is None:
+            try:
+                await loading_msg_task.result().delete()
+            except Exception:
+                pass
@@ -3,73 +3,93 @@ Lightweight Voice processor for Alya Bot (STT Only).
 Handles only speech-to-text (STT). TTS is handled by the Alya-TTS microservice.
 """
 import logging
-import os
-import asyncio
-from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Union
+
+from config.settings import DEFAULT_LANGUAGE, STT_BACKEND, STT_BACKEND_BY_LANG
+from utils.audio_stream import decode_pcm_stream, iter_bytes, iter_file, iter_telegram_file
+from utils.stt import STTBackend, create_backends
 
 logger = logging.getLogger(__name__)
 
 class VoiceProcessor:
     """Lightweight voice processor for handling STT operations."""
-    
+
     def __init__(self):
-        """Initialize voice processor with only STT components."""
-        self.temp_dir = Path("tmp")
-        self.temp_dir.mkdir(exist_ok=True)
-        self._initialize_stt()
-        logger.info(f"✅ Lightweight Voice processor initialized (STT: {self.recognizer is not None})")
-
-    def _initialize_stt(self):
-        """Initialize speech recognition components."""
-        try:
-            import speech_recognition as sr
-            self.recognizer = sr.Recognizer()
-        except ImportError:
-            logger.error("❌ speech_recognition not installed")
-            self.recognizer = None
-    
-    async def transcribe_audio(self, audio_path: str, lang: str = None) -> Optional[Tuple[str, str]]:
-        """Transcribe audio to text using Google Speech Recognition."""
+        """Initialize voice processor with the configured STT backends."""
+        self.backends: Dict[str, STTBackend] = create_backends()
+        logger.info(f"✅ Lightweight Voice processor initialized (STT backends: {', '.join(self.backends) or 'none'})")
+
+    def shutdown(self) -> None:
+        """Stop the backends' worker pools (the spawned whisper processes)."""
+        for backend in self.backends.values():
+            try:
+                backend.shutdown()
+            except Exception as e:
+                logger.warning(f"Failed to shut down STT backend '{backend.name}': {e}")
+
+    def _select_backend(self, lang: str) -> Optional[STTBackend]:
+        """Pick the backend configured for ``lang``, else any available one."""
+        name = STT_BACKEND_BY_LANG.get(lang, STT_BACKEND)
+        return self.backends.get(name) or self.backends.get("google") or next(iter(self.backends.values()), None)
+
+    async def transcribe_audio(self, audio: Union[bytes, str], lang: str = None) -> Optional[Tuple[str, str]]:
+        """Transcribe OGG/Opus voice note bytes, or an audio file path."""
+        chunks = iter_bytes(audio) if isinstance(audio, (bytes, bytearray)) else iter_file(audio)
+        return await self.transcribe_stream(chunks, lang)
+
+    async def transcribe_telegram_file(self, tg_file: Any, lang: str = None) -> Optional[Tuple[str, str]]:
+        """Transcribe a telegram.File while it is still downloading."""
+        return await self.transcribe_stream(iter_telegram_file(tg_file), lang)
+
+    async def transcribe_stream(self, chunks: AsyncIterator[bytes], lang: str = None) -> Optional[Tuple[str, str]]:
+        """Decode encoded audio chunks through ffmpeg and feed the PCM to the STT backend.
+
+        Args:
+            chunks: Encoded audio (e.g. OGG/Opus) in arbitrary chunks
+            lang: Language code of the speaker
+
+        Returns:
+            (text, lang), or None if nothing could be recognised
+        """
         if lang is None:
-            from config.settings import DEFAULT_LANGUAGE
             lang = DEFAULT_LANGUAGE
-            
-        if not self.recognizer:
-            return None
-            
-        try:
-            # Convert OGG to WAV if needed (requires pydub + ffmpeg)
-            wav_path = audio_path
-            if audio_path.endswith('.ogg'):
-                wav_path = str(self.temp_dir / f"stt_{os.getpid()}_{os.urandom(4).hex()}.wav")
-                from pydub import AudioSegment
-                audio = AudioSegment.from_file(audio_path, format="ogg")
-                audio.export(wav_path, format="wav")
-            
-            import speech_recognition as sr
-            with sr.AudioFile(wav_path) as source:
-                audio_data = self.recognizer.record(source)
-            
-            # Map language codes for Google SR
-            lang_map = {"en": "en-US", "id": "id-ID", "ru": "ru-RU", "jp": "ja-JP"}
-            target_lang = lang_map.get(lang, "id-ID")
-            
-            # Simple wrapper to run blocking recognize_google in thread
-            text = await asyncio.to_thread(self.recognizer.recognize_google, audio_data, language=target_lang)
-            return text, lang
-            
-        except Exception as e:
-            logger.error(f"❌ Transcription error: {e}")
+
+        backend = self._select_backend(lang)
+        if backend is None:
             return None
-        finally:
-            if 'wav_path' in locals() and wav_path != audio_path:
-                self._safe_remove(wav_path)
 
-    def _safe_remove(self, path: str):
-        """Safely remove a file."""
+        # Keep a copy of the PCM only when a Google fallback may need it
+        fallback = self.backends.get("google")
+        if fallback is backend:
+            fallback = None
+        collected = bytearray() if fallback is not None else None
+
+        async def frames() -> AsyncIterator[bytes]:
+            async for frame in decode_pcm_stream(chunks):
+                if collected is not None:
+                    collected.extend(frame)
+                yield frame
+
+        frame_stream = frames()
+        text = None
         try:
-            if os.path.exists(path):
-                os.unlink(path)
+            text = await backend.transcribe_stream(frame_stream, lang)
         except Exception as e:
-            logger.warning(f"Failed to delete {path}: {e}")
+            logger.error(f"❌ Transcription error ({backend.name}): {e}")
+            if collected is not None:
+                # Finish decoding so the fallback gets the whole clip
+                try:
+                    async for _ in frame_stream:
+                        pass
+                except Exception as decode_error:
+                    logger.error(f"❌ Audio decode error: {decode_error}")
+                    return None
+
+        if not text and collected:
+            logger.info(f"STT backend '{backend.name}' returned nothing, falling back to Google")
+            try:
+                text = await fallback.transcribe(bytes(collected), lang)
+            except Exception as e:
+                logger.error(f"❌ Transcription error (google): {e}")
+
+        return (text, lang) if text else None
@@ -0,0 +1,215 @@
+"""
+Bounded, per-user fair job queues for voice work.
+
+Speech-to-text (ffmpeg decode + recognition) is CPU heavy and TTS jobs load
+the Alya-TTS service, so a burst of voice notes in a group must not run all
+at once and starve text chat. ``VoiceJobQueue`` runs at most
+``max_concurrency`` jobs, at most ``per_user_limit`` per user, and serves
+waiting users round-robin so one user sending ten notes does not block
+everyone else. Waiting jobs are told their queue position as it changes.
+"""
+import asyncio
+import logging
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from config.settings import (
+    VOICE_QUEUE_MAX_WAITING,
+    VOICE_QUEUE_PER_USER,
+    VOICE_STT_CONCURRENCY,
+    VOICE_TTS_CONCURRENCY,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+PositionCallback = Callable[[int], Awaitable[None]]
+
+
+class QueueFullError(Exception):
+    """Raised when a queue already holds its maximum number of waiting jobs."""
+    pass
+
+
+@dataclass
+class _Waiter:
+    user_id: int
+    future: "asyncio.Future[None]"
+    on_position: Optional[PositionCallback]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    last_position: int = 0
+
+
+class VoiceJobQueue:
+    """Concurrency-limited job runner with round-robin fairness across users."""
+
+    def __init__(self, name: str, max_concurrency: int, per_user_limit: int = 1, max_waiting: int = 50) -> None:
+        """
+        Args:
+            name: Queue name used in logs and stats
+            max_concurrency: Jobs allowed to run at the same time
+            per_user_limit: Jobs one user may have running at the same time
+            max_waiting: Waiting jobs accepted before QueueFullError
+        """
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_user_limit = max(1, per_user_limit)
+        self.max_waiting = max_waiting
+        self._running = 0
+        self._running_by_user: Counter = Counter()
+        # Users in round-robin order, each with their waiting jobs
+        self._waiting: "OrderedDict[int, Deque[_Waiter]]" = OrderedDict()
+        self._waiting_count = 0
+        self._notify_tasks: set = set()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.peak_waiting = 0
+        self._total_wait = 0.0
+        self._started = 0
+
+    def _can_start(self, user_id: int) -> bool:
+        return self._running < self.max_concurrency and self._running_by_user[user_id] < self.per_user_limit
+
+    def _grant(self, user_id: int) -> None:
+        self._running += 1
+        self._running_by_user[user_id] += 1
+
+    def _release(self, user_id: int) -> None:
+        self._running -= 1
+        self._running_by_user[user_id] -= 1
+        if self._running_by_user[user_id] <= 0:
+            del self._running_by_user[user_id]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiting jobs, one user at a time in ring order."""
+        progressed = True
+        while progressed and self._running < self.max_concurrency and self._waiting:
+            progressed = False
+            for user_id in list(self._waiting):
+                if not self._can_start(user_id):
+                    continue
+                jobs = self._waiting[user_id]
+                waiter = jobs.popleft()
+                self._waiting_count -= 1
+                if jobs:
+                    self._waiting.move_to_end(user_id)
+                else:
+                    del self._waiting[user_id]
+                self._grant(user_id)
+                self._total_wait += time.monotonic() - waiter.enqueued_at
+                self._started += 1
+                waiter.future.set_result(None)
+                progressed = True
+                break
+        self._notify_positions()
+
+    def _positions(self) -> Dict[int, int]:
+        """Map id(waiter) -> 1-based position in round-robin dispatch order."""
+        lengths = [len(jobs) for jobs in self._waiting.values()]
+        positions: Dict[int, int] = {}
+        for ring_index, jobs in enumerate(self._waiting.values()):
+            for depth, waiter in enumerate(jobs):
+                ahead = sum(min(length, depth + (1 if other < ring_index else 0)) for other, length in enumerate(lengths))
+                positions[id(waiter)] = ahead + 1
+        return positions
+
+    def _notify_positions(self) -> None:
+        positions = self._positions()
+        for jobs in self._waiting.values():
+            for waiter in jobs:
+                position = positions[id(waiter)]
+                if waiter.on_position is None or position == waiter.last_position:
+                    continue
+                waiter.last_position = position
+                task = asyncio.create_task(self._safe_notify(waiter.on_position, position))
+                self._notify_tasks.add(task)
+                task.add_done_callback(self._notify_tasks.discard)
+
+    async def _safe_notify(self, callback: PositionCallback, position: int) -> None:
+        try:
+            await callback(position)
+        except Exception as e:
+            logger.debug(f"[{self.name}] queue position update failed: {e}")
+
+    def _remove_waiter(self, waiter: _Waiter) -> None:
+        jobs = self._waiting.get(waiter.user_id)
+        if jobs is None or waiter not in jobs:
+            return
+        jobs.remove(waiter)
+        self._waiting_count -= 1
+        if not jobs:
+            del self._waiting[waiter.user_id]
+        self._notify_positions()
+
+    async def run(
+        self,
+        user_id: int,
+        job: Callable[[], Awaitable[T]],
+        on_position: Optional[PositionCallback] = None,
+    ) -> T:
+        """Run ``job`` once a slot is free for this user.
+
+        Args:
+            user_id: Telegram user the job belongs to
+            job: Zero-argument coroutine function doing the work
+            on_position: Awaited with the 1-based queue position whenever it
+                changes while the job waits (never called if it starts at once)
+
+        Raises:
+            QueueFullError: If max_waiting jobs are already queued
+        """
+        # Anyone still waiting is blocked by a limit (dispatch runs on every
+        # release), so a user with no queued jobs of their own may start now
+        if user_id not in self._waiting and self._can_start(user_id):
+            self._grant(user_id)
+            self._started += 1
+        else:
+            if self._waiting_count >= self.max_waiting:
+                self.rejected += 1
+                raise QueueFullError(f"{self.name} queue is full")
+            waiter = _Waiter(user_id, asyncio.get_running_loop().create_future(), on_position)
+            self._waiting.setdefault(user_id, deque()).append(waiter)
+            self._waiting_count += 1
+            self.peak_waiting = max(self.peak_waiting, self._waiting_count)
+            logger.info(f"[{self.name}] job for user {user_id} queued ({self._waiting_count} waiting)")
+            self._notify_positions()
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    self._release(user_id)  # slot was granted just before the cancel
+                else:
+                    self._remove_waiter(waiter)
+                raise
+
+        try:
+            result = await job()
+            self.completed += 1
+            return result
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self._release(user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return running/waiting counts and wait time for monitoring."""
+        return {
+            "running": self._running,
+            "waiting": self._waiting_count,
+            "max_concurrency": self.max_concurrency,
+            "per_user_limit": self.per_user_limit,
+            "peak_waiting": self.peak_waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(1000 * self._total_wait / self._started) if self._started else 0,
+        }
+
+
+stt_jobs = VoiceJobQueue("stt", VOICE_STT_CONCURRENCY, VOICE_QUEUE_PER_USER, VOICE_QUEUE_MAX_WAITING)
+tts_jobs = VoiceJobQueue("tts", VOICE_TTS_CONCURRENCY, VOICE_QUEUE_PER_USER, VOICE_QUEUE_MAX_WAITING)